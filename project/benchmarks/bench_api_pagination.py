@@ -0,0 +1,92 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import time
+
+from django.contrib.auth.models import User as DjangoUser
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Meals
+from core.pagination import encode_cursor
+from core.serializers import MEAL_LIST_FIELDS, MealListSerializer
+from core.views import MealListView
+
+# Latency of /api/meals/ pages at increasing depth: keyset pagination
+# (core.pagination) versus DRF PageNumberPagination (COUNT(*) + OFFSET) over
+# the same projection. Requests are paced at TARGET_RPS from one client, so
+# the numbers are per-request latency at a fixed load rather than peak
+# throughput. Run against a generated dataset with at least
+# PAGE_SIZE * max(PAGES) meals (generate_data --scale 20 gives 100,000).
+PAGE_SIZE = 10
+PAGES = [1, 10, 100, 1000, 10000]
+REQUESTS = 200
+TARGET_RPS = 200
+
+
+class OffsetMealListView(ListAPIView):
+    serializer_class = MealListSerializer
+    queryset = Meals.objects.select_related('diet_type').only(*MEAL_LIST_FIELDS).order_by('id')
+
+    class pagination_class(PageNumberPagination):
+        page_size = PAGE_SIZE
+
+
+def measure(view, request_for):
+    """Выполняет REQUESTS запросов с частотой TARGET_RPS; возвращает p50 и p99 в мс"""
+    timings = []
+    interval = 1 / TARGET_RPS
+    next_start = time.perf_counter()
+    for _ in range(REQUESTS):
+        delay = next_start - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        request = request_for()
+        start = time.perf_counter()
+        response = view(request)
+        response.render()
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+        next_start += interval
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, timings[int(len(timings) * 0.99)] * 1000
+
+
+if __name__ == "__main__":
+    factory = APIRequestFactory()
+    account, _ = DjangoUser.objects.get_or_create(username='bench_api_pagination', defaults={'is_staff': True})
+    keyset_view = MealListView.as_view()
+    offset_view = OffsetMealListView.as_view()
+
+    def authenticated(path):
+        def build():
+            request = factory.get(path)
+            force_authenticate(request, account)
+            return request
+        return build
+
+    total = Meals.objects.count()
+    print(f"{total} meals, page size {PAGE_SIZE}, {REQUESTS} requests per page at {TARGET_RPS} RPS")
+    print(f"{'page':>6} | {'keyset p50':>10} {'p99':>8} | {'offset p50':>10} {'p99':>8}")
+    for page in PAGES:
+        if (page - 1) * PAGE_SIZE >= total:
+            print(f"{page:>6} | not enough rows")
+            continue
+        path = f'/api/meals/?page_size={PAGE_SIZE}'
+        if page > 1:
+            # Курсор последней строки предыдущей страницы (вычисляется вне замера)
+            last_id = Meals.objects.order_by('id').values_list('id', flat=True)[(page - 1) * PAGE_SIZE - 1]
+            path += f"&cursor={encode_cursor('id', (last_id,))}"
+        keyset = measure(keyset_view, authenticated(path))
+        offset = measure(offset_view, authenticated(f'/api/meals/?page={page}'))
+        print(f"{page:>6} | {keyset[0]:>10.2f} {keyset[1]:>8.2f} | {offset[0]:>10.2f} {offset[1]:>8.2f}")
+    account.delete()
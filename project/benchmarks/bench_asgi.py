@@ -0,0 +1,146 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.contrib.auth.models import User as DjangoUser
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.http import Http404, JsonResponse
+from django.test import Client
+from django.urls import include, path
+
+from core.functions import UserManager
+from core.models import User, MealPlans, Favorites
+
+# Concurrent throughput of the user overview endpoint (user + plans +
+# favorites) under the two entry points, driven in-process without a server:
+#   WSGI - a synchronous view on WSGIHandler, CONCURRENCY worker threads
+#          (like gunicorn --threads);
+#   ASGI - the async view core.views.user_overview on ASGIHandler,
+#          CONCURRENCY concurrent requests on one event loop.
+#   ASGI + sync view - the WSGI view on ASGIHandler, for the adapter overhead.
+# Run once as is and once with DB_POOL=True: under ASGI every request runs its
+# ORM calls in a fresh thread, so (as in project/asgi.py) persistent
+# connections are switched off there and only the pool reuses connections.
+REQUESTS = 2000
+CONCURRENCY = 32
+
+
+def user_overview_sync(request, pk):
+    user = UserManager.get_user_by_id(pk)
+    if user is None:
+        raise Http404
+    plans = MealPlans.objects.filter(user_id=pk).order_by('id')
+    favorites = Favorites.objects.filter(user_id=pk).order_by('id')
+    return JsonResponse({
+        'id': user.id,
+        'username': user.username,
+        'diet_type_id': user.diet_type_id,
+        'plans': [
+            {'id': plan.id, 'duration': plan.duration, 'total_price': plan.total_price, 'created_at': plan.created_at}
+            for plan in plans
+        ],
+        'favorites': [{'meal_id': favorite.meal_id, 'created_at': favorite.created_at} for favorite in favorites],
+    })
+
+
+urlpatterns = [
+    path('api/', include('core.urls')),
+    path('sync/users/<int:pk>/overview/', user_overview_sync),
+]
+
+
+def wsgi_request(handler, path, cookie):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '443', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': 'testserver', 'HTTP_COOKIE': cookie,
+        'wsgi.url_scheme': 'https', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False, 'wsgi.version': (1, 0),
+    }
+    status = []
+    response = handler(environ, lambda status_line, headers: status.append(status_line))
+    b''.join(response)
+    response.close()
+    assert status[0].startswith('200'), status
+
+
+async def asgi_request(handler, path, cookie):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'https',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 443),
+    }
+    messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Клиент не отключается; слушатель отключения отменяется после ответа
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await handler(scope, receive, send)
+    assert status == [200], status
+
+
+def run_wsgi(paths, cookie):
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        start = time.perf_counter()
+        list(executor.map(lambda path: wsgi_request(handler, path, cookie), paths))
+        return time.perf_counter() - start
+
+
+async def run_asgi(paths, cookie):
+    handler = ASGIHandler()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def limited(path):
+        async with semaphore:
+            await asgi_request(handler, path, cookie)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(limited(path) for path in paths))
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    settings.ROOT_URLCONF = __name__
+    account, _ = DjangoUser.objects.get_or_create(username='bench_asgi', defaults={'is_staff': True})
+    client = Client()
+    client.force_login(account)
+    cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True)[:REQUESTS])
+    user_ids = (user_ids * (REQUESTS // len(user_ids) + 1))[:REQUESTS]
+    pool = 'pool' in settings.DATABASES['default']['OPTIONS']
+    print(f"{REQUESTS} requests, concurrency {CONCURRENCY}, DB pool {'on' if pool else 'off'}")
+
+    wsgi_time = run_wsgi([f'/sync/users/{user_id}/overview/' for user_id in user_ids], cookie)
+    connections.close_all()
+    connections.settings['default']['CONN_MAX_AGE'] = 0
+    asgi_time = asyncio.run(run_asgi([f'/api/users/{user_id}/overview/' for user_id in user_ids], cookie))
+    asgi_sync_time = asyncio.run(run_asgi([f'/sync/users/{user_id}/overview/' for user_id in user_ids], cookie))
+    print(f"WSGI, sync view ({CONCURRENCY} threads): {REQUESTS / wsgi_time:8.1f} req/s")
+    print(f"ASGI, async view (gather):     {REQUESTS / asgi_time:8.1f} req/s")
+    print(f"ASGI, sync view:               {REQUESTS / asgi_sync_time:8.1f} req/s")
+    account.delete()
@@ -0,0 +1,57 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+django.setup()
+
+import time
+from django.db import transaction
+from core.functions import MealManager, FavoriteManager, UserManager
+
+# Per-row create_* versus create_*_bulk on the configured database.
+# Every measurement runs inside a transaction that is rolled back.
+ROWS = 5000
+
+
+def measure(label, func):
+    with transaction.atomic():
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    print(f"{label:<32} {elapsed * 1000:10.1f} ms  ({ROWS / elapsed:,.0f} rows/s)")
+    return elapsed
+
+
+def meals():
+    return [{'name': f'Meal {i}', 'price': 10, 'description': 'Benchmark meal'} for i in range(ROWS)]
+
+
+def favorites_setup():
+    user = UserManager.create_user(username='bench_user', password='bench', email='bench@example.com')
+    meal_ids = MealManager.create_meal_bulk(meals())
+    return [{'user_id': user.id, 'meal_id': meal_id} for meal_id in meal_ids]
+
+
+def favorites_per_row():
+    for favorite in favorites_setup():
+        FavoriteManager.create_favorite(**favorite)
+
+
+def favorites_bulk():
+    FavoriteManager.create_favorite_bulk(favorites_setup())
+
+
+if __name__ == "__main__":
+    print(f"{ROWS} rows per run")
+    per_row = measure('create_meal (per row)', lambda: [MealManager.create_meal(**meal) for meal in meals()])
+    bulk = measure('create_meal_bulk', lambda: MealManager.create_meal_bulk(meals()))
+    print(f"Meals speedup: {per_row / bulk:.1f}x")
+    per_row = measure('create_favorite (per row) + setup', favorites_per_row)
+    bulk = measure('create_favorite_bulk + setup', favorites_bulk)
+    print(f"Favorites speedup: {per_row / bulk:.1f}x")
@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import copy
+import statistics
+import time
+
+from django.core.signals import request_started, request_finished
+from django.db import connection
+
+from core.models import Meals
+
+# Benchmark of per-request database latency for three connection modes:
+# a new connection per request (CONN_MAX_AGE=0), persistent connections
+# with health checks (CONN_MAX_AGE>0) and the psycopg 3 pool (OPTIONS['pool']).
+# A request is simulated with the request_started/request_finished signals,
+# which Django's handlers use to open and release connections, around two
+# small queries. Needs PostgreSQL (the pool is a psycopg 3 feature).
+REQUESTS = 500
+POOL = {'min_size': 2, 'max_size': 4, 'max_lifetime': 3600}
+
+MODES = {
+    'no persistence (CONN_MAX_AGE=0)': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent + health checks': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+    'psycopg pool': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': POOL},
+}
+
+
+def configure(mode):
+    """Переключает соединение default на режим mode"""
+    connection.close()
+    connection.close_pool()
+    settings_dict = copy.deepcopy(BASE_SETTINGS)
+    options = dict(mode)
+    pool = options.pop('pool', None)
+    settings_dict.update(options)
+    settings_dict['OPTIONS'].pop('pool', None)
+    if pool:
+        settings_dict['OPTIONS']['pool'] = pool
+    connection.settings_dict = settings_dict
+
+
+def request():
+    request_started.send(sender=None)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        Meals.objects.filter(id=1).exists()
+    finally:
+        request_finished.send(sender=None)
+
+
+def run(mode):
+    configure(mode)
+    request()  # прогрев: первое соединение, создание пула
+    timings = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        request()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+if __name__ == "__main__":
+    if connection.vendor != 'postgresql':
+        sys.exit('bench_connections requires PostgreSQL')
+    BASE_SETTINGS = copy.deepcopy(connection.settings_dict)
+    print(f"{REQUESTS} simulated requests per mode")
+    results = {name: run(mode) for name, mode in MODES.items()}
+    baseline = results['no persistence (CONN_MAX_AGE=0)'][0]
+    for name, (mean, p50, p99) in results.items():
+        print(
+            f"{name:34} mean {mean * 1000:.3f} ms, p50 {p50 * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms, "
+            f"speedup {baseline / mean:.1f}x"
+        )
+    configure({})
@@ -0,0 +1,80 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import timeit
+from collections import defaultdict
+
+from django.db import connection
+
+from core.functions import MealManager
+from core.models import MealIngredient
+from core.money import to_minor, from_minor, minor_units, round_half_up, sum_line_costs, QUANTITY_PLACES, LINE_SCALE
+
+# Meal price calculation the way MealManager.calculate_meal_price runs it,
+# versus the two integer minor unit variants:
+#   decimal  - Decimal rows, exact Decimal products, one rounding (current);
+#   to_minor - Decimal rows converted to integers in Python on every row;
+#   sql ints - integer cents and hundredths selected from SQL (Cast/Round).
+# "per call" times the whole call (query + accumulation) for each meal;
+# "loop only" times the accumulation over rows already fetched, all meals
+# at once. Run against a generated dataset.
+MEALS = 2000
+REPEAT = 5
+
+DECIMAL_LINE = ('ingredient__price_per_unit', 'quantity')
+INTEGER_LINE = (minor_units('ingredient__price_per_unit'), minor_units('quantity', QUANTITY_PLACES))
+
+
+def integer_total(lines):
+    return from_minor(round_half_up(sum(price * quantity for price, quantity in lines), LINE_SCALE))
+
+
+def to_minor_total(lines):
+    return integer_total((to_minor(price), to_minor(quantity, QUANTITY_PLACES)) for price, quantity in lines)
+
+
+def meal_lines(meal_id, line):
+    return MealIngredient.objects.filter(meal_id=meal_id).values_list(*line)
+
+
+def grouped(line):
+    meals = defaultdict(list)
+    rows = MealIngredient.objects.filter(meal_id__in=meal_ids).order_by('meal_id', 'id').values_list('meal_id', *line)
+    for meal_id, *values in rows:
+        meals[meal_id].append(tuple(values))
+    return list(meals.values())
+
+
+def best_ms(function):
+    return min(timeit.repeat(function, number=1, repeat=REPEAT)) * 1000
+
+
+if __name__ == "__main__":
+    meal_ids = list(
+        MealIngredient.objects.order_by('meal_id').values_list('meal_id', flat=True).distinct()[:MEALS]
+    )
+    decimal_rows, integer_rows = grouped(DECIMAL_LINE), grouped(INTEGER_LINE)
+    assert [sum_line_costs(lines) for lines in decimal_rows] == [integer_total(lines) for lines in integer_rows]
+
+    per_call = {
+        'decimal': lambda: [MealManager.calculate_meal_price(meal_id) for meal_id in meal_ids],
+        'to_minor': lambda: [to_minor_total(meal_lines(meal_id, DECIMAL_LINE)) for meal_id in meal_ids],
+        'sql ints': lambda: [integer_total(meal_lines(meal_id, INTEGER_LINE)) for meal_id in meal_ids],
+    }
+    loop_only = {
+        'decimal': lambda: [sum_line_costs(lines) for lines in decimal_rows],
+        'to_minor': lambda: [to_minor_total(lines) for lines in decimal_rows],
+        'sql ints': lambda: [integer_total(lines) for lines in integer_rows],
+    }
+    print(f"{connection.vendor}, {len(meal_ids)} meals, {sum(map(len, decimal_rows))} ingredient rows, best of {REPEAT}")
+    print(f"{'':10} | " + " | ".join(f"{name:>10}" for name in per_call))
+    for title, variants in (('per call', per_call), ('loop only', loop_only)):
+        print(f"{title:10} | " + " | ".join(f"{best_ms(function):8.2f}ms" for function in variants.values()))
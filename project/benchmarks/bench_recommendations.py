@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import random
+import time
+import timeit
+
+from django.db.models import Count
+
+from core.models import User, Meals, Favorites, MealNeighbor, MealNeighborBuild
+from core.recommendations import MealRecommender
+
+# Favorites-based recommendations (core.recommendations):
+#   build - a full rebuild of the similar meals table, then an incremental
+#           one after NEW_FAVORITES new favorites;
+#   serve - recommendations for one user from the precomputed table versus
+#           the same co-occurrence ranking computed on the fly in SQL
+#           (users who share a favorite, counted over their other favorites).
+# Run against a generated dataset; the favorites, neighbors and builds the
+# benchmark creates are removed at the end.
+NEW_FAVORITES = 100
+USERS = 200
+LIMIT = 20
+SEED = 7
+
+
+def on_the_fly(user_id):
+    favorites = Favorites.objects.filter(user_id=user_id).values('meal_id')
+    return list(
+        Favorites.objects
+        .filter(user__favorites__meal_id__in=favorites)
+        .exclude(meal_id__in=favorites)
+        .values('meal_id')
+        .annotate(score=Count('id'))
+        .order_by('-score', 'meal_id')[:LIMIT]
+    )
+
+
+def precomputed(user_id):
+    return MealRecommender.recommend(user_id, LIMIT)
+
+
+def median_ms(function, user_ids):
+    timings = sorted(min(timeit.repeat(lambda: function(user_id), number=1, repeat=3)) for user_id in user_ids)
+    return timings[len(timings) // 2] * 1000
+
+
+if __name__ == "__main__":
+    rng = random.Random(SEED)
+    print(f"{User.objects.count()} users, {Meals.objects.count()} meals, {Favorites.objects.count()} favorites")
+
+    started = time.perf_counter()
+    build = MealRecommender.rebuild(full=True)
+    print(f"full build:        {time.perf_counter() - started:8.2f} s, "
+          f"{build.meals} meals, {build.rows} neighbors")
+
+    user_ids = list(User.objects.values_list('id', flat=True))
+    meal_ids = list(Meals.objects.values_list('id', flat=True))
+    existing = set(Favorites.objects.values_list('user_id', 'meal_id'))
+    new_favorites = set()
+    while len(new_favorites) < NEW_FAVORITES:
+        pair = (rng.choice(user_ids), rng.choice(meal_ids))
+        if pair not in existing:
+            new_favorites.add(pair)
+    added = Favorites.objects.bulk_create([Favorites(user_id=user_id, meal_id=meal_id) for user_id, meal_id in new_favorites])
+    started = time.perf_counter()
+    build = MealRecommender.rebuild()
+    print(f"incremental build: {time.perf_counter() - started:8.2f} s, {build.meals} meals after "
+          f"{NEW_FAVORITES} new favorites ({build.kind})")
+
+    sample = rng.sample(list(Favorites.objects.values_list('user_id', flat=True).distinct()), USERS)
+    print(f"serve, median of {USERS} users: precomputed {median_ms(precomputed, sample):.2f} ms, "
+          f"on the fly {median_ms(on_the_fly, sample):.2f} ms")
+
+    Favorites.objects.filter(id__in=[favorite.id for favorite in added]).delete()
+    MealNeighbor.objects.all().delete()
+    MealNeighborBuild.objects.all().delete()
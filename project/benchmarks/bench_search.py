@@ -0,0 +1,77 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import timeit
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Q
+
+from core.models import Meals, Ingredients, DietTypes
+from core.search import MealSearch, IngredientSearch, search_terms
+from core.serializers import MEAL_LIST_VALUES, INGREDIENT_AUTOCOMPLETE_VALUES
+
+# Meal search and ingredient autocomplete through core.search (tsvector +
+# GIN / pg_trgm on PostgreSQL, FTS5 on SQLite) versus the icontains scan that
+# was the only option before. Every query returns the top LIMIT rows; the
+# filtered variants add a diet type and a price range to the same query.
+# Run against a generated dataset (generate_data --scale 20 gives 100,000
+# meals); the words are picked from the data so every query has matches.
+LIMIT = 20
+REPEAT = 20
+
+
+def icontains_meals(query, diet_type_id=None, min_price=None, max_price=None):
+    queryset = Meals.objects.all()
+    for term in search_terms(query):
+        queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+    if diet_type_id is not None:
+        queryset = queryset.filter(diet_type_id=diet_type_id, price__gte=min_price, price__lte=max_price)
+    return list(queryset.order_by('id').values(*MEAL_LIST_VALUES)[:LIMIT])
+
+
+def fts_meals(query, diet_type_id=None, min_price=None, max_price=None):
+    return MealSearch.search(query, MEAL_LIST_VALUES, diet_type_id, min_price, max_price, LIMIT)
+
+
+def icontains_ingredients(query):
+    return list(Ingredients.objects.filter(name__icontains=query).order_by('name').values(
+        *INGREDIENT_AUTOCOMPLETE_VALUES
+    )[:LIMIT])
+
+
+def autocomplete_ingredients(query):
+    return IngredientSearch.autocomplete(query, INGREDIENT_AUTOCOMPLETE_VALUES, LIMIT)
+
+
+def best_ms(function, *args):
+    return min(timeit.repeat(lambda: function(*args), number=1, repeat=REPEAT)) * 1000
+
+
+if __name__ == "__main__":
+    meal = Meals.objects.order_by('id').values('name', 'description').first()
+    words = [word for word in search_terms(meal['name']) if len(word) > 3 and not word.isdigit()]
+    diet_type_id = DietTypes.objects.order_by('id').values_list('id', flat=True).first()
+    ingredient = Ingredients.objects.order_by('id').values_list('name', flat=True).first()
+    cases = [
+        ('meals: one word', (words[0],)),
+        ('meals: two words', (' '.join(words[:2]),)),
+        ('meals: word + diet + price', (words[0], diet_type_id, Decimal('10'), Decimal('30'))),
+    ]
+    print(f"{connection.vendor}, {Meals.objects.count()} meals, {Ingredients.objects.count()} ingredients, "
+          f"top {LIMIT}, best of {REPEAT}")
+    print(f"{'query':36} | {'icontains':>10} | {'index':>10}")
+    for name, args in cases:
+        print(f"{name:36} | {best_ms(icontains_meals, *args):8.2f}ms | {best_ms(fts_meals, *args):8.2f}ms")
+    for prefix in (ingredient[:3], ingredient[:5]):
+        name = f"ingredients: '{prefix}'"
+        print(f"{name:36} | {best_ms(icontains_ingredients, prefix):8.2f}ms | "
+              f"{best_ms(autocomplete_ingredients, prefix):8.2f}ms")
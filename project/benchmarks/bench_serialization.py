@@ -0,0 +1,87 @@
+import os
+import sys
+
+# Add project root to sys.path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django
+django.setup()
+
+import json
+import timeit
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Meals
+from core.renderers import FastJSONRenderer
+from core.serializers import MEAL_LIST_FIELDS, MEAL_LIST_VALUES, DietTypeRefSerializer, MealListSerializer, meal_rows
+
+# Cost of a 1,000-item meal list response in three modes:
+#   models    - full model instances (every column, description included)
+#               through a ModelSerializer and DRF's JSONRenderer;
+#   only()    - the column projection with the same serializers (user-021);
+#   values()  - values() rows reshaped to the same JSON and encoded by
+#               orjson (core.renderers.FastJSONRenderer).
+# "total" includes the query; "encode" times serialization and rendering of
+# rows that are already loaded. Needs at least ITEMS meals in the database.
+ITEMS = 1000
+REPEAT = 20
+
+
+class MealFullSerializer(serializers.ModelSerializer):
+    diet_type = DietTypeRefSerializer(read_only=True)
+
+    class Meta:
+        model = Meals
+        fields = ('id', 'name', 'description', 'price', 'diet_type', 'created_at', 'deleted_at')
+
+
+def load_models():
+    return list(Meals.objects.select_related('diet_type').order_by('id')[:ITEMS])
+
+
+def load_only():
+    return list(Meals.objects.select_related('diet_type').only(*MEAL_LIST_FIELDS).order_by('id')[:ITEMS])
+
+
+def load_values():
+    return list(Meals.objects.values(*MEAL_LIST_VALUES).order_by('id')[:ITEMS])
+
+
+def encode_models(meals):
+    return JSONRenderer().render(MealFullSerializer(meals, many=True).data)
+
+
+def encode_only(meals):
+    return JSONRenderer().render(MealListSerializer(meals, many=True).data)
+
+
+def encode_values(rows):
+    return FastJSONRenderer().render(meal_rows(rows))
+
+
+MODES = {
+    'models + ModelSerializer': (load_models, encode_models),
+    'only() + serializer': (load_only, encode_only),
+    'values() + orjson': (load_values, encode_values),
+}
+
+
+if __name__ == "__main__":
+    # Одинаковый ответ у двух путей с одной проекцией
+    assert json.loads(encode_only(load_only())) == json.loads(encode_values(load_values()))
+    print(f"{ITEMS} meals, best of {REPEAT}")
+    baseline = None
+    for name, (load, encode) in MODES.items():
+        rows = load()
+        total = min(timeit.repeat(lambda: encode(load()), number=1, repeat=REPEAT))
+        encode_time = min(timeit.repeat(lambda: encode(rows), number=1, repeat=REPEAT))
+        size = len(encode(rows))
+        baseline = baseline or total
+        print(
+            f"{name:26} total {total * 1000:7.2f} ms, encode {encode_time * 1000:7.2f} ms, "
+            f"{size / 1024:6.1f} KiB, speedup {baseline / total:4.1f}x"
+        )
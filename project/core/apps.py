@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Подключаем обработчики сигналов для сброса кэша цен блюд
+        from core import price_cache  # noqa: F401
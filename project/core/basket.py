@@ -0,0 +1,158 @@
+import numpy as np
+from collections import defaultdict
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+from typing import Optional, List, Dict, Any, Tuple
+
+from core.models import Ingredients, MealIngredient
+from core.units import BASE_UNITS
+
+# Ключ товара: один и тот же ингредиент в разных магазинах (название + размерность)
+ProductKey = Tuple[str, str]
+
+
+class BasketOptimizer:
+    """Подбор самой дешевой корзины продуктов для плана питания по магазинам.
+
+    Предложения магазинов индексируются один раз при загрузке: для каждого
+    товара хранится по одной (самой дешевой) строке Ingredients на магазин,
+    отсортированные по цене за базовую единицу (г, мл, шт), поэтому
+    предложения в кг и в г сравниваются напрямую. Ограничение "не больше N магазинов" решается
+    как задача размещения (MILP через HiGHS), а не перебором комбинаций.
+    """
+
+    def __init__(
+        self,
+        offers: Dict[ProductKey, List[Tuple[float, Optional[str], int]]],
+        products: Dict[int, Tuple[ProductKey, float]]
+    ):
+        self.offers = offers
+        self.products = products
+
+    @classmethod
+    def load(cls) -> 'BasketOptimizer':
+        """Строит индекс предложений по всем ингредиентам одним запросом"""
+        cheapest: Dict[ProductKey, Dict[Optional[str], Tuple[float, Optional[str], int]]] = defaultdict(dict)
+        products = {}
+        rows = Ingredients.objects.values_list('id', 'name', 'dimension', 'base_factor', 'store_name', 'price_per_unit')
+        for ingredient_id, name, dimension, base_factor, store_name, price in rows.iterator():
+            key = (name, dimension)
+            products[ingredient_id] = (key, float(base_factor))
+            offer = (float(price) / float(base_factor), store_name, ingredient_id)
+            current = cheapest[key].get(store_name)
+            if current is None or offer < current:
+                cheapest[key][store_name] = offer
+        offers = {
+            key: sorted(by_store.values(), key=lambda offer: (offer[0], offer[1] or '', offer[2]))
+            for key, by_store in cheapest.items()
+        }
+        return cls(offers, products)
+
+    def plan_demand(self, plan_id: int) -> Dict[ProductKey, float]:
+        """Суммирует количества товаров (в базовых единицах) по всем блюдам плана питания.
+
+        Блюда и ингредиенты, помеченные на отложенное удаление, не учитываются,
+        как и ингредиенты, добавленные после загрузки индекса.
+        """
+        demand: Dict[ProductKey, float] = defaultdict(float)
+        rows = MealIngredient.objects.filter(
+            meal__meal_plans=plan_id, meal__deleted_at__isnull=True, ingredient__deleted_at__isnull=True
+        ).values_list('ingredient_id', 'quantity')
+        for ingredient_id, quantity in rows:
+            product = self.products.get(ingredient_id)
+            if product is None:
+                continue
+            key, base_factor = product
+            demand[key] += float(quantity) * base_factor
+        return dict(demand)
+
+    def optimize(self, plan_id: int, max_stores: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Возвращает самую дешевую корзину для плана питания (None, если ограничение невыполнимо)"""
+        demand = self.plan_demand(plan_id)
+        keys = sorted(demand)
+        choice = {key: self.offers[key][0] for key in keys}
+        if max_stores is not None and len({offer[1] for offer in choice.values()}) > max_stores:
+            choice = self._solve_with_store_limit(keys, demand, max_stores)
+            if choice is None:
+                return None
+
+        items = [
+            {
+                'ingredient_id': ingredient_id,
+                'name': key[0],
+                'unit': BASE_UNITS[key[1]],
+                'quantity': demand[key],
+                'store_name': store_name,
+                'price_per_base_unit': price,
+                'cost': round(price * demand[key], 2),
+            }
+            for key in keys
+            for price, store_name, ingredient_id in [choice[key]]
+        ]
+        return {
+            'total': round(sum(item['cost'] for item in items), 2),
+            'stores': sorted({item['store_name'] for item in items}, key=lambda store: store or ''),
+            'items': items,
+        }
+
+    def _solve_with_store_limit(
+        self,
+        keys: List[ProductKey],
+        demand: Dict[ProductKey, float],
+        max_stores: int
+    ) -> Optional[Dict[ProductKey, Tuple[float, Optional[str], int]]]:
+        """Решает задачу выбора не более max_stores магазинов как MILP.
+
+        Переменные: x[i, o] - товар i покупается по предложению o,
+        y[s] - магазин s выбран.
+        """
+        stores = sorted({offer[1] for key in keys for offer in self.offers[key]}, key=lambda store: store or '')
+        store_index = {store: position for position, store in enumerate(stores)}
+        pairs = [(row, offer) for row, key in enumerate(keys) for offer in self.offers[key]]
+        pair_count, store_count = len(pairs), len(stores)
+
+        costs = np.concatenate([
+            [offer[0] * demand[keys[row]] for row, offer in pairs],
+            np.zeros(store_count)
+        ])
+        pair_ids = np.arange(pair_count)
+        item_rows = np.array([row for row, _ in pairs])
+        offer_stores = np.array([store_index[offer[1]] for _, offer in pairs])
+
+        # Каждый товар покупается ровно один раз
+        cover = sparse.csr_matrix(
+            (np.ones(pair_count), (item_rows, pair_ids)),
+            shape=(len(keys), pair_count + store_count)
+        )
+        # Покупать можно только в выбранных магазинах: x[i, o] - y[s(o)] <= 0
+        link = sparse.csr_matrix(
+            (
+                np.concatenate([np.ones(pair_count), -np.ones(pair_count)]),
+                (np.concatenate([pair_ids, pair_ids]), np.concatenate([pair_ids, pair_count + offer_stores]))
+            ),
+            shape=(pair_count, pair_count + store_count)
+        )
+        # Не больше max_stores магазинов
+        limit = sparse.csr_matrix(
+            (np.ones(store_count), (np.zeros(store_count, dtype=int), pair_count + np.arange(store_count))),
+            shape=(1, pair_count + store_count)
+        )
+
+        result = milp(
+            costs,
+            constraints=[
+                LinearConstraint(cover, 1, 1),
+                LinearConstraint(link, -np.inf, 0),
+                LinearConstraint(limit, 0, max_stores),
+            ],
+            integrality=np.ones(pair_count + store_count),
+            bounds=Bounds(0, 1),
+        )
+        if not result.success:
+            return None
+
+        choice = {}
+        for (row, offer), value in zip(pairs, result.x[:pair_count]):
+            if value > 0.5:
+                choice[keys[row]] = offer
+        return choice
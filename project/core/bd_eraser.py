@@ -9,47 +9,46 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 django.setup()
 
-from django.db import transaction
-from core.models import (
-    DietTypes, User, MealPlans, Meals, Ingredients, 
-    Favorites, MealPlanMeal, MealIngredient
-)
+import argparse
+import time
+from core.db_reset import DatabaseReset
+
 
 def clear_database():
     try:
-        with transaction.atomic():
-            print("Начинаем очистку базы данных...")
-            
-            # Удаляем данные в правильном порядке (сначала зависимые таблицы)
-            print("Удаляем связи между блюдами и ингредиентами...")
-            MealIngredient.objects.all().delete()
-            
-            print("Удаляем связи между планами и блюдами...")
-            MealPlanMeal.objects.all().delete()
-            
-            print("Удаляем избранные блюда...")
-            Favorites.objects.all().delete()
-            
-            print("Удаляем планы питания...")
-            MealPlans.objects.all().delete()
-            
-            print("Удаляем блюда...")
-            Meals.objects.all().delete()
-            
-            print("Удаляем ингредиенты...")
-            Ingredients.objects.all().delete()
-            
-            print("Удаляем пользователей сайта...")
-            User.objects.all().delete()
-            
-            print("Удаляем типы диет...")
-            DietTypes.objects.all().delete()
-            
-        print("\nБаза данных успешно очищена!")
-        print("Все таблицы были очищены в правильном порядке с учетом зависимостей.")
+        print("Начинаем очистку базы данных...")
+        started = time.perf_counter()
+        # TRUNCATE в PostgreSQL, DELETE по таблицам без загрузки строк в остальных базах
+        DatabaseReset.reset()
+        print(f"\nБаза данных успешно очищена за {time.perf_counter() - started:.2f} с!")
+        print("Счетчики ID сброшены, профили авторизации сохранены.")
     except Exception as e:
         print(f"\nОшибка при очистке базы данных: {e}")
         raise
 
+
+def snapshot_database(name):
+    started = time.perf_counter()
+    location = DatabaseReset.snapshot(name)
+    print(f"Снимок '{name}' сохранен в {location} за {time.perf_counter() - started:.2f} с.")
+
+
+def restore_database(name):
+    started = time.perf_counter()
+    DatabaseReset.restore(name)
+    print(f"База данных восстановлена из снимка '{name}' за {time.perf_counter() - started:.2f} с.")
+
+
 if __name__ == "__main__":
-    clear_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Очистка базы данных и снимки набора данных")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--snapshot', metavar='NAME', help='сохранить текущее состояние базы как снимок')
+    group.add_argument('--restore', metavar='NAME', help='вернуть базу к снимку')
+    args = parser.parse_args()
+
+    if args.snapshot:
+        snapshot_database(args.snapshot)
+    elif args.restore:
+        restore_database(args.restore)
+    else:
+        clear_database()
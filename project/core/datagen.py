@@ -0,0 +1,340 @@
+import csv
+import hashlib
+import io
+import multiprocessing
+import random
+import string
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from faker import Faker
+from typing import Optional, List, Dict, Any, Tuple
+
+from core.models import (
+    DietTypes, User, MealPlans, Meals, Ingredients, MealIngredient,
+    Favorites, MealPlanMeal, IngredientPriceHistory
+)
+from core.functions import PriceManager
+from core.units import normalize_unit
+
+# Масштаб набора данных: SF1 = 10 тыс. пользователей, остальные таблицы - пропорционально
+USERS_PER_SF = 10_000
+MEALS_PER_SF = 5_000
+INGREDIENTS_PER_SF = 1_000
+
+# Диапазоны (включительно) числа зависимых строк на одну родительскую
+PLANS_PER_USER = (0, 3)
+MEALS_PER_PLAN = (1, 7)
+FAVORITES_PER_USER = (0, 10)
+INGREDIENTS_PER_MEAL = (3, 8)
+
+# Строк родительской таблицы в одной задаче воркера
+DATAGEN_CHUNK_SIZE = 10_000
+
+# Дешевое хеширование синтетических пользователей (пароль - f"password{id}"):
+# PBKDF2 в формате werkzeug с солью из генератора задачи, чтобы хеши были воспроизводимы
+DATAGEN_PASSWORD_ITERATIONS = 1
+SALT_CHARS = string.ascii_letters + string.digits
+
+# Все даты отсчитываются от фиксированного момента, чтобы набор не зависел от времени запуска
+DATAGEN_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+DIET_TYPES = [
+    ('Balanced', False), ('Vegetarian', True), ('Vegan', True), ('Keto', True),
+    ('Paleo', True), ('Mediterranean', False), ('Gluten free', True),
+]
+UNITS = ['kg', 'g', 'l', 'ml', 'oz', 'lb', 'pcs']
+
+
+@dataclass(frozen=True)
+class DatasetPlan:
+    """Параметры генерации: размеры таблиц и начальные ID, общие для всех воркеров"""
+    seed: int
+    users: int
+    meals: int
+    ingredients: int
+    chunk_size: int
+    user_offset: int
+    plan_offset: int
+    meal_offset: int
+    ingredient_offset: int
+    diet_type_ids: Tuple[int, ...]
+    password_iterations: int
+
+    def plan_id(self, user_index: int, position: int) -> int:
+        # ID планов выводятся из индекса пользователя, чтобы воркеры не согласовывали счетчики
+        return self.plan_offset + user_index * PLANS_PER_USER[1] + position + 1
+
+
+def _rng(plan: DatasetPlan, kind: str, chunk: int) -> Tuple[random.Random, Faker]:
+    """Генераторы случайных чисел задачи, зависящие только от seed, вида и номера пачки"""
+    seed = f"{plan.seed}:{kind}:{chunk}"
+    fake = Faker('en_US')
+    fake.seed_instance(seed)
+    return random.Random(seed), fake
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return DATAGEN_EPOCH - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+
+def _password_hash(rng: random.Random, password: str, iterations: int) -> str:
+    """Хеш пароля, который принимает werkzeug.check_password_hash"""
+    salt = ''.join(rng.choices(SALT_CHARS, k=16))
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations).hex()
+    return f"pbkdf2:sha256:{iterations}${salt}${digest}"
+
+
+def _money(rng: random.Random, low: int, high: int) -> Decimal:
+    """Случайная сумма от low до high рублей с точностью до копейки"""
+    return Decimal(rng.randint(low * 100, high * 100)).scaleb(-2)
+
+
+def _generate_ingredients(plan: DatasetPlan, chunk: int) -> Dict[str, Any]:
+    rng, fake = _rng(plan, 'ingredients', chunk)
+    ingredients, history = [], []
+    start = chunk * plan.chunk_size
+    for index in range(start, min(start + plan.chunk_size, plan.ingredients)):
+        ingredient_id = plan.ingredient_offset + index + 1
+        unit = rng.choice(UNITS)
+        dimension, base_factor = normalize_unit(unit)
+        price = _money(rng, 1, 20)
+        created_at = _timestamp(rng)
+        ingredients.append((
+            ingredient_id, f"{fake.word().capitalize()} {index + 1}", price, unit,
+            fake.company(), created_at, dimension, base_factor, created_at
+        ))
+        history.append((ingredient_id, price, created_at, created_at))
+    return {
+        'ingredients': ingredients,
+        'price_history': history,
+    }
+
+
+def _generate_meals(plan: DatasetPlan, chunk: int) -> Dict[str, Any]:
+    rng, fake = _rng(plan, 'meals', chunk)
+    meals, meal_ingredients = [], []
+    start = chunk * plan.chunk_size
+    for index in range(start, min(start + plan.chunk_size, plan.meals)):
+        meal_id = plan.meal_offset + index + 1
+        created_at = _timestamp(rng)
+        meals.append((
+            meal_id, f"{fake.catch_phrase()} {index + 1}", fake.sentence(),
+            _money(rng, 5, 50), rng.choice(plan.diet_type_ids), created_at
+        ))
+        count = min(rng.randint(*INGREDIENTS_PER_MEAL), plan.ingredients)
+        # Выборка без повторов - пары (блюдо, ингредиент) уникальны без проверки в базе
+        for ingredient_index in rng.sample(range(plan.ingredients), count):
+            quantity = Decimal(rng.randint(10, 1000)).scaleb(-2)
+            meal_ingredients.append((meal_id, plan.ingredient_offset + ingredient_index + 1, quantity, created_at))
+    return {
+        'meals': meals,
+        'meal_ingredients': meal_ingredients,
+    }
+
+
+def _generate_users(plan: DatasetPlan, chunk: int) -> Dict[str, Any]:
+    rng, fake = _rng(plan, 'users', chunk)
+    users, plans, plan_meals, favorites = [], [], [], []
+    start = chunk * plan.chunk_size
+    for index in range(start, min(start + plan.chunk_size, plan.users)):
+        user_id = plan.user_offset + index + 1
+        # Индекс в имени и email гарантирует уникальность без запросов к базе
+        username = f"{fake.user_name()}{user_id}"
+        created_at = _timestamp(rng)
+        users.append((
+            user_id, username, _password_hash(rng, f"password{user_id}", plan.password_iterations),
+            Decimal(rng.randint(450, 1200)).scaleb(-1), Decimal(rng.randint(1500, 2000)).scaleb(-1),
+            rng.randint(18, 80), f"{username}@example.com", rng.choice(plan.diet_type_ids), created_at
+        ))
+        for position in range(rng.randint(*PLANS_PER_USER)):
+            plan_id = plan.plan_id(index, position)
+            plans.append((plan_id, user_id, rng.randint(7, 30), None, created_at))
+            for meal_index in rng.sample(range(plan.meals), min(rng.randint(*MEALS_PER_PLAN), plan.meals)):
+                plan_meals.append((plan.meal_offset + meal_index + 1, plan_id, created_at))
+        for meal_index in rng.sample(range(plan.meals), min(rng.randint(*FAVORITES_PER_USER), plan.meals)):
+            favorites.append((user_id, plan.meal_offset + meal_index + 1, created_at))
+    return {
+        'users': users,
+        'meal_plans': plans,
+        'meal_plan_meals': plan_meals,
+        'favorites': favorites,
+    }
+
+
+# Таблицы загрузки: модель и столбцы в порядке значений, которые возвращают генераторы
+TABLES = {
+    'ingredients': (Ingredients, [
+        'id', 'name', 'price_per_unit', 'unit', 'store_name', 'valid_from', 'dimension', 'base_factor', 'created_at'
+    ]),
+    'price_history': (IngredientPriceHistory, ['ingredient_id', 'price_per_unit', 'valid_from', 'created_at']),
+    'meals': (Meals, ['id', 'name', 'description', 'price', 'diet_type_id', 'created_at']),
+    'meal_ingredients': (MealIngredient, ['meal_id', 'ingredient_id', 'quantity', 'created_at']),
+    'users': (User, ['id', 'username', 'password_hash', 'weight', 'height', 'age', 'email', 'diet_type_id', 'created_at']),
+    'meal_plans': (MealPlans, ['id', 'user_id', 'duration', 'total_price', 'created_at']),
+    'meal_plan_meals': (MealPlanMeal, ['meal_id', 'plan_id', 'created_at']),
+    'favorites': (Favorites, ['user_id', 'meal_id', 'created_at']),
+}
+
+# Этапы генерации в порядке зависимостей внешних ключей
+STAGES = [
+    ('ingredients', _generate_ingredients, lambda plan: plan.ingredients),
+    ('meals', _generate_meals, lambda plan: plan.meals),
+    ('users', _generate_users, lambda plan: plan.users),
+]
+
+
+def _run_task(task: Tuple[str, DatasetPlan, int]) -> Dict[str, Any]:
+    name, plan, chunk = task
+    generate = next(generate for stage, generate, _ in STAGES if stage == name)
+    return generate(plan, chunk)
+
+
+def load_rows(table: str, rows: List[Tuple[Any, ...]]) -> int:
+    """Загружает строки в таблицу: COPY в PostgreSQL, пачки INSERT в остальных базах"""
+    if not rows:
+        return 0
+    model, columns = TABLES[table]
+    quote = connection.ops.quote_name
+    column_sql = ', '.join(quote(column) for column in columns)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(['' if value is None else value for value in row])
+            sql = f"COPY {quote(model._meta.db_table)} ({column_sql}) FROM STDIN WITH CSV"
+            if hasattr(cursor.cursor, 'copy'):
+                # psycopg 3
+                with cursor.cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+        else:
+            # Преобразуются только даты и Decimal; целые числа и строки передаются как есть
+            db = connections[connection.alias]
+            fields = [model._meta.get_field(column) for column in columns]
+            prepare = [
+                (index, field.get_db_prep_save) for index, field in enumerate(fields)
+                if field.get_internal_type() in ('DateTimeField', 'DecimalField')
+            ]
+            params = []
+            for row in rows:
+                row = list(row)
+                for index, prep in prepare:
+                    row[index] = prep(row[index], db)
+                params.append(row)
+            sql = f"INSERT INTO {quote(model._meta.db_table)} ({column_sql}) VALUES ({', '.join(['%s'] * len(columns))})"
+            cursor.executemany(sql, params)
+    return len(rows)
+
+
+class DataGenerator:
+    """Детерминированный генератор синтетических данных с масштабным коэффициентом.
+
+    Строки генерируются пачками в пуле процессов; каждая пачка использует
+    собственный генератор случайных чисел, выведенный из seed и номера
+    пачки, поэтому результат не зависит от числа воркеров. ID родительских
+    записей назначаются заранее, уникальность обеспечивается в памяти,
+    а загрузка идет через COPY (PostgreSQL) или пачки INSERT в
+    родительском процессе, по одной транзакции на пачку.
+    """
+
+    @staticmethod
+    def make_plan(
+        scale: float,
+        seed: int = 42,
+        chunk_size: int = DATAGEN_CHUNK_SIZE,
+        password_iterations: int = DATAGEN_PASSWORD_ITERATIONS
+    ) -> DatasetPlan:
+        """Создает типы диет при необходимости и рассчитывает размеры и начальные ID таблиц"""
+        diet_type_ids = list(DietTypes.objects.order_by('id').values_list('id', flat=True))
+        if not diet_type_ids:
+            DietTypes.objects.bulk_create([
+                DietTypes(name=name, is_restricted=is_restricted, created_at=DATAGEN_EPOCH)
+                for name, is_restricted in DIET_TYPES
+            ])
+            diet_type_ids = list(DietTypes.objects.order_by('id').values_list('id', flat=True))
+
+        def max_id(manager) -> int:
+            return manager.aggregate(max_id=Max('id'))['max_id'] or 0
+
+        return DatasetPlan(
+            seed=seed,
+            users=max(1, round(USERS_PER_SF * scale)),
+            meals=max(1, round(MEALS_PER_SF * scale)),
+            ingredients=max(INGREDIENTS_PER_MEAL[1], round(INGREDIENTS_PER_SF * scale)),
+            chunk_size=chunk_size,
+            user_offset=max_id(User.all_objects),
+            plan_offset=max_id(MealPlans.objects),
+            meal_offset=max_id(Meals.all_objects),
+            ingredient_offset=max_id(Ingredients.all_objects),
+            diet_type_ids=tuple(diet_type_ids),
+            password_iterations=password_iterations,
+        )
+
+    @staticmethod
+    def generate(
+        scale: float = 1.0,
+        seed: int = 42,
+        workers: Optional[int] = None,
+        chunk_size: int = DATAGEN_CHUNK_SIZE,
+        password_iterations: int = DATAGEN_PASSWORD_ITERATIONS,
+        reprice: bool = True
+    ) -> Dict[str, Any]:
+        """Генерирует и загружает набор данных масштаба scale; возвращает число строк по таблицам"""
+        started = time.perf_counter()
+        plan = DataGenerator.make_plan(scale, seed, chunk_size, password_iterations)
+        chunks = {name: (size(plan) + chunk_size - 1) // chunk_size for name, _, size in STAGES}
+        # Пачки одного этапа - единица параллельности: больше воркеров не нужно,
+        # а при одной пачке на этап (демонстрационные наборы) запуск пула
+        # дороже самой генерации, и строки генерируются в этом процессе
+        workers = min(workers or multiprocessing.cpu_count(), max(chunks.values()))
+        counts = {table: 0 for table in TABLES}
+
+        # Воркеры только генерируют строки и не обращаются к базе,
+        # поэтому соединение родительского процесса не закрывается
+        pool = multiprocessing.Pool(workers) if workers > 1 else None
+        try:
+            for name, _, _ in STAGES:
+                tasks = [(name, plan, chunk) for chunk in range(chunks[name])]
+                results = pool.imap(_run_task, tasks) if pool else map(_run_task, tasks)
+                for tables in results:
+                    with transaction.atomic():
+                        for table, rows in tables.items():
+                            counts[table] += load_rows(table, rows)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Явные ID не сдвигают последовательности - выравниваем их
+                for sql in connection.ops.sequence_reset_sql(no_style(), [User, MealPlans, Meals, Ingredients]):
+                    cursor.execute(sql)
+            DataGenerator.analyze()
+
+        if reprice:
+            PriceManager.bulk_update_all_meal_prices()
+            PriceManager.bulk_update_all_meal_plan_prices()
+
+        return {'rows': counts, 'elapsed': time.perf_counter() - started}
+
+    @staticmethod
+    def analyze() -> None:
+        """Обновляет статистику планировщика PostgreSQL по загруженным таблицам.
+
+        Без нее планировщик выбирает для пересчета цен вложенные циклы
+        по только что загруженным таблицам. В остальных базах ничего не делает.
+        """
+        if connection.vendor != 'postgresql':
+            return
+        tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model, _ in TABLES.values())
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {tables}")
@@ -0,0 +1,138 @@
+import sqlite3
+from pathlib import Path
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from typing import List
+
+from core.models import (
+    DietTypes, User, MealPlans, Meals, Ingredients, MealIngredient, Favorites, MealPlanMeal,
+    IngredientPriceHistory, Profile, RepricingWorkUnit, DeletionJob, MealNeighbor, MealNeighborBuild
+)
+
+# Таблицы приложения в порядке удаления (сначала зависимые)
+RESET_MODELS = [
+    MealIngredient, MealPlanMeal, Favorites, MealNeighbor, IngredientPriceHistory, MealPlans,
+    Meals, Ingredients, User, DietTypes, RepricingWorkUnit, DeletionJob, MealNeighborBuild,
+]
+
+
+def _tables(models) -> List[str]:
+    return [connection.ops.quote_name(model._meta.db_table) for model in models]
+
+
+def _snapshot_database(name: str) -> str:
+    return f"{connection.settings_dict['NAME']}_snapshot_{name}"
+
+
+def _snapshot_file(name: str) -> Path:
+    return Path(settings.DB_SNAPSHOT_DIR) / f"{name}.sqlite3"
+
+
+class DatabaseReset:
+    """Быстрая очистка базы и снимки заполненного набора данных.
+
+    Очистка в PostgreSQL выполняется одним TRUNCATE ... RESTART IDENTITY
+    CASCADE, в остальных базах - DELETE по таблицам без загрузки строк
+    и сбросом счетчиков ID. Снимки в PostgreSQL - отдельные базы,
+    создаваемые из рабочей как из шаблона (CREATE DATABASE ... TEMPLATE),
+    в SQLite - копии файла через backup API в settings.DB_SNAPSHOT_DIR.
+    """
+
+    @staticmethod
+    def reset() -> None:
+        """Удаляет все данные приложения и сбрасывает счетчики ID.
+
+        Может выполняться внутри внешней транзакции (например, в TestCase)
+        после вставок с отложенными проверками внешних ключей.
+        """
+        with transaction.atomic():
+            # Профили авторизации ссылаются на пользователей сайта: связь обнуляется,
+            # сами профили сохраняются
+            profiles = list(Profile.objects.values_list('id', 'user_id', 'created_at'))
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    tables = ', '.join(_tables(RESET_MODELS + [Profile]))
+                    # Отложенные проверки внешних ключей текущей транзакции запрещают TRUNCATE
+                    cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                    cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+                    Profile.objects.bulk_create([
+                        Profile(id=profile_id, user_id=user_id, created_at=created_at)
+                        for profile_id, user_id, created_at in profiles
+                    ])
+                    for sql in connection.ops.sequence_reset_sql(no_style(), [Profile]):
+                        cursor.execute(sql)
+                else:
+                    Profile.objects.update(site_user=None)
+                    for table in _tables(RESET_MODELS):
+                        cursor.execute(f"DELETE FROM {table}")
+                    if connection.vendor == 'sqlite':
+                        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'")
+                        if cursor.fetchone():
+                            names = [model._meta.db_table for model in RESET_MODELS]
+                            cursor.execute(
+                                f"DELETE FROM sqlite_sequence WHERE name IN ({', '.join(['%s'] * len(names))})", names
+                            )
+
+    @staticmethod
+    def snapshot(name: str) -> str:
+        """Сохраняет текущее состояние базы как снимок name; возвращает его расположение"""
+        if connection.vendor == 'postgresql':
+            target = _snapshot_database(name)
+            quote = connection.ops.quote_name
+            # База-шаблон не должна иметь активных соединений, в том числе нашего
+            connection.close()
+            with connection._nodb_cursor() as cursor:
+                cursor.execute(f"DROP DATABASE IF EXISTS {quote(target)}")
+                cursor.execute(
+                    f"CREATE DATABASE {quote(target)} TEMPLATE {quote(connection.settings_dict['NAME'])}"
+                )
+            return target
+
+        if connection.vendor == 'sqlite':
+            path = _snapshot_file(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            connection.ensure_connection()
+            with sqlite3.connect(path) as target:
+                connection.connection.backup(target)
+            target.close()
+            return str(path)
+
+        raise NotImplementedError(f"Snapshots are not supported for {connection.vendor}")
+
+    @staticmethod
+    def restore(name: str) -> None:
+        """Возвращает базу к снимку name"""
+        if connection.vendor == 'postgresql':
+            source = _snapshot_database(name)
+            database = connection.settings_dict['NAME']
+            quote = connection.ops.quote_name
+            connection.close()
+            with connection._nodb_cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [source])
+                if cursor.fetchone() is None:
+                    raise FileNotFoundError(f"Snapshot database {source} does not exist")
+                cursor.execute(f"DROP DATABASE IF EXISTS {quote(database)} WITH (FORCE)")
+                cursor.execute(f"CREATE DATABASE {quote(database)} TEMPLATE {quote(source)}")
+            return
+
+        if connection.vendor == 'sqlite':
+            path = _snapshot_file(name)
+            if not path.exists():
+                raise FileNotFoundError(f"Snapshot file {path} does not exist")
+            connection.ensure_connection()
+            with sqlite3.connect(path) as source:
+                source.backup(connection.connection)
+            source.close()
+            return
+
+        raise NotImplementedError(f"Snapshots are not supported for {connection.vendor}")
+
+    @staticmethod
+    def drop_snapshot(name: str) -> None:
+        """Удаляет снимок name"""
+        if connection.vendor == 'postgresql':
+            with connection._nodb_cursor() as cursor:
+                cursor.execute(f"DROP DATABASE IF EXISTS {connection.ops.quote_name(_snapshot_database(name))}")
+        else:
+            _snapshot_file(name).unlink(missing_ok=True)
@@ -0,0 +1,161 @@
+from django.db import transaction
+from django.db.models import Q, F, Value, CharField
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+from typing import Optional, List, Dict, Any, Iterable, Callable, Tuple
+
+from core.models import (
+    User, MealPlans, Meals, Ingredients, MealIngredient,
+    Favorites, MealPlanMeal, MealNeighbor, IngredientPriceHistory, DeletionJob
+)
+from core.price_cache import MealPriceCache
+
+# Сколько зависимых строк удаляется за одну короткую транзакцию
+DELETION_CHUNK_SIZE = 1000
+
+
+def delete_rows(queryset) -> int:
+    """Удаляет строки выборки через QuerySet.delete(); возвращает число удаленных строк ее модели.
+
+    Вызывающий код заранее удаляет зависимые строки, начиная с дочерних
+    таблиц, поэтому сборщик каскада находит связи пустыми, а модели без
+    сигналов и каскадных связей удаляются одним DELETE без загрузки строк.
+    """
+    _, deleted = queryset.delete()
+    return deleted.get(queryset.model._meta.label, 0)
+
+
+# Этапы удаления для каждого вида записей: (название этапа, зависимые строки).
+# Зависимые строки удаляются пачками по ID, сама запись - последним этапом.
+DELETION_STAGES: Dict[str, List[Tuple[str, Callable[[int], Any]]]] = {
+    DeletionJob.MODEL_USER: [
+        ('favorites', lambda user_id: Favorites.objects.filter(user_id=user_id)),
+        ('meal_plan_meals', lambda user_id: MealPlanMeal.objects.filter(plan__user_id=user_id)),
+        ('meal_plans', lambda user_id: MealPlans.objects.filter(user_id=user_id)),
+    ],
+    DeletionJob.MODEL_MEAL: [
+        ('meal_ingredients', lambda meal_id: MealIngredient.objects.filter(meal_id=meal_id)),
+        ('meal_plan_meals', lambda meal_id: MealPlanMeal.objects.filter(meal_id=meal_id)),
+        ('favorites', lambda meal_id: Favorites.objects.filter(meal_id=meal_id)),
+        ('meal_neighbors', lambda meal_id: MealNeighbor.objects.filter(Q(meal_id=meal_id) | Q(neighbor_id=meal_id))),
+    ],
+    DeletionJob.MODEL_INGREDIENT: [
+        ('meal_ingredients', lambda ingredient_id: MealIngredient.objects.filter(ingredient_id=ingredient_id)),
+        ('price_history', lambda ingredient_id: IngredientPriceHistory.objects.filter(ingredient_id=ingredient_id)),
+    ],
+}
+
+DELETION_MODELS = {
+    DeletionJob.MODEL_USER: User,
+    DeletionJob.MODEL_MEAL: Meals,
+    DeletionJob.MODEL_INGREDIENT: Ingredients,
+}
+
+
+def _placeholder(prefix: str, suffix: str = '') -> Concat:
+    """Уникальное по ID значение для освобождаемого поля помеченной записи"""
+    return Concat(Value(prefix), Cast(F('id'), CharField()), Value(suffix), output_field=CharField())
+
+
+# Уникальные поля, которые освобождаются при пометке, чтобы их можно было
+# сразу занять новой записью, не дожидаясь задания удаления
+RELEASED_FIELDS: Dict[str, Dict[str, Callable[[], Any]]] = {
+    DeletionJob.MODEL_USER: {
+        'username': lambda: _placeholder('deleted-'),
+        'email': lambda: _placeholder('deleted-', '@deleted.invalid'),
+    },
+}
+
+
+class DeferredDeletion:
+    """Отложенное удаление пользователей, блюд и ингредиентов.
+
+    Запись сразу помечается deleted_at и пропадает из менеджера objects,
+    а ее уникальные поля из RELEASED_FIELDS освобождаются. Фоновый
+    обработчик удаляет зависимые строки пачками по DELETION_CHUNK_SIZE,
+    каждую в своей короткой транзакции, и сохраняет прогресс в DeletionJob. После сбоя обработка продолжается с того же
+    этапа; удаление пачки по ID идемпотентно.
+    """
+
+    @staticmethod
+    def schedule(model_name: str, object_ids: Iterable[int]) -> List[DeletionJob]:
+        """Помечает записи удаленными и ставит задания на удаление зависимых строк"""
+        model = DELETION_MODELS[model_name]
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(model.objects.filter(id__in=list(object_ids)).values_list('id', flat=True))
+            released = {field: value() for field, value in RELEASED_FIELDS.get(model_name, {}).items()}
+            model.objects.filter(id__in=ids).update(deleted_at=now, **released)
+            if model_name == DeletionJob.MODEL_MEAL:
+                MealPriceCache.invalidate_meals(ids)
+            elif model_name == DeletionJob.MODEL_INGREDIENT:
+                MealPriceCache.invalidate_ingredients(ids)
+            return DeletionJob.objects.bulk_create([
+                DeletionJob(model_name=model_name, object_id=object_id, created_at=now, updated_at=now)
+                for object_id in ids
+            ])
+
+    @staticmethod
+    def process_chunk(job_id: int, chunk_size: int = DELETION_CHUNK_SIZE) -> Optional[bool]:
+        """Выполняет одну пачку задания в отдельной транзакции.
+
+        Возвращает True, если задание продвинулось, False, если его
+        сейчас обрабатывает другой воркер, и None, если оно завершено.
+        """
+        with transaction.atomic():
+            job = (
+                DeletionJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(id=job_id, status=DeletionJob.STATUS_PENDING)
+                .first()
+            )
+            if job is None:
+                return None if DeletionJob.objects.filter(id=job_id, status=DeletionJob.STATUS_DONE).exists() else False
+
+            for stage, dependents in DELETION_STAGES[job.model_name]:
+                queryset = dependents(job.object_id)
+                ids = list(queryset.values_list('id', flat=True)[:chunk_size])
+                if ids:
+                    job.stage = stage
+                    if queryset.model is MealIngredient:
+                        # Цены блюд из кэша, прочитанные до обработки задания
+                        MealPriceCache.invalidate_meals(
+                            MealIngredient.objects.filter(id__in=ids).values_list('meal_id', flat=True)
+                        )
+                    job.deleted_rows += delete_rows(queryset.model.objects.filter(id__in=ids))
+                    break
+            else:
+                job.stage = 'object'
+                model = DELETION_MODELS[job.model_name]
+                job.deleted_rows += delete_rows(model.all_objects.filter(id=job.object_id))
+                job.status = DeletionJob.STATUS_DONE
+                job.finished_at = timezone.now()
+
+            job.updated_at = timezone.now()
+            job.save(update_fields=['stage', 'deleted_rows', 'status', 'updated_at', 'finished_at'])
+            return True
+
+    @staticmethod
+    def run_job(job_id: int, chunk_size: int = DELETION_CHUNK_SIZE) -> None:
+        """Обрабатывает задание пачками до завершения (или пока его держит другой воркер)"""
+        while DeferredDeletion.process_chunk(job_id, chunk_size):
+            pass
+
+    @staticmethod
+    def run_pending(chunk_size: int = DELETION_CHUNK_SIZE, limit: Optional[int] = None) -> int:
+        """Обрабатывает ожидающие задания; возвращает количество завершенных"""
+        finished = 0
+        pending = DeletionJob.objects.filter(status=DeletionJob.STATUS_PENDING).order_by('id').values_list('id', flat=True)
+        for job_id in list(pending[:limit] if limit else pending):
+            DeferredDeletion.run_job(job_id, chunk_size)
+            finished += DeletionJob.objects.filter(id=job_id, status=DeletionJob.STATUS_DONE).count()
+        return finished
+
+    @staticmethod
+    def progress() -> Dict[str, Any]:
+        """Возвращает количество выполненных и оставшихся заданий"""
+        jobs = DeletionJob.objects.all()
+        return {
+            'done': jobs.filter(status=DeletionJob.STATUS_DONE).count(),
+            'pending': jobs.filter(status=DeletionJob.STATUS_PENDING).count(),
+        }
@@ -0,0 +1,179 @@
+import functools
+import multiprocessing
+from decimal import Decimal
+from django.test import TestCase
+from typing import Optional, List, Dict, Any, Sequence
+
+from core.models import (
+    DietTypes, User, MealPlans, Meals, Ingredients, MealIngredient, Favorites, MealPlanMeal, IngredientPriceHistory
+)
+from core.units import normalize_unit
+
+# Фабрики тестовых данных: каждая создает все строки одним bulk_create на
+# таблицу (вместо INSERT на строку) и возвращает объекты с заполненными ID.
+# Данные детерминированы: i-я строка получает i-е имя, цену и количество.
+
+
+def make_diet_types(count: int = 1, prefix: str = 'Diet') -> List[DietTypes]:
+    """Создает count типов диет"""
+    return DietTypes.objects.bulk_create([
+        DietTypes(name=f'{prefix} {i}', is_restricted=bool(i % 2)) for i in range(count)
+    ])
+
+
+def make_users(count: int, prefix: str = 'user', diet_types: Sequence[DietTypes] = ()) -> List[User]:
+    """Создает count пользователей; пароли не хешируются (хеш - заглушка)"""
+    return User.objects.bulk_create([
+        User(
+            username=f'{prefix}{i}',
+            password_hash=f'hash-{prefix}{i}',
+            email=f'{prefix}{i}@example.com',
+            diet_type=diet_types[i % len(diet_types)] if diet_types else None
+        )
+        for i in range(count)
+    ])
+
+
+def make_ingredients(
+    count: int,
+    prefix: str = 'Ingredient',
+    unit: str = 'kg',
+    price: Decimal = Decimal('1.00'),
+    store_name: Optional[str] = None
+) -> List[Ingredients]:
+    """Создает count ингредиентов с ценой price + i копеек и строками истории цен"""
+    dimension, base_factor = normalize_unit(unit)
+    ingredients = Ingredients.objects.bulk_create([
+        Ingredients(
+            name=f'{prefix} {i}',
+            price_per_unit=price + Decimal(i).scaleb(-2),
+            unit=unit,
+            store_name=store_name,
+            dimension=dimension,
+            base_factor=base_factor
+        )
+        for i in range(count)
+    ])
+    IngredientPriceHistory.objects.bulk_create([
+        IngredientPriceHistory(ingredient_id=ingredient.id, price_per_unit=ingredient.price_per_unit)
+        for ingredient in ingredients
+    ])
+    return ingredients
+
+
+def make_meals(
+    count: int,
+    prefix: str = 'Meal',
+    ingredients: Sequence[Ingredients] = (),
+    lines_per_meal: int = 0,
+    quantity: Decimal = Decimal('1.00'),
+    price: Decimal = Decimal('1.00'),
+    diet_types: Sequence[DietTypes] = ()
+) -> List[Meals]:
+    """Создает count блюд, каждое - с lines_per_meal ингредиентами (по кругу из ingredients)"""
+    meals = Meals.objects.bulk_create([
+        Meals(
+            name=f'{prefix} {i}',
+            price=price,
+            diet_type=diet_types[i % len(diet_types)] if diet_types else None
+        )
+        for i in range(count)
+    ])
+    if ingredients and lines_per_meal:
+        lines = min(lines_per_meal, len(ingredients))
+        MealIngredient.objects.bulk_create([
+            MealIngredient(
+                meal_id=meal.id, ingredient_id=ingredients[(i + j) % len(ingredients)].id, quantity=quantity
+            )
+            for i, meal in enumerate(meals)
+            for j in range(lines)
+        ])
+    return meals
+
+
+def make_meal_plans(
+    users: Sequence[User],
+    meals: Sequence[Meals],
+    plans_per_user: int = 1,
+    meals_per_plan: int = 0,
+    duration: int = 7
+) -> List[MealPlans]:
+    """Создает plans_per_user планов на пользователя, в каждом meals_per_plan блюд (по кругу)"""
+    plans = MealPlans.objects.bulk_create([
+        MealPlans(user_id=user.id, duration=duration) for user in users for _ in range(plans_per_user)
+    ])
+    if meals and meals_per_plan:
+        count = min(meals_per_plan, len(meals))
+        MealPlanMeal.objects.bulk_create([
+            MealPlanMeal(plan_id=plan.id, meal_id=meals[(i + j) % len(meals)].id)
+            for i, plan in enumerate(plans)
+            for j in range(count)
+        ])
+    return plans
+
+
+def make_favorites(users: Sequence[User], meals: Sequence[Meals], per_user: int = 1) -> List[Favorites]:
+    """Добавляет каждому пользователю per_user избранных блюд (по кругу, без повторов)"""
+    count = min(per_user, len(meals))
+    return Favorites.objects.bulk_create([
+        Favorites(user_id=user.id, meal_id=meals[(i + j) % len(meals)].id)
+        for i, user in enumerate(users)
+        for j in range(count)
+    ])
+
+
+def make_dataset(
+    users: int = 10,
+    meals: int = 20,
+    ingredients: int = 10,
+    diet_types: int = 3,
+    lines_per_meal: int = 3,
+    plans_per_user: int = 1,
+    meals_per_plan: int = 3,
+    favorites_per_user: int = 2
+) -> Dict[str, List[Any]]:
+    """Создает связанный набор данных всех таблиц и возвращает созданные объекты по таблицам"""
+    data: Dict[str, List[Any]] = {'diet_types': make_diet_types(diet_types)}
+    data['users'] = make_users(users, diet_types=data['diet_types'])
+    data['ingredients'] = make_ingredients(ingredients)
+    data['meals'] = make_meals(
+        meals, ingredients=data['ingredients'], lines_per_meal=lines_per_meal, diet_types=data['diet_types']
+    )
+    data['meal_plans'] = make_meal_plans(data['users'], data['meals'], plans_per_user, meals_per_plan)
+    data['favorites'] = make_favorites(data['users'], data['meals'], favorites_per_user)
+    return data
+
+
+class DatasetTestCase(TestCase):
+    """TestCase с общим для класса набором данных.
+
+    Набор создается один раз в setUpTestData по параметрам dataset
+    (аргументы make_dataset), а каждый тест откатывает свои изменения
+    к нему через точку сохранения. В cls.ids хранятся ID созданных строк
+    по таблицам: атрибуты setUpTestData копируются для каждого теста,
+    и копировать тысячи объектов моделей было бы дороже самих тестов.
+    """
+    dataset: Dict[str, int] = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ids = {
+            table: [obj.id for obj in objects]
+            for table, objects in make_dataset(**cls.dataset).items()
+        }
+
+
+def requires_subprocesses(test_func):
+    """Пропускает тест, запускающий процессы, внутри параллельного воркера тестов.
+
+    Воркеры manage.py test --parallel - демоны и не могут создавать
+    дочерние процессы; ParallelDiscoverRunner по этой пометке выполняет
+    такие тесты в основном процессе после параллельной части.
+    """
+    @functools.wraps(test_func)
+    def wrapper(self, *args, **kwargs):
+        if multiprocessing.current_process().daemon:
+            self.skipTest('daemonic test worker cannot start subprocesses; run with --parallel 1')
+        return test_func(self, *args, **kwargs)
+    wrapper.requires_subprocesses = True
+    return wrapper
@@ -1,17 +1,259 @@
+import asyncio
+import time
+from collections import defaultdict
+from decimal import Decimal
 from faker import Faker
-from django.db.models import Sum
+from django.db.models import (
+    Q, Sum, F, Min, Max, OuterRef, Subquery, Value, DecimalField, FloatField, Prefetch
+)
+from django.db.models.functions import Cast, Coalesce, Round
 from core.models import (
     User, MealPlans, Meals, Ingredients, MealIngredient,
-    DietTypes, Favorites, MealPlanMeal
+    DietTypes, Favorites, MealPlanMeal, MealNeighbor, IngredientPriceHistory, DeletionJob
+)
+from core.money import (
+    PRICE_PLACES, PLAN_PRICE_PLACES, QUANTITY_PLACES, LINE_SCALE,
+    from_minor, minor_units, round_decimal, round_half_up, sum_line_costs
 )
-from werkzeug.security import generate_password_hash, check_password_hash
+from core.deletion import DeferredDeletion, delete_rows
+from core.passwords import (
+    hash_password, hash_passwords, verify_password as check_password, verify_password_async as check_password_async
+)
+from core.price_cache import MealPriceCache
+from core.recommendations import MealRecommender
+from core.routers import use_primary
+from core.search import MealSearch, IngredientSearch
+from core.units import BASE_UNITS, normalize_unit
+from asgiref.sync import sync_to_async
+from django.utils import timezone
 from django.db import transaction
-from typing import Optional, List, Dict, Any
+from itertools import islice, tee
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Sequence
 from datetime import datetime
 
 # Инициализация Faker
 fake = Faker()
 
+# Размер пачки (по диапазону ID) для массовых UPDATE при пересчете цен
+BULK_PRICE_BATCH_SIZE = 5000
+
+# Размер пачки для массовых INSERT в create_*_bulk
+BULK_CREATE_BATCH_SIZE = 1000
+
+# Размер пачки строк, которые потоковые iter_all_* получают из курсора за раз
+STREAM_CHUNK_SIZE = 2000
+
+# Размер страницы по умолчанию и допустимые ключи сортировки для get_*_page
+PAGE_SIZE = 100
+KEYSET_ORDERINGS = ('id', 'created_at')
+
+# Поля блюд, загружаемые вместе с планом питания (with_meals)
+PLAN_MEAL_FIELDS = ('id', 'name', 'price')
+
+# Размер пачки ID для delete_*_many (одна транзакция на пачку)
+BULK_DELETE_BATCH_SIZE = 1000
+
+# Режимы обработки конфликтов уникальности в create_*_bulk
+ON_CONFLICT_IGNORE = 'ignore'
+ON_CONFLICT_UPDATE = 'update'
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Разбивает список на пачки фиксированного размера"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Разбивает поток на пачки, не загружая его в память целиком"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _bulk_create(
+    model,
+    objects: Iterable[Any],
+    batch_size: int,
+    on_conflict: Optional[str] = None,
+    unique_fields: Optional[List[str]] = None,
+    update_fields: Optional[List[str]] = None
+) -> List[Optional[int]]:
+    """Вставляет объекты пачками через bulk_create и возвращает их ID.
+
+    on_conflict=None - ошибка при нарушении уникальности,
+    ON_CONFLICT_IGNORE - конфликтующие строки пропускаются (их ID, как и ID
+    вставленных строк в этом режиме, базы данных не возвращают - вместо них None),
+    ON_CONFLICT_UPDATE - конфликтующие строки обновляются по unique_fields (upsert).
+    """
+    options: Dict[str, Any] = {}
+    if on_conflict == ON_CONFLICT_IGNORE:
+        options['ignore_conflicts'] = True
+    elif on_conflict == ON_CONFLICT_UPDATE:
+        if not unique_fields:
+            raise ValueError(f"{model.__name__} has no unique key to upsert on")
+        options.update(update_conflicts=True, unique_fields=unique_fields, update_fields=update_fields)
+    elif on_conflict is not None:
+        raise ValueError(f"Unknown on_conflict mode: {on_conflict}")
+
+    ids = []
+    for batch in _batched(objects, batch_size):
+        ids.extend(obj.pk for obj in model.objects.bulk_create(batch, **options))
+    return ids
+
+
+def _stream(queryset, chunk_size: int) -> Iterator[Any]:
+    """Потоково отдает строки в порядке ID (серверный курсор в PostgreSQL)"""
+    return queryset.order_by('id').iterator(chunk_size=chunk_size)
+
+
+async def _alist(queryset) -> List[Any]:
+    """Загружает выборку через асинхронный ORM"""
+    return [row async for row in queryset]
+
+
+def _project(queryset, fields: Optional[Sequence[str]]):
+    """Загружает только поля fields; связанные поля ('diet_type__name') - через JOIN"""
+    if not fields:
+        return queryset
+    related = {field.rsplit('__', 1)[0] for field in fields if '__' in field}
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*fields)
+
+
+def _with_plan_meals(queryset):
+    """Подгружает блюда планов одним запросом на страницу"""
+    return queryset.prefetch_related(
+        Prefetch('meals', queryset=Meals.objects.only(*PLAN_MEAL_FIELDS).order_by('id'))
+    )
+
+
+def _keyset_page(
+    queryset,
+    after: Optional[Tuple[Any, ...]],
+    limit: int,
+    order_by: str,
+    fields: Optional[Sequence[str]] = None,
+    as_values: bool = False
+) -> Tuple[List[Any], Optional[Tuple[Any, ...]]]:
+    """Возвращает страницу по ключу (order_by, id) и курсор следующей страницы.
+
+    Курсор - кортеж значений ключа последней строки страницы: (id,) или
+    (created_at, id). Следующая страница начинается строго после него, поэтому
+    стоимость запроса не зависит от номера страницы. None - страниц больше нет.
+    fields ограничивает загружаемые столбцы (ключ сортировки добавляется сам).
+    as_values возвращает словари values(*fields) вместо объектов моделей.
+    """
+    if order_by not in KEYSET_ORDERINGS:
+        raise ValueError(f"Unsupported keyset ordering: {order_by}")
+    ordering = ['id'] if order_by == 'id' else [order_by, 'id']
+    if fields or as_values:
+        fields = [*(fields or ()), *(field for field in ordering if field not in (fields or ()))]
+        queryset = queryset.values(*fields) if as_values else _project(queryset, fields)
+    if after is not None:
+        if order_by == 'id':
+            queryset = queryset.filter(id__gt=after[0])
+        else:
+            value, last_id = after
+            queryset = queryset.filter(Q(**{f'{order_by}__gt': value}) | Q(**{order_by: value, 'id__gt': last_id}))
+    items = list(queryset.order_by(*ordering)[:limit])
+    if len(items) < limit:
+        return items, None
+    if as_values:
+        return items, tuple(items[-1][field] for field in ordering)
+    return items, tuple(getattr(items[-1], field) for field in ordering)
+
+
+def _delete_in_batches(ids: Iterable[int], delete_batch) -> int:
+    """Вызывает delete_batch для пачек ID, каждую - в своей транзакции"""
+    deleted = 0
+    for batch in _batched(ids, BULK_DELETE_BATCH_SIZE):
+        with transaction.atomic():
+            deleted += delete_batch(batch)
+    return deleted
+
+
+def _active_lines(queryset):
+    """Строки MealIngredient без ингредиентов, помеченных на отложенное удаление"""
+    return queryset.filter(ingredient__deleted_at__isnull=True)
+
+
+def _active_plan_meals(queryset):
+    """Строки MealPlanMeal без блюд, помеченных на отложенное удаление"""
+    return queryset.filter(meal__deleted_at__isnull=True)
+
+
+def _ingredient_price_as_of(as_of: datetime, ingredient_ref: str = 'ingredient') -> Subquery:
+    """Подзапрос цены ингредиента, действовавшей на дату (индекс ingredient + valid_from)"""
+    return Subquery(
+        IngredientPriceHistory.objects
+        .filter(ingredient=OuterRef(ingredient_ref), valid_from__lte=as_of)
+        .order_by('-valid_from', '-id')
+        .values('price_per_unit')[:1]
+    )
+
+
+def _sum_quantities_as_of(queryset, as_of: datetime) -> Decimal:
+    """Суммирует price * quantity по строкам MealIngredient по ценам на дату"""
+    return (
+        queryset
+        .annotate(price=_ingredient_price_as_of(as_of))
+        .aggregate(total=Sum(F('price') * F('quantity')))['total']
+    ) or Decimal(0)
+
+
+def _dashboard_user(username: str):
+    return User.objects.filter(username=username).values('id', 'username', 'email', 'diet_type_id', 'diet_type__name')
+
+
+def _dashboard_queries(user_id: int) -> Tuple[Any, Any, Any]:
+    """Независимые выборки панели пользователя: планы, блюда планов, избранное"""
+    plans = MealPlans.objects.filter(user_id=user_id).order_by('id').values('id', 'duration', 'total_price', 'created_at')
+    plan_meals = (
+        MealPlanMeal.objects
+        .filter(plan__user_id=user_id, meal__deleted_at__isnull=True)
+        .order_by('plan_id', 'id')
+        .values_list('plan_id', 'meal_id', 'meal__name', 'meal__price')
+    )
+    favorites = (
+        Favorites.objects
+        .filter(user_id=user_id, meal__deleted_at__isnull=True)
+        .order_by('id')
+        .values_list('meal_id', 'meal__name', 'meal__price')
+    )
+    return plans, plan_meals, favorites
+
+
+def _build_dashboard(
+    user: Dict[str, Any],
+    plan_rows: List[Dict[str, Any]],
+    plan_meal_rows: List[Tuple[Any, ...]],
+    favorite_rows: List[Tuple[Any, ...]]
+) -> Dict[str, Any]:
+    """Собирает панель пользователя из строк _dashboard_queries.
+
+    Запросы выполняются без общего снимка, поэтому блюда плана, созданного
+    после выборки планов, пропускаются.
+    """
+    plans = {plan['id']: {**plan, 'meals': []} for plan in plan_rows}
+    for plan_id, meal_id, name, price in plan_meal_rows:
+        if plan_id in plans:
+            plans[plan_id]['meals'].append({'id': meal_id, 'name': name, 'price': price})
+    return {
+        'user': {
+            'id': user['id'],
+            'username': user['username'],
+            'email': user['email'],
+            'diet_type': {'id': user['diet_type_id'], 'name': user['diet_type__name']} if user['diet_type_id'] else None,
+        },
+        'plans': list(plans.values()),
+        'favorites': [{'id': meal_id, 'name': name, 'price': price} for meal_id, name, price in favorite_rows],
+    }
+
 
 class UserManager:
     """Класс для управления пользователями"""
@@ -29,7 +271,7 @@ class UserManager:
         """Создает нового пользователя"""
         return User.objects.create(
             username=username,
-            password_hash=generate_password_hash(password),
+            password_hash=hash_password(password),
             email=email,
             weight=weight,
             height=height,
@@ -37,29 +279,123 @@ class UserManager:
             diet_type_id=diet_type_id
         )
 
+    @staticmethod
+    def create_user_bulk(
+        users: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_CREATE_BATCH_SIZE,
+        on_conflict: Optional[str] = None,
+        workers: Optional[int] = None
+    ) -> List[Optional[int]]:
+        """Создает пользователей пачками (аргументы каждого - как у create_user); upsert по username.
+
+        Пароли хешируются в пуле из workers процессов (по умолчанию
+        settings.PASSWORD_HASH_WORKERS), пока предыдущие пачки вставляются в базу.
+        """
+        users, pending = tee(users)
+        hashes = hash_passwords((user['password'] for user in pending), workers, batch_size)
+        return _bulk_create(
+            User,
+            (
+                User(
+                    username=user['username'],
+                    password_hash=password_hash,
+                    email=user['email'],
+                    weight=user.get('weight'),
+                    height=user.get('height'),
+                    age=user.get('age'),
+                    diet_type_id=user.get('diet_type_id')
+                )
+                for user, password_hash in zip(users, hashes)
+            ),
+            batch_size,
+            on_conflict,
+            unique_fields=['username'],
+            update_fields=['password_hash', 'email', 'weight', 'height', 'age', 'diet_type']
+        )
+
     @staticmethod
     def get_all_users() -> List[User]:
         """Возвращает список всех пользователей"""
         return list(User.objects.all())
 
+    @staticmethod
+    def iter_all_users(chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[User]:
+        """Потоково перебирает всех пользователей пачками по chunk_size строк"""
+        return _stream(User.objects.all(), chunk_size)
+
+    @staticmethod
+    def get_users_page(
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = PAGE_SIZE,
+        order_by: str = 'id',
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[User], Optional[Tuple[Any, ...]]]:
+        """Возвращает страницу пользователей после курсора и курсор следующей страницы"""
+        return _keyset_page(User.objects.all(), after, limit, order_by, fields)
+
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[User]:
         """Находит пользователя по ID"""
         return User.objects.filter(id=user_id).first()
 
+    @staticmethod
+    async def aget_user_by_id(user_id: int) -> Optional[User]:
+        """Асинхронно находит пользователя по ID"""
+        return await User.objects.filter(id=user_id).afirst()
+
+    @staticmethod
+    def get_recommended_meals(user_id: int, limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Рекомендации блюд по избранному пользователя (одна выборка из таблицы соседей)"""
+        return MealRecommender.recommend(user_id, limit)
+
+    @staticmethod
+    def get_user_dashboard(username: str) -> Optional[Dict[str, Any]]:
+        """Возвращает планы пользователя с блюдами и ценами и его избранное за 4 запроса"""
+        user = _dashboard_user(username).first()
+        if user is None:
+            return None
+        return _build_dashboard(user, *(list(queryset) for queryset in _dashboard_queries(user['id'])))
+
+    @staticmethod
+    async def aget_user_dashboard(username: str) -> Optional[Dict[str, Any]]:
+        """Асинхронный get_user_dashboard: планы, блюда планов и избранное запрашиваются одновременно"""
+        user = await _dashboard_user(username).afirst()
+        if user is None:
+            return None
+        rows = await asyncio.gather(*(_alist(queryset) for queryset in _dashboard_queries(user['id'])))
+        return _build_dashboard(user, *rows)
+
     @staticmethod
     def delete_user(user_id: int) -> bool:
         """Удаляет пользователя по ID"""
-        user = UserManager.get_user_by_id(user_id)
-        if user:
-            user.delete()
-            return True
-        return False
+        return UserManager.delete_user_many([user_id]) > 0
+
+    @staticmethod
+    def delete_user_many(user_ids: Iterable[int]) -> int:
+        """Удаляет пользователей с их планами и избранным набором DELETE, начиная с дочерних таблиц"""
+        def delete_batch(ids: List[int]) -> int:
+            delete_rows(Favorites.objects.filter(user_id__in=ids))
+            # plan__in вместо plan__user_id__in: связь дала бы DELETE ... WHERE id IN (самосоединение),
+            # которое при нулевой оценке строк планировщик перебирает заново для каждой строки
+            delete_rows(MealPlanMeal.objects.filter(plan__in=MealPlans.objects.filter(user_id__in=ids)))
+            delete_rows(MealPlans.objects.filter(user_id__in=ids))
+            return delete_rows(User.all_objects.filter(id__in=ids))
+        return _delete_in_batches(user_ids, delete_batch)
+
+    @staticmethod
+    def delete_user_deferred(user_ids: Iterable[int]) -> List[DeletionJob]:
+        """Сразу скрывает пользователей и ставит удаление зависимых строк в очередь пачками"""
+        return DeferredDeletion.schedule(DeletionJob.MODEL_USER, user_ids)
 
     @staticmethod
     def verify_password(user: User, password: str) -> bool:
         """Проверяет пароль пользователя"""
-        return check_password_hash(user.password_hash, password)
+        return check_password(user.password_hash, password)
+
+    @staticmethod
+    async def verify_password_async(user: User, password: str) -> bool:
+        """Проверяет пароль пользователя в пуле потоков, не блокируя цикл событий"""
+        return await check_password_async(user.password_hash, password)
 
 
 class MealPlanManager:
@@ -78,32 +414,153 @@ class MealPlanManager:
             total_price=total_price
         )
 
+    @staticmethod
+    def create_meal_plan_bulk(
+        meal_plans: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_CREATE_BATCH_SIZE
+    ) -> List[Optional[int]]:
+        """Создает планы питания пачками (аргументы каждого - как у create_meal_plan)"""
+        return _bulk_create(
+            MealPlans,
+            (
+                MealPlans(
+                    user_id=plan['user_id'],
+                    duration=plan['duration'],
+                    total_price=plan.get('total_price')
+                )
+                for plan in meal_plans
+            ),
+            batch_size
+        )
+
     @staticmethod
     def get_all_meal_plans() -> List[MealPlans]:
         """Возвращает список всех планов питания"""
         return list(MealPlans.objects.all())
 
     @staticmethod
-    def get_meal_plan_by_id(plan_id: int) -> Optional[MealPlans]:
+    def iter_all_meal_plans(chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[MealPlans]:
+        """Потоково перебирает все планы питания пачками по chunk_size строк"""
+        return _stream(MealPlans.objects.all(), chunk_size)
+
+    @staticmethod
+    def get_meal_plans_page(
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = PAGE_SIZE,
+        order_by: str = 'id',
+        fields: Optional[Sequence[str]] = None,
+        user_id: Optional[int] = None,
+        with_meals: bool = False,
+        as_values: bool = False
+    ) -> Tuple[List[Any], Optional[Tuple[Any, ...]]]:
+        """Возвращает страницу планов питания после курсора и курсор следующей страницы.
+
+        user_id оставляет планы одного пользователя, with_meals подгружает
+        их блюда (поля PLAN_MEAL_FIELDS) одним запросом на страницу.
+        as_values возвращает словари полей fields (блюда - через get_plan_meals).
+        """
+        queryset = MealPlans.objects.all()
+        if user_id is not None:
+            queryset = queryset.filter(user_id=user_id)
+        if with_meals and not as_values:
+            queryset = _with_plan_meals(queryset)
+        return _keyset_page(queryset, after, limit, order_by, fields, as_values)
+
+    @staticmethod
+    def get_plan_meals(plan_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Блюда планов (поля PLAN_MEAL_FIELDS) по ID плана одним запросом без объектов моделей"""
+        plan_meals: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        rows = (
+            MealPlanMeal.objects
+            .filter(plan_id__in=list(plan_ids), meal__deleted_at__isnull=True)
+            .order_by('plan_id', 'meal_id')
+            .values_list('plan_id', 'meal_id', 'meal__name', 'meal__price')
+        )
+        for plan_id, meal_id, name, price in rows:
+            plan_meals[plan_id].append({'id': meal_id, 'name': name, 'price': price})
+        return plan_meals
+
+    @staticmethod
+    def get_meal_plan_by_id(
+        plan_id: int,
+        fields: Optional[Sequence[str]] = None,
+        with_meals: bool = False
+    ) -> Optional[MealPlans]:
         """Находит план питания по ID"""
-        return MealPlans.objects.filter(id=plan_id).first()
+        queryset = _with_plan_meals(MealPlans.objects.all()) if with_meals else MealPlans.objects.all()
+        return _project(queryset, fields).filter(id=plan_id).first()
+
+    @staticmethod
+    async def aget_meal_plan_by_id(plan_id: int) -> Optional[MealPlans]:
+        """Асинхронно находит план питания по ID"""
+        return await MealPlans.objects.filter(id=plan_id).afirst()
+
+    @staticmethod
+    async def aget_user_meal_plans(user_id: int) -> List[MealPlans]:
+        """Асинхронно возвращает планы питания пользователя"""
+        return await _alist(MealPlans.objects.filter(user_id=user_id).order_by('id'))
 
     @staticmethod
     def delete_meal_plan(plan_id: int) -> bool:
         """Удаляет план питания по ID"""
-        meal_plan = MealPlanManager.get_meal_plan_by_id(plan_id)
-        if meal_plan:
-            meal_plan.delete()
-            return True
-        return False
+        return MealPlanManager.delete_meal_plan_many([plan_id]) > 0
+
+    @staticmethod
+    def delete_meal_plan_many(plan_ids: Iterable[int]) -> int:
+        """Удаляет планы питания вместе со связями с блюдами"""
+        def delete_batch(ids: List[int]) -> int:
+            delete_rows(MealPlanMeal.objects.filter(plan_id__in=ids))
+            return delete_rows(MealPlans.objects.filter(id__in=ids))
+        return _delete_in_batches(plan_ids, delete_batch)
 
     @staticmethod
-    def calculate_plan_price(plan_id: int) -> float:
+    def calculate_plan_price(plan_id: int) -> Decimal:
         """Рассчитывает стоимость плана питания"""
-        plan = MealPlanManager.get_meal_plan_by_id(plan_id)
-        if not plan:
-            return 0.0
-        return plan.meals.aggregate(total_price=Sum('price'))['total_price'] or 0.0
+        prices = _active_plan_meals(MealPlanMeal.objects.filter(plan_id=plan_id)).values_list('meal__price', flat=True)
+        return round_decimal(sum(prices, Decimal(0)))
+
+    @staticmethod
+    async def acalculate_plan_price(plan_id: int) -> Decimal:
+        """Асинхронно рассчитывает стоимость плана питания"""
+        plan_meals = _active_plan_meals(MealPlanMeal.objects.filter(plan_id=plan_id))
+        prices = await _alist(plan_meals.values_list('meal__price', flat=True))
+        return round_decimal(sum(prices, Decimal(0)))
+
+    @staticmethod
+    def get_shopping_list(plan_id: int) -> List[Dict[str, Any]]:
+        """Список покупок плана питания в базовых единицах (один сгруппированный запрос)"""
+        rows = (
+            _active_lines(MealIngredient.objects.filter(meal__meal_plans=plan_id))
+            .values('ingredient__name', 'ingredient__dimension')
+            .annotate(
+                base_quantity=Sum(F('quantity') * F('ingredient__base_factor')),
+                cost=Sum(F('quantity') * F('ingredient__price_per_unit'))
+            )
+            .order_by('ingredient__name', 'ingredient__dimension')
+        )
+        return [
+            {
+                'name': row['ingredient__name'],
+                'dimension': row['ingredient__dimension'],
+                'base_unit': BASE_UNITS[row['ingredient__dimension']],
+                'base_quantity': row['base_quantity'],
+                'cost': row['cost'],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def calculate_plan_price_as_of(plan_id: int, as_of: datetime) -> Decimal:
+        """Рассчитывает стоимость плана питания по ценам ингредиентов на дату (один запрос).
+
+        Как и calculate_plan_price, суммирует цены блюд, округленные до копеек.
+        """
+        prices = (
+            _active_plan_meals(MealPlanMeal.objects.filter(plan_id=plan_id))
+            .annotate(price=PriceManager.meal_price_expression(as_of, meal_ref='meal'))
+            .values_list('price', flat=True)
+        )
+        return round_decimal(sum(prices, Decimal(0)))
 
 
 class MealManager:
@@ -124,36 +581,131 @@ class MealManager:
             diet_type_id=diet_type_id
         )
 
+    @staticmethod
+    def create_meal_bulk(
+        meals: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_CREATE_BATCH_SIZE
+    ) -> List[Optional[int]]:
+        """Создает блюда пачками (аргументы каждого - как у create_meal)"""
+        return _bulk_create(
+            Meals,
+            (
+                Meals(
+                    name=meal['name'],
+                    description=meal.get('description'),
+                    price=meal['price'],
+                    diet_type_id=meal.get('diet_type_id')
+                )
+                for meal in meals
+            ),
+            batch_size
+        )
+
     @staticmethod
     def get_all_meals() -> List[Meals]:
         """Возвращает список всех блюд"""
         return list(Meals.objects.all())
 
     @staticmethod
-    def get_meal_by_id(meal_id: int) -> Optional[Meals]:
+    def iter_all_meals(chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Meals]:
+        """Потоково перебирает все блюда пачками по chunk_size строк"""
+        return _stream(Meals.objects.all(), chunk_size)
+
+    @staticmethod
+    def get_meals_page(
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = PAGE_SIZE,
+        order_by: str = 'id',
+        fields: Optional[Sequence[str]] = None,
+        as_values: bool = False
+    ) -> Tuple[List[Any], Optional[Tuple[Any, ...]]]:
+        """Возвращает страницу блюд после курсора и курсор следующей страницы.
+
+        as_values возвращает словари полей fields вместо объектов моделей.
+        """
+        return _keyset_page(Meals.objects.all(), after, limit, order_by, fields, as_values)
+
+    @staticmethod
+    def search_meals(
+        query: str,
+        fields: Sequence[str],
+        diet_type_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        limit: int = PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Полнотекстовый поиск блюд по названию и описанию с фильтрами по типу питания и цене"""
+        return MealSearch.search(query, fields, diet_type_id, min_price, max_price, limit)
+
+    @staticmethod
+    def get_similar_meals(meal_id: int, limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Похожие блюда из предрасчитанной таблицы соседей"""
+        return MealRecommender.similar_meals(meal_id, limit)
+
+    @staticmethod
+    def get_meal_by_id(meal_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Meals]:
         """Находит блюдо по ID"""
-        return Meals.objects.filter(id=meal_id).first()
+        return _project(Meals.objects.all(), fields).filter(id=meal_id).first()
+
+    @staticmethod
+    async def aget_meal_by_id(meal_id: int) -> Optional[Meals]:
+        """Асинхронно находит блюдо по ID"""
+        return await Meals.objects.filter(id=meal_id).afirst()
 
     @staticmethod
     def delete_meal(meal_id: int) -> bool:
         """Удаляет блюдо по ID"""
-        meal = MealManager.get_meal_by_id(meal_id)
-        if meal:
-            meal.delete()
-            return True
-        return False
+        return MealManager.delete_meal_many([meal_id]) > 0
 
     @staticmethod
-    def calculate_meal_price(meal_id: int) -> float:
+    def delete_meal_many(meal_ids: Iterable[int]) -> int:
+        """Удаляет блюда вместе с ингредиентами, вхождениями в планы, избранным и соседями"""
+        def delete_batch(ids: List[int]) -> int:
+            MealPriceCache.invalidate_meals(ids)
+            delete_rows(MealIngredient.objects.filter(meal_id__in=ids))
+            delete_rows(MealPlanMeal.objects.filter(meal_id__in=ids))
+            delete_rows(Favorites.objects.filter(meal_id__in=ids))
+            delete_rows(MealNeighbor.objects.filter(Q(meal_id__in=ids) | Q(neighbor_id__in=ids)))
+            return delete_rows(Meals.all_objects.filter(id__in=ids))
+        return _delete_in_batches(meal_ids, delete_batch)
+
+    @staticmethod
+    def delete_meal_deferred(meal_ids: Iterable[int]) -> List[DeletionJob]:
+        """Сразу скрывает блюда и ставит удаление зависимых строк в очередь пачками"""
+        return DeferredDeletion.schedule(DeletionJob.MODEL_MEAL, meal_ids)
+
+    @staticmethod
+    def calculate_meal_price(meal_id: int) -> Decimal:
         """Рассчитывает стоимость блюда на основе ингредиентов"""
-        meal = MealManager.get_meal_by_id(meal_id)
-        if not meal:
-            return 0.0
-        
-        total_price = 0.0
-        for meal_ingr in MealIngredient.objects.filter(meal=meal):
-            total_price += meal_ingr.ingredient.price_per_unit * meal_ingr.quantity
-        return total_price
+        lines = _active_lines(MealIngredient.objects.filter(meal_id=meal_id))
+        return sum_line_costs(lines.values_list('ingredient__price_per_unit', 'quantity'))
+
+    @staticmethod
+    async def acalculate_meal_price(meal_id: int) -> Decimal:
+        """Асинхронно рассчитывает стоимость блюда на основе ингредиентов"""
+        lines = _active_lines(MealIngredient.objects.filter(meal_id=meal_id))
+        return sum_line_costs(await _alist(lines.values_list('ingredient__price_per_unit', 'quantity')))
+
+    @staticmethod
+    def get_meal_price(meal_id: int) -> Decimal:
+        """Возвращает стоимость блюда из кэша (рассчитывает при промахе)"""
+        return MealPriceCache.get_meal_price(meal_id)
+
+    @staticmethod
+    async def aget_meal_price(meal_id: int) -> Decimal:
+        """Асинхронно возвращает стоимость блюда из кэша (рассчитывает при промахе)"""
+        return await sync_to_async(MealPriceCache.get_meal_price)(meal_id)
+
+    @staticmethod
+    def get_meal_breakdown(meal_id: int) -> List[Dict[str, Any]]:
+        """Возвращает разбивку стоимости блюда по ингредиентам из кэша"""
+        return MealPriceCache.get_meal_breakdown(meal_id)
+
+    @staticmethod
+    def calculate_meal_price_as_of(meal_id: int, as_of: datetime) -> Decimal:
+        """Рассчитывает стоимость блюда по ценам ингредиентов на дату (один запрос)"""
+        lines = _active_lines(MealIngredient.objects.filter(meal_id=meal_id))
+        return round_decimal(_sum_quantities_as_of(lines, as_of))
 
 
 class IngredientManager:
@@ -167,14 +719,55 @@ class IngredientManager:
         store_name: Optional[str] = None,
         valid_from: Optional[datetime] = None
     ) -> Ingredients:
-        """Создает новый ингредиент"""
-        return Ingredients.objects.create(
-            name=name,
-            price_per_unit=price_per_unit,
-            unit=unit,
-            store_name=store_name,
-            valid_from=valid_from
-        )
+        """Создает новый ингредиент и первую запись в истории его цен"""
+        with transaction.atomic():
+            ingredient = Ingredients.objects.create(
+                name=name,
+                price_per_unit=price_per_unit,
+                unit=unit,
+                store_name=store_name,
+                valid_from=valid_from
+            )
+            IngredientPriceHistory.objects.create(
+                ingredient=ingredient,
+                price_per_unit=price_per_unit,
+                valid_from=valid_from or ingredient.created_at
+            )
+        return ingredient
+
+    @staticmethod
+    def create_ingredient_bulk(
+        ingredients: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_CREATE_BATCH_SIZE
+    ) -> List[Optional[int]]:
+        """Создает ингредиенты пачками вместе с первыми записями истории цен"""
+        ids = []
+        for batch in _batched(ingredients, batch_size):
+            objects = []
+            for ingredient in batch:
+                # bulk_create не вызывает pre_save, поэтому единицы нормализуем здесь
+                dimension, base_factor = normalize_unit(ingredient['unit'])
+                objects.append(Ingredients(
+                    name=ingredient['name'],
+                    price_per_unit=ingredient['price_per_unit'],
+                    unit=ingredient['unit'],
+                    store_name=ingredient.get('store_name'),
+                    valid_from=ingredient.get('valid_from'),
+                    dimension=dimension,
+                    base_factor=base_factor
+                ))
+            with transaction.atomic():
+                created = Ingredients.objects.bulk_create(objects)
+                IngredientPriceHistory.objects.bulk_create([
+                    IngredientPriceHistory(
+                        ingredient_id=ingredient.pk,
+                        price_per_unit=ingredient.price_per_unit,
+                        valid_from=ingredient.valid_from or ingredient.created_at
+                    )
+                    for ingredient in created
+                ])
+            ids.extend(ingredient.pk for ingredient in created)
+        return ids
 
     @staticmethod
     def get_all_ingredients() -> List[Ingredients]:
@@ -182,18 +775,113 @@ class IngredientManager:
         return list(Ingredients.objects.all())
 
     @staticmethod
-    def get_ingredient_by_id(ingredient_id: int) -> Optional[Ingredients]:
+    def iter_all_ingredients(chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Ingredients]:
+        """Потоково перебирает все ингредиенты пачками по chunk_size строк"""
+        return _stream(Ingredients.objects.all(), chunk_size)
+
+    @staticmethod
+    def get_ingredients_page(
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = PAGE_SIZE,
+        order_by: str = 'id',
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Ingredients], Optional[Tuple[Any, ...]]]:
+        """Возвращает страницу ингредиентов после курсора и курсор следующей страницы"""
+        return _keyset_page(Ingredients.objects.all(), after, limit, order_by, fields)
+
+    @staticmethod
+    def autocomplete_ingredients(query: str, fields: Sequence[str], limit: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Подсказки ингредиентов по части названия"""
+        return IngredientSearch.autocomplete(query, fields, limit)
+
+    @staticmethod
+    def get_ingredient_by_id(ingredient_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Ingredients]:
         """Находит ингредиент по ID"""
-        return Ingredients.objects.filter(id=ingredient_id).first()
+        return _project(Ingredients.objects.all(), fields).filter(id=ingredient_id).first()
+
+    @staticmethod
+    async def aget_ingredient_by_id(ingredient_id: int) -> Optional[Ingredients]:
+        """Асинхронно находит ингредиент по ID"""
+        return await Ingredients.objects.filter(id=ingredient_id).afirst()
 
     @staticmethod
     def delete_ingredient(ingredient_id: int) -> bool:
         """Удаляет ингредиент по ID"""
-        ingredient = IngredientManager.get_ingredient_by_id(ingredient_id)
-        if ingredient:
-            ingredient.delete()
-            return True
-        return False
+        return IngredientManager.delete_ingredient_many([ingredient_id]) > 0
+
+    @staticmethod
+    def delete_ingredient_many(ingredient_ids: Iterable[int]) -> int:
+        """Удаляет ингредиенты вместе с их вхождениями в блюда и историей цен"""
+        def delete_batch(ids: List[int]) -> int:
+            MealPriceCache.invalidate_ingredients(ids)
+            delete_rows(MealIngredient.objects.filter(ingredient_id__in=ids))
+            delete_rows(IngredientPriceHistory.objects.filter(ingredient_id__in=ids))
+            return delete_rows(Ingredients.all_objects.filter(id__in=ids))
+        return _delete_in_batches(ingredient_ids, delete_batch)
+
+    @staticmethod
+    def delete_ingredient_deferred(ingredient_ids: Iterable[int]) -> List[DeletionJob]:
+        """Сразу скрывает ингредиенты и ставит удаление зависимых строк в очередь пачками"""
+        return DeferredDeletion.schedule(DeletionJob.MODEL_INGREDIENT, ingredient_ids)
+
+    @staticmethod
+    def get_store_unit_prices(name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Минимальная цена за базовую единицу по товарам и магазинам (один запрос)"""
+        queryset = Ingredients.objects.all()
+        if name is not None:
+            queryset = queryset.filter(name=name)
+        return list(
+            queryset
+            .values('name', 'dimension', 'store_name')
+            # Деление во float: цены за грамм/миллилитр нужны только для сравнения,
+            # а в SQLite деление NUMERIC на NUMERIC может оказаться целочисленным
+            .annotate(price_per_base_unit=Min(
+                Cast('price_per_unit', FloatField()) / Cast('base_factor', FloatField())
+            ))
+            .order_by('name', 'dimension', 'price_per_base_unit')
+        )
+
+    @staticmethod
+    def update_ingredient_price(
+        ingredient_id: int,
+        price_per_unit: float,
+        valid_from: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Меняет цену ингредиента и пересчитывает зависимые блюда и планы"""
+        return IngredientManager.update_ingredient_prices({ingredient_id: price_per_unit}, valid_from)
+
+    @staticmethod
+    def update_ingredient_prices(
+        prices: Dict[int, float],
+        valid_from: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Меняет цены пачки ингредиентов и пересчитывает только зависимые блюда и планы.
+
+        Неизвестные (или помеченные на удаление) ингредиенты - ValueError до
+        каких-либо изменений, чтобы в истории цен не появлялись висячие ссылки.
+        """
+        valid_from = valid_from or timezone.now()
+        with transaction.atomic():
+            known = set(Ingredients.objects.filter(id__in=list(prices)).values_list('id', flat=True))
+            unknown = sorted(set(prices) - known)
+            if unknown:
+                raise ValueError(f"Unknown ingredient ids: {unknown}")
+            ingredients = [
+                Ingredients(id=ingredient_id, price_per_unit=price, valid_from=valid_from)
+                for ingredient_id, price in prices.items()
+            ]
+            Ingredients.objects.bulk_update(
+                ingredients, ['price_per_unit', 'valid_from'], batch_size=BULK_PRICE_BATCH_SIZE
+            )
+            MealPriceCache.invalidate_ingredients(prices.keys())
+            IngredientPriceHistory.objects.bulk_create(
+                [
+                    IngredientPriceHistory(ingredient_id=ingredient_id, price_per_unit=price, valid_from=valid_from)
+                    for ingredient_id, price in prices.items()
+                ],
+                batch_size=BULK_PRICE_BATCH_SIZE
+            )
+            return PriceManager.propagate_ingredient_prices(prices.keys())
 
 
 class DietTypeManager:
@@ -212,24 +900,68 @@ class DietTypeManager:
             is_restricted=is_restricted
         )
 
+    @staticmethod
+    def create_diet_type_bulk(
+        diet_types: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_CREATE_BATCH_SIZE
+    ) -> List[Optional[int]]:
+        """Создает типы диет пачками (аргументы каждого - как у create_diet_type)"""
+        return _bulk_create(
+            DietTypes,
+            (
+                DietTypes(
+                    name=diet_type['name'],
+                    description=diet_type.get('description'),
+                    is_restricted=diet_type['is_restricted']
+                )
+                for diet_type in diet_types
+            ),
+            batch_size
+        )
+
     @staticmethod
     def get_all_diet_types() -> List[DietTypes]:
         """Возвращает список всех типов диет"""
         return list(DietTypes.objects.all())
 
     @staticmethod
-    def get_diet_type_by_id(diet_type_id: int) -> Optional[DietTypes]:
+    def iter_all_diet_types(chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[DietTypes]:
+        """Потоково перебирает все типы диет пачками по chunk_size строк"""
+        return _stream(DietTypes.objects.all(), chunk_size)
+
+    @staticmethod
+    def get_diet_types_page(
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = PAGE_SIZE,
+        order_by: str = 'id',
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[DietTypes], Optional[Tuple[Any, ...]]]:
+        """Возвращает страницу типов диет после курсора и курсор следующей страницы"""
+        return _keyset_page(DietTypes.objects.all(), after, limit, order_by, fields)
+
+    @staticmethod
+    def get_diet_type_by_id(diet_type_id: int, fields: Optional[Sequence[str]] = None) -> Optional[DietTypes]:
         """Находит тип диеты по ID"""
-        return DietTypes.objects.filter(id=diet_type_id).first()
+        return _project(DietTypes.objects.all(), fields).filter(id=diet_type_id).first()
+
+    @staticmethod
+    async def aget_diet_type_by_id(diet_type_id: int) -> Optional[DietTypes]:
+        """Асинхронно находит тип диеты по ID"""
+        return await DietTypes.objects.filter(id=diet_type_id).afirst()
 
     @staticmethod
     def delete_diet_type(diet_type_id: int) -> bool:
         """Удаляет тип диеты по ID"""
-        diet_type = DietTypeManager.get_diet_type_by_id(diet_type_id)
-        if diet_type:
-            diet_type.delete()
-            return True
-        return False
+        return DietTypeManager.delete_diet_type_many([diet_type_id]) > 0
+
+    @staticmethod
+    def delete_diet_type_many(diet_type_ids: Iterable[int]) -> int:
+        """Удаляет типы диет, обнуляя ссылки на них у пользователей и блюд"""
+        def delete_batch(ids: List[int]) -> int:
+            User.all_objects.filter(diet_type_id__in=ids).update(diet_type=None)
+            Meals.all_objects.filter(diet_type_id__in=ids).update(diet_type=None)
+            return delete_rows(DietTypes.objects.filter(id__in=ids))
+        return _delete_in_batches(diet_type_ids, delete_batch)
 
 
 class FavoriteManager:
@@ -243,24 +975,69 @@ class FavoriteManager:
             meal_id=meal_id
         )
 
+    @staticmethod
+    def create_favorite_bulk(
+        favorites: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_CREATE_BATCH_SIZE,
+        on_conflict: Optional[str] = None
+    ) -> List[Optional[int]]:
+        """Добавляет блюда в избранное пачками; повторы пропускаются при ON_CONFLICT_IGNORE"""
+        return _bulk_create(
+            Favorites,
+            (Favorites(user_id=favorite['user_id'], meal_id=favorite['meal_id']) for favorite in favorites),
+            batch_size,
+            on_conflict,
+            unique_fields=['user', 'meal'],
+            update_fields=['created_at']
+        )
+
     @staticmethod
     def get_all_favorites() -> List[Favorites]:
         """Возвращает список всех избранных блюд"""
         return list(Favorites.objects.all())
 
+    @staticmethod
+    def iter_all_favorites(chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Favorites]:
+        """Потоково перебирает все избранные блюда пачками по chunk_size строк"""
+        return _stream(Favorites.objects.all(), chunk_size)
+
+    @staticmethod
+    def get_favorites_page(
+        after: Optional[Tuple[Any, ...]] = None,
+        limit: int = PAGE_SIZE,
+        order_by: str = 'id',
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Favorites], Optional[Tuple[Any, ...]]]:
+        """Возвращает страницу избранных блюд после курсора и курсор следующей страницы"""
+        return _keyset_page(Favorites.objects.all(), after, limit, order_by, fields)
+
     @staticmethod
     def get_favorite_by_id(favorite_id: int) -> Optional[Favorites]:
         """Находит избранное блюдо по ID"""
         return Favorites.objects.filter(id=favorite_id).first()
 
+    @staticmethod
+    async def aget_favorite_by_id(favorite_id: int) -> Optional[Favorites]:
+        """Асинхронно находит избранное по ID"""
+        return await Favorites.objects.filter(id=favorite_id).afirst()
+
+    @staticmethod
+    async def aget_user_favorites(user_id: int) -> List[Favorites]:
+        """Асинхронно возвращает избранное пользователя"""
+        return await _alist(Favorites.objects.filter(user_id=user_id).order_by('id'))
+
     @staticmethod
     def delete_favorite(favorite_id: int) -> bool:
         """Удаляет блюдо из избранного"""
-        favorite = FavoriteManager.get_favorite_by_id(favorite_id)
-        if favorite:
-            favorite.delete()
-            return True
-        return False
+        return FavoriteManager.delete_favorite_many([favorite_id]) > 0
+
+    @staticmethod
+    def delete_favorite_many(favorite_ids: Iterable[int]) -> int:
+        """Удаляет записи избранного одним DELETE на пачку"""
+        return _delete_in_batches(
+            favorite_ids,
+            lambda ids: delete_rows(Favorites.objects.filter(id__in=ids))
+        )
 
 
 class PriceManager:
@@ -269,19 +1046,177 @@ class PriceManager:
     @staticmethod
     def update_all_meal_prices() -> None:
         """Обновляет цены всех блюд"""
-        for meal in MealManager.get_all_meals():
-            meal.price = MealManager.calculate_meal_price(meal.id)
-            meal.save()
+        # Цены читаются из основной базы: на отстающей реплике пересчет записал бы старые значения
+        with use_primary():
+            for meal in MealManager.iter_all_meals():
+                meal.price = MealManager.calculate_meal_price(meal.id)
+                meal.save(update_fields=['price'])
         print("Стоимость всех блюд успешно обновлена.")
 
     @staticmethod
     def update_all_meal_plan_prices() -> None:
         """Обновляет цены всех планов питания"""
-        for plan in MealPlanManager.get_all_meal_plans():
-            plan.total_price = MealPlanManager.calculate_plan_price(plan.id)
-            plan.save()
+        with use_primary():
+            for plan in MealPlanManager.iter_all_meal_plans():
+                plan.total_price = round_decimal(MealPlanManager.calculate_plan_price(plan.id), PLAN_PRICE_PLACES)
+                plan.save(update_fields=['total_price'])
         print("Стоимость всех планов питания успешно обновлена.")
 
+    @staticmethod
+    def meal_price_expression(as_of: Optional[datetime] = None, meal_ref: str = 'pk') -> Coalesce:
+        """Выражение для UPDATE: сумма price_per_unit * quantity по ингредиентам блюда, округленная до копеек.
+
+        С as_of берутся цены ингредиентов, действовавшие на дату (история цен);
+        meal_ref - поле внешнего запроса со ссылкой на блюдо.
+        """
+        line_price = _ingredient_price_as_of(as_of) if as_of is not None else F('ingredient__price_per_unit')
+        meal_total = (
+            _active_lines(MealIngredient.objects.filter(meal=OuterRef(meal_ref)))
+            .alias(line_price=line_price)
+            .values('meal')
+            .annotate(total=Round(Sum(F('line_price') * F('quantity')), PRICE_PLACES))
+            .values('total')
+        )
+        return Coalesce(
+            Subquery(meal_total),
+            Value(0),
+            output_field=DecimalField(max_digits=10, decimal_places=2)
+        )
+
+    @staticmethod
+    def plan_price_expression() -> Coalesce:
+        """Выражение для UPDATE: сумма цен блюд плана питания, округленная до total_price"""
+        plan_total = (
+            _active_plan_meals(MealPlanMeal.objects.filter(plan=OuterRef('pk')))
+            .values('plan')
+            .annotate(total=Round(Sum('meal__price'), PLAN_PRICE_PLACES))
+            .values('total')
+        )
+        return Coalesce(
+            Subquery(plan_total),
+            Value(0),
+            output_field=DecimalField(max_digits=12, decimal_places=1)
+        )
+
+    @staticmethod
+    def _bulk_update_by_id_range(queryset, field: str, expression, batch_size: Optional[int]) -> Dict[str, Any]:
+        """Выполняет UPDATE поля выражением пачками по диапазонам ID"""
+        started = time.perf_counter()
+        # Границы ID - из основной базы, иначе строки, еще не дошедшие до реплики, пропускаются
+        with use_primary():
+            bounds = queryset.aggregate(min_id=Min('id'), max_id=Max('id'))
+        rows = 0
+        if bounds['min_id'] is not None:
+            step = batch_size or (bounds['max_id'] - bounds['min_id'] + 1)
+            for low in range(bounds['min_id'], bounds['max_id'] + 1, step):
+                rows += queryset.filter(id__gte=low, id__lt=low + step).update(**{field: expression})
+        return {'rows': rows, 'elapsed': time.perf_counter() - started}
+
+    @staticmethod
+    def bulk_update_all_meal_prices(
+        batch_size: Optional[int] = BULK_PRICE_BATCH_SIZE,
+        as_of: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Обновляет цены всех блюд одним агрегирующим запросом на пачку.
+
+        С as_of цены пересчитываются по истории цен ингредиентов на дату;
+        суммы планов затем пересчитывает bulk_update_all_meal_plan_prices.
+        """
+        report = PriceManager._bulk_update_by_id_range(
+            Meals.objects.all(), 'price', PriceManager.meal_price_expression(as_of), batch_size
+        )
+        print(f"Стоимость блюд обновлена: {report['rows']} строк за {report['elapsed']:.3f} с.")
+        return report
+
+    @staticmethod
+    def bulk_update_all_meal_plan_prices(batch_size: Optional[int] = BULK_PRICE_BATCH_SIZE) -> Dict[str, Any]:
+        """Обновляет цены всех планов питания одним агрегирующим запросом на пачку"""
+        report = PriceManager._bulk_update_by_id_range(
+            MealPlans.objects.all(), 'total_price', PriceManager.plan_price_expression(), batch_size
+        )
+        print(f"Стоимость планов питания обновлена: {report['rows']} строк за {report['elapsed']:.3f} с.")
+        return report
+
+    @staticmethod
+    def meal_prices_as_of(as_of: datetime) -> Dict[int, Decimal]:
+        """Возвращает стоимость всех блюд на дату, округленную до копеек, одним сгруппированным запросом"""
+        return dict(
+            _active_lines(MealIngredient.objects.filter(meal__deleted_at__isnull=True))
+            .alias(price=_ingredient_price_as_of(as_of))
+            .values('meal_id')
+            .annotate(total=Round(Sum(F('price') * F('quantity')), PRICE_PLACES))
+            .values_list('meal_id', 'total')
+        )
+
+    @staticmethod
+    def meal_plan_prices_as_of(as_of: datetime) -> Dict[int, Decimal]:
+        """Возвращает стоимость всех планов питания на дату одним запросом.
+
+        Как и calculate_plan_price, суммирует цены блюд, округленные до копеек.
+        """
+        totals: Dict[int, Decimal] = defaultdict(Decimal)
+        rows = (
+            _active_plan_meals(MealPlanMeal.objects.all())
+            .annotate(price=PriceManager.meal_price_expression(as_of, meal_ref='meal'))
+            .values_list('plan_id', 'price')
+        )
+        for plan_id, price in rows:
+            totals[plan_id] += price
+        return {plan_id: round_decimal(total) for plan_id, total in totals.items()}
+
+    @staticmethod
+    def propagate_ingredient_prices(
+        ingredient_ids: Iterable[int],
+        batch_size: int = BULK_PRICE_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """Пересчитывает блюда с указанными ингредиентами и суммы планов питания, в которые они входят.
+
+        Цены блюд считаются заново и записываются только изменившиеся; суммы
+        затронутых планов пересчитываются тем же выражением, что и при полном
+        пересчете (plan_price_expression), поэтому не расходятся с ним из-за
+        округления total_price до одного знака.
+        """
+        started = time.perf_counter()
+        # Старые и новые цены читаются из основной базы, куда записывается результат
+        with use_primary():
+            affected_meals = (
+                MealIngredient.objects.filter(ingredient_id__in=list(set(ingredient_ids))).values('meal_id')
+            )
+
+            old_prices = dict(Meals.objects.filter(id__in=affected_meals).values_list('id', minor_units('price')))
+            # Сумма произведений копеек на сотые доли - целое число в базе данных
+            new_prices = dict(
+                _active_lines(MealIngredient.objects.filter(meal_id__in=affected_meals))
+                .values('meal_id')
+                .annotate(total=Sum(
+                    minor_units('ingredient__price_per_unit') * minor_units('quantity', QUANTITY_PLACES)
+                ))
+                .values_list('meal_id', 'total')
+            )
+
+            changed_meals = []
+            for meal_id, old_price in old_prices.items():
+                new_price = round_half_up(new_prices.get(meal_id, 0), LINE_SCALE)
+                if new_price != old_price:
+                    changed_meals.append(Meals(id=meal_id, price=from_minor(new_price)))
+            Meals.objects.bulk_update(changed_meals, ['price'], batch_size=batch_size)
+
+            changed_plans = set()
+            for meals in _chunks(changed_meals, batch_size):
+                plans = MealPlanMeal.objects.filter(meal_id__in=[meal.id for meal in meals])
+                changed_plans.update(plans.values_list('plan_id', flat=True))
+            plan_price = PriceManager.plan_price_expression()
+            for plan_ids in _chunks(sorted(changed_plans), batch_size):
+                MealPlans.objects.filter(id__in=plan_ids).update(total_price=plan_price)
+
+        report = {
+            'meals': len(changed_meals),
+            'plans': len(changed_plans),
+            'elapsed': time.perf_counter() - started,
+        }
+        print(f"Пересчитано блюд: {report['meals']}, планов питания: {report['plans']} за {report['elapsed']:.3f} с.")
+        return report
+
 
 # Пример использования
 if __name__ == "__main__":
@@ -291,20 +1226,19 @@ if __name__ == "__main__":
 
 # Вывод планов питания и их стоимость у конкретного пользователя
 def get_user_meals(username):
-    # Находим пользователя по username
-    try:
-        user = User.objects.get(username=username)
-    except User.DoesNotExist:
+    # Загружаем пользователя, планы с блюдами и избранное фиксированным числом запросов
+    dashboard = UserManager.get_user_dashboard(username)
+    if dashboard is None:
         print(f"Пользователь с username '{username}' не найден.")
         return
 
-    # Получаем все планы питания пользователя
-    meal_plans = MealPlans.objects.filter(user=user)
-
-    if not meal_plans.exists():
+    if not dashboard['plans']:
         print(f"У пользователя '{username}' нет планов питания.")
-        return
+        return dashboard
 
     print(f"Планы питания пользователя '{username}':")
-    for plan in meal_plans:
-        print(f"- План ID: {plan.id}, Длительность: {plan.duration} дней, Стоимость: {plan.total_price}")
\ No newline at end of file
+    for plan in dashboard['plans']:
+        print(f"- План ID: {plan['id']}, Длительность: {plan['duration']} дней, Стоимость: {plan['total_price']}")
+        for meal in plan['meals']:
+            print(f"    {meal['name']}: {meal['price']}")
+    return dashboard
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.recommendations import MealRecommender
+
+
+class Command(BaseCommand):
+    """Django command to update the precomputed similar meals table from favorites"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild all meals instead of only the changed ones')
+        parser.add_argument('--neighbors', type=int, help='Similar meals stored per meal (RECOMMENDER_NEIGHBORS)')
+
+    def handle(self, *args, **options):
+        build = MealRecommender.rebuild(full=options['full'], neighbors=options['neighbors'])
+        elapsed = (build.finished_at - build.created_at).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"{build.kind.capitalize()} build: {build.meals} meals, {build.rows} neighbors, "
+            f"{build.favorites} favorites up to ID {build.last_favorite_id} in {elapsed:.2f}s"
+        ))
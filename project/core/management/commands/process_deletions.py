@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.deletion import DeferredDeletion, DELETION_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """Django command to process deferred deletion jobs in small transactions"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DELETION_CHUNK_SIZE, help='Dependent rows per transaction')
+        parser.add_argument('--limit', type=int, help='Maximum number of jobs to process')
+
+    def handle(self, *args, **options):
+        finished = DeferredDeletion.run_pending(options['chunk_size'], options['limit'])
+        progress = DeferredDeletion.progress()
+        self.stdout.write(self.style.SUCCESS(
+            f"Finished {finished} deletion jobs, {progress['done']} done, {progress['pending']} pending"
+        ))
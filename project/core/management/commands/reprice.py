@@ -0,0 +1,48 @@
+import multiprocessing
+from django.db import connections
+from django.core.management.base import BaseCommand, CommandError
+
+from core.repricing import RepricingQueue, REPRICING_UNIT_SIZE, supports_parallel_workers, default_worker_name
+
+
+def _run_worker(run_id):
+    # Каждый процесс открывает собственное соединение с базой
+    connections.close_all()
+    return RepricingQueue.work(run_id, default_worker_name())
+
+
+class Command(BaseCommand):
+    """Django command to reprice meals and meal plans with parallel workers"""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--run', help='ID of an existing run to join or resume')
+        parser.add_argument('--resume', action='store_true', help='Resume the latest unfinished run')
+        parser.add_argument('--workers', type=int, default=1, help='Number of local worker processes')
+        parser.add_argument('--unit-size', type=int, default=REPRICING_UNIT_SIZE, help='IDs per work unit')
+
+    def handle(self, *args, **options):
+        run_id = options['run']
+        if options['resume']:
+            run_id = RepricingQueue.latest_unfinished_run()
+            if run_id is None:
+                raise CommandError('No unfinished repricing run found.')
+        if run_id is None:
+            run_id = RepricingQueue.enqueue_run(options['unit_size'])
+            self.stdout.write(f'Created repricing run {run_id}')
+
+        workers = options['workers']
+        if workers > 1 and not supports_parallel_workers():
+            self.stdout.write(self.style.WARNING('Database does not support SKIP LOCKED, using a single worker.'))
+            workers = 1
+
+        if workers == 1:
+            processed = RepricingQueue.work(run_id)
+        else:
+            connections.close_all()
+            with multiprocessing.Pool(workers) as pool:
+                processed = sum(pool.map(_run_worker, [run_id] * workers))
+
+        progress = RepricingQueue.progress(run_id)
+        self.stdout.write(self.style.SUCCESS(
+            f"Run {run_id}: processed {processed} units, {progress['done']} done, {progress['pending']} pending"
+        ))
@@ -1,20 +1,33 @@
 import time
 from django.db import connections
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
     """Django command to pause execution until database is available"""
 
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to check')
+        parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait before giving up (0 - forever)')
+        parser.add_argument('--interval', type=float, default=1, help='Seconds between attempts')
+
     def handle(self, *args, **options):
         self.stdout.write('Waiting for database...')
-        db_conn = None
-        while not db_conn:
+        connection = connections[options['database']]
+        deadline = time.monotonic() + options['timeout'] if options['timeout'] else None
+        while True:
             try:
-                db_conn = connections['default']
+                # Настоящее соединение и запрос, а не только объект-обертка из connections
+                connection.ensure_connection()
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                break
             except OperationalError:
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                connection.close()
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise CommandError('Database unavailable after %s seconds' % options['timeout'])
+                self.stdout.write('Database unavailable, waiting %s second(s)...' % options['interval'])
+                time.sleep(options['interval'])
 
-        self.stdout.write(self.style.SUCCESS('Database available!')) 
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('Database available!'))
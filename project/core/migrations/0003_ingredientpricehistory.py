@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-18 17:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def seed_price_history(apps, schema_editor):
+    Ingredients = apps.get_model('core', 'Ingredients')
+    IngredientPriceHistory = apps.get_model('core', 'IngredientPriceHistory')
+    IngredientPriceHistory.objects.bulk_create(
+        (
+            IngredientPriceHistory(
+                ingredient_id=ingredient_id,
+                price_per_unit=price_per_unit,
+                valid_from=valid_from or created_at
+            )
+            for ingredient_id, price_per_unit, valid_from, created_at in
+            Ingredients.objects.values_list('id', 'price_per_unit', 'valid_from', 'created_at').iterator()
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_profile_favorites_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngredientPriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price_per_unit', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('valid_from', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='core.ingredients')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ingredient', 'valid_from'], name='ingredient_price_valid_idx')],
+            },
+        ),
+        migrations.RunPython(seed_price_history, migrations.RunPython.noop),
+    ]
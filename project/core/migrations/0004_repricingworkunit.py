@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 17:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_ingredientpricehistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepricingWorkUnit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=32)),
+                ('kind', models.CharField(max_length=10)),
+                ('start_id', models.BigIntegerField()),
+                ('end_id', models.BigIntegerField()),
+                ('status', models.CharField(default='pending', max_length=10)),
+                ('worker', models.CharField(blank=True, max_length=100, null=True)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['run_id', 'kind', 'status'], name='repricing_unit_claim_idx')],
+            },
+        ),
+    ]
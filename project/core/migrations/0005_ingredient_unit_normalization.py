@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 17:17
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# Таблица единиц на момент миграции (копия core.units.UNIT_CONVERSIONS):
+# последующие изменения core.units не должны менять результат миграции
+UNIT_CONVERSIONS = {
+    'g': ('mass', Decimal('1')),
+    'kg': ('mass', Decimal('1000')),
+    'mg': ('mass', Decimal('0.001')),
+    'oz': ('mass', Decimal('28.349523125')),
+    'lb': ('mass', Decimal('453.59237')),
+    'г': ('mass', Decimal('1')),
+    'кг': ('mass', Decimal('1000')),
+    'ml': ('volume', Decimal('1')),
+    'l': ('volume', Decimal('1000')),
+    'мл': ('volume', Decimal('1')),
+    'л': ('volume', Decimal('1000')),
+    'pcs': ('count', Decimal('1')),
+    'шт': ('count', Decimal('1')),
+}
+
+
+def normalize_units(apps, schema_editor):
+    Ingredients = apps.get_model('core', 'Ingredients')
+    for unit in Ingredients.objects.values_list('unit', flat=True).distinct():
+        dimension, base_factor = UNIT_CONVERSIONS.get(
+            (unit or '').strip().lower().rstrip('.'), ('unknown', Decimal('1'))
+        )
+        Ingredients.objects.filter(unit=unit).update(dimension=dimension, base_factor=base_factor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_repricingworkunit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredients',
+            name='base_factor',
+            field=models.DecimalField(decimal_places=9, default=1, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='dimension',
+            field=models.CharField(default='unknown', max_length=10),
+        ),
+        migrations.RunPython(normalize_units, migrations.RunPython.noop),
+    ]
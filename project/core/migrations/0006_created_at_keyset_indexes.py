@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_ingredient_unit_normalization'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diettypes',
+            index=models.Index(fields=['created_at', 'id'], name='diettypes_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='favorites',
+            index=models.Index(fields=['created_at', 'id'], name='favorites_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ingredients',
+            index=models.Index(fields=['created_at', 'id'], name='ingredients_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mealplans',
+            index=models.Index(fields=['created_at', 'id'], name='mealplans_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meals',
+            index=models.Index(fields=['created_at', 'id'], name='meals_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['created_at', 'id'], name='user_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+# Индексы полнотекстового поиска (core.search). Модели о них не знают:
+# столбец и таблицы поддерживает сама база, поэтому bulk_create, update()
+# и COPY в datagen не требуют отдельной синхронизации.
+#
+# PostgreSQL: генерируемый столбец tsvector (name - вес A, description - B)
+# с частичным GIN-индексом по активным блюдам и триграммный GIN-индекс по
+# названиям ингредиентов (если в сервере есть расширение pg_trgm).
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE core_meals ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX meals_search_idx ON core_meals USING gin (search_vector) WHERE deleted_at IS NULL",
+]
+POSTGRESQL_TRIGRAM_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ingredients_name_trgm_idx ON core_ingredients USING gin (name gin_trgm_ops) WHERE deleted_at IS NULL",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS ingredients_name_trgm_idx",
+    "DROP INDEX IF EXISTS meals_search_idx",
+    "ALTER TABLE core_meals DROP COLUMN IF EXISTS search_vector",
+]
+
+# SQLite: таблицы FTS5 с внешним содержимым (content=) и триггеры, которые
+# их обновляют. Пересоздание core_meals или core_ingredients при изменении
+# схемы в SQLite удаляет триггеры - такая миграция должна создать их заново
+# и перестроить индекс командой 'rebuild'.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_meals_fts USING fts5(
+        name, description, content='core_meals', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_meals_fts_insert AFTER INSERT ON core_meals BEGIN
+        INSERT INTO core_meals_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_meals_fts_delete AFTER DELETE ON core_meals BEGIN
+        INSERT INTO core_meals_fts (core_meals_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_meals_fts_update AFTER UPDATE OF name, description ON core_meals BEGIN
+        INSERT INTO core_meals_fts (core_meals_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO core_meals_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO core_meals_fts (core_meals_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE core_ingredients_fts USING fts5(
+        name, content='core_ingredients', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER core_ingredients_fts_insert AFTER INSERT ON core_ingredients BEGIN
+        INSERT INTO core_ingredients_fts (rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER core_ingredients_fts_delete AFTER DELETE ON core_ingredients BEGIN
+        INSERT INTO core_ingredients_fts (core_ingredients_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER core_ingredients_fts_update AFTER UPDATE OF name ON core_ingredients BEGIN
+        INSERT INTO core_ingredients_fts (core_ingredients_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO core_ingredients_fts (rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    "INSERT INTO core_ingredients_fts (core_ingredients_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_ingredients_fts_insert",
+    "DROP TRIGGER IF EXISTS core_ingredients_fts_delete",
+    "DROP TRIGGER IF EXISTS core_ingredients_fts_update",
+    "DROP TABLE IF EXISTS core_ingredients_fts",
+    "DROP TRIGGER IF EXISTS core_meals_fts_insert",
+    "DROP TRIGGER IF EXISTS core_meals_fts_delete",
+    "DROP TRIGGER IF EXISTS core_meals_fts_update",
+    "DROP TABLE IF EXISTS core_meals_fts",
+]
+
+
+def _execute(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRESQL_FORWARD)
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+            has_trigram = cursor.fetchone() is not None
+        if has_trigram:
+            _execute(schema_editor, POSTGRESQL_TRIGRAM_FORWARD)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRESQL_BACKWARD)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_deferred_deletion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meals',
+            index=models.Index(fields=['diet_type', 'price'], name='meals_diet_price_idx'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
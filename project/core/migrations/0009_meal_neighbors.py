@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 18:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MealNeighborBuild',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=12)),
+                ('neighbors', models.PositiveIntegerField()),
+                ('last_favorite_id', models.BigIntegerField(default=0)),
+                ('favorites', models.PositiveIntegerField(default=0)),
+                ('meals', models.PositiveIntegerField(default=0)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MealNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('meal', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='core.meals')),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.meals')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('meal', 'neighbor'), name='unique_meal_neighbor')],
+            },
+        ),
+    ]
@@ -1,15 +1,29 @@
 from django.db import models
 from django.contrib.auth.models import User as DjangoUser
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from core.units import DIMENSION_UNKNOWN, normalize_unit
+
+class ActiveManager(models.Manager):
+    """Менеджер по умолчанию, скрывающий записи, помеченные на отложенное удаление"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class DietTypes(models.Model):
     name = models.TextField(null=False)
     description = models.TextField(null=True, blank=True)
     is_restricted = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='diettypes_created_id_idx')
+        ]
+
     def __str__(self):
         return self.name
 
@@ -23,6 +37,15 @@ class User(models.Model):
     email = models.EmailField(max_length=100, unique=True)
     diet_type = models.ForeignKey(DietTypes, on_delete=models.SET_NULL, null=True, blank=True, related_name="users")
     created_at = models.DateTimeField(default=timezone.now)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='user_created_id_idx')
+        ]
 
     def __str__(self):
         return self.username
@@ -54,6 +77,11 @@ class MealPlans(models.Model):
     total_price = models.DecimalField(max_digits=12, decimal_places=1, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='mealplans_created_id_idx')
+        ]
+
     def __str__(self):
         return f"Plan {self.id} for {self.user.username}"
 
@@ -64,11 +92,22 @@ class Meals(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, null=False)
     diet_type = models.ForeignKey(DietTypes, on_delete=models.SET_NULL, null=True, blank=True, related_name="meals")
     created_at = models.DateTimeField(default=timezone.now)
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     # Many-to-Many relationships
     meal_plans = models.ManyToManyField(MealPlans, through='MealPlanMeal', related_name="meals")
     ingredients = models.ManyToManyField('Ingredients', through='MealIngredient', related_name="meals")
 
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='meals_created_id_idx'),
+            # Фильтры поиска (core.search): тип питания и диапазон цен
+            models.Index(fields=['diet_type', 'price'], name='meals_diet_price_idx')
+        ]
+
     def __str__(self):
         return self.name
 
@@ -79,18 +118,38 @@ class Ingredients(models.Model):
     unit = models.CharField(max_length=20, null=False)
     store_name = models.TextField(null=True, blank=True)
     valid_from = models.DateTimeField(null=True, blank=True)
+    # Нормализация единиц: размерность и множитель перевода unit в базовую единицу
+    dimension = models.CharField(max_length=10, default=DIMENSION_UNKNOWN)
+    base_factor = models.DecimalField(max_digits=15, decimal_places=9, default=1)
     created_at = models.DateTimeField(default=timezone.now)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='ingredients_created_id_idx')
+        ]
 
     def __str__(self):
         return self.name
 
 
+@receiver(pre_save, sender=Ingredients)
+def normalize_ingredient_unit(sender, instance, **kwargs):
+    instance.dimension, instance.base_factor = normalize_unit(instance.unit)
+
+
 class Favorites(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="favorites")
     meal = models.ForeignKey(Meals, on_delete=models.CASCADE, related_name="favorites")
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='favorites_created_id_idx')
+        ]
         constraints = [
             models.UniqueConstraint(fields=['user', 'meal'], name='unique_favorite')
         ]
@@ -99,6 +158,41 @@ class Favorites(models.Model):
         return f"{self.user.username} likes {self.meal.name}"
 
 
+class MealNeighbor(models.Model):
+    """Похожее блюдо из предрасчитанной таблицы рекомендаций (core.recommendations)"""
+    # Поиск по meal обслуживает индекс unique_meal_neighbor (meal - первый столбец)
+    meal = models.ForeignKey(Meals, on_delete=models.CASCADE, related_name="neighbors", db_index=False)
+    neighbor = models.ForeignKey(Meals, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['meal', 'neighbor'], name='unique_meal_neighbor')
+        ]
+
+    def __str__(self):
+        return f"Meal {self.neighbor_id} is similar to {self.meal_id} ({self.score:.3f})"
+
+
+class MealNeighborBuild(models.Model):
+    KIND_FULL = 'full'
+    KIND_INCREMENTAL = 'incremental'
+
+    kind = models.CharField(max_length=12)
+    neighbors = models.PositiveIntegerField()
+    # Учтенное избранное: все записи с ID до last_favorite_id включительно
+    last_favorite_id = models.BigIntegerField(default=0)
+    favorites = models.PositiveIntegerField(default=0)
+    meals = models.PositiveIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} build up to favorite {self.last_favorite_id}: {self.meals} meals, {self.rows} rows"
+
+
 class MealPlanMeal(models.Model):
     meal = models.ForeignKey(Meals, on_delete=models.CASCADE)
     plan = models.ForeignKey(MealPlans, on_delete=models.CASCADE)
@@ -126,3 +220,68 @@ class MealIngredient(models.Model):
 
     def __str__(self):
         return f"{self.quantity} of {self.ingredient.name} in {self.meal.name}"
+
+
+class IngredientPriceHistory(models.Model):
+    ingredient = models.ForeignKey(Ingredients, on_delete=models.CASCADE, related_name="price_history")
+    price_per_unit = models.DecimalField(max_digits=10, decimal_places=2, null=False)
+    valid_from = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ingredient', 'valid_from'], name='ingredient_price_valid_idx')
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.price_per_unit} from {self.valid_from}"
+
+
+class RepricingWorkUnit(models.Model):
+    KIND_MEALS = 'meals'
+    KIND_PLANS = 'plans'
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+
+    run_id = models.CharField(max_length=32)
+    kind = models.CharField(max_length=10)
+    start_id = models.BigIntegerField()
+    end_id = models.BigIntegerField()
+    status = models.CharField(max_length=10, default=STATUS_PENDING)
+    worker = models.CharField(max_length=100, null=True, blank=True)
+    rows = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_id', 'kind', 'status'], name='repricing_unit_claim_idx')
+        ]
+
+    def __str__(self):
+        return f"Run {self.run_id}: {self.kind} [{self.start_id}, {self.end_id}) {self.status}"
+
+
+class DeletionJob(models.Model):
+    MODEL_USER = 'user'
+    MODEL_MEAL = 'meal'
+    MODEL_INGREDIENT = 'ingredient'
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+
+    model_name = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    status = models.CharField(max_length=10, default=STATUS_PENDING)
+    stage = models.CharField(max_length=50, default='')
+    deleted_rows = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='deletion_job_status_idx')
+        ]
+
+    def __str__(self):
+        return f"Delete {self.model_name} {self.object_id}: {self.status} ({self.stage}, {self.deleted_rows} rows)"
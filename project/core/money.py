@@ -0,0 +1,56 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast, Round
+from typing import Optional, Iterable, Tuple
+
+# Цены хранятся с 2 знаками (копейки), количества - с 2 знаками (сотые доли,
+# как в MealIngredient.quantity). Цены блюд и планов (calculate_meal_price,
+# calculate_plan_price) считаются в Decimal: произведение цены на количество
+# точно выражается 4 знаками, поэтому строки суммируются без потерь
+# (sum_line_costs) и округляются до копеек один раз в конце (round_decimal).
+# Целые минимальные единицы (to_minor/from_minor, minor_units) остаются только
+# в инкрементальном пересчете (PriceManager.propagate_ingredient_prices): там
+# сумма копеек на сотые доли считается в SQL целым числом десятитысячных долей
+# копейки и делится до копеек через round_half_up.
+#
+# Округление везде - половина от нуля (ROUND_HALF_UP), как у ROUND и приведения
+# к numeric в PostgreSQL, чтобы расчет в Python и SQL-пересчет совпадали.
+PRICE_PLACES = 2
+PLAN_PRICE_PLACES = 1
+QUANTITY_PLACES = 2
+LINE_SCALE = 10 ** QUANTITY_PLACES
+
+
+def to_minor(value: Optional[Decimal], places: int = PRICE_PLACES) -> int:
+    """Переводит Decimal из модели в целое число минимальных единиц"""
+    if value is None:
+        return 0
+    return int(Decimal(value).scaleb(places).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_minor(value: int, places: int = PRICE_PLACES) -> Decimal:
+    """Переводит целое число минимальных единиц обратно в Decimal для модели"""
+    return Decimal(value).scaleb(-places)
+
+
+def minor_units(field: str, places: int = PRICE_PLACES) -> Cast:
+    """Decimal-поле в целых минимальных единицах, переведенное на стороне базы"""
+    return Cast(Round(F(field) * 10 ** places), IntegerField())
+
+
+def round_decimal(value: Optional[Decimal], places: int = PRICE_PLACES) -> Decimal:
+    """Округляет Decimal до places знаков (половина от нуля)"""
+    return Decimal(value or 0).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP)
+
+
+def round_half_up(value: int, scale: int) -> int:
+    """Делит целое на scale с округлением половины от нуля (как ROUND в PostgreSQL)"""
+    quotient, remainder = divmod(abs(value), scale)
+    if remainder * 2 >= scale:
+        quotient += 1
+    return quotient if value >= 0 else -quotient
+
+
+def sum_line_costs(lines: Iterable[Tuple[Decimal, Decimal]]) -> Decimal:
+    """Суммирует строки (цена, количество) и округляет итог до копеек"""
+    return round_decimal(sum((price * quantity for price, quantity in lines), Decimal(0)))
@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from typing import Optional, List, Any, Tuple, Callable
+
+from core.functions import KEYSET_ORDERINGS
+
+# Функция страницы менеджера: (after, limit, order_by) -> (строки, курсор следующей страницы)
+PageFunction = Callable[[Optional[Tuple[Any, ...]], int, str], Tuple[List[Any], Optional[Tuple[Any, ...]]]]
+
+
+def encode_cursor(order_by: str, cursor: Tuple[Any, ...]) -> str:
+    """Кодирует курсор менеджера (значения ключа последней строки) в строку для URL"""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in cursor]
+    payload = json.dumps([order_by, *values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, order_by: str) -> Tuple[Any, ...]:
+    """Разбирает курсор из URL; ValueError, если он поврежден или выдан для другой сортировки"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError('Malformed cursor') from error
+    if not isinstance(payload, list) or len(payload) < 2 or payload[0] != order_by:
+        raise ValueError('Cursor does not match ordering')
+    values = payload[1:]
+    if order_by == 'id':
+        if len(values) != 1 or not isinstance(values[0], int):
+            raise ValueError('Malformed cursor')
+        return (values[0],)
+    if len(values) != 2 or not isinstance(values[0], str) or not isinstance(values[1], int):
+        raise ValueError('Malformed cursor')
+    return datetime.fromisoformat(values[0]), values[1]
+
+
+class KeysetPagination(BasePagination):
+    """Постраничная выдача по ключу через get_*_page менеджеров.
+
+    В отличие от PageNumberPagination не выполняет COUNT(*) и не
+    использует OFFSET: следующая страница начинается после курсора
+    (значений ключа сортировки последней строки), поэтому время ответа
+    не зависит от глубины страницы. Параметры запроса: cursor,
+    page_size (не больше max_page_size) и ordering (id или created_at).
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'ordering'
+    page_size = settings.API_PAGE_SIZE
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, request) -> str:
+        ordering = request.query_params.get(self.ordering_query_param, 'id')
+        if ordering not in KEYSET_ORDERINGS:
+            raise NotFound(f"Unsupported ordering: {ordering}")
+        return ordering
+
+    def paginate_queryset(self, page_function: PageFunction, request, view=None) -> List[Any]:
+        """Возвращает строки страницы; page_function - get_*_page менеджера (или его обертка)"""
+        self.request = request
+        order_by = self.get_ordering(request)
+        token = request.query_params.get(self.cursor_query_param)
+        try:
+            after = decode_cursor(token, order_by) if token else None
+        except ValueError:
+            raise NotFound('Invalid cursor')
+        items, next_cursor = page_function(after, self.get_page_size(request), order_by)
+        self.next_cursor = encode_cursor(order_by, next_cursor) if next_cursor else None
+        return items
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
@@ -0,0 +1,65 @@
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from werkzeug.security import generate_password_hash, check_password_hash
+from typing import Optional, Iterable, Iterator, Callable
+
+# Сколько паролей отправляется в пул процессов за раз (не загружая поток целиком)
+HASH_WINDOW_SIZE = 1000
+
+
+def _hasher() -> Callable[[str], str]:
+    """Функция хеширования с методом и солью из настроек (сериализуема для пула процессов)"""
+    return functools.partial(
+        generate_password_hash,
+        method=settings.PASSWORD_HASH_METHOD,
+        salt_length=settings.PASSWORD_HASH_SALT_LENGTH
+    )
+
+
+def hash_password(password: str) -> str:
+    """Хеширует пароль методом из settings.PASSWORD_HASH_METHOD"""
+    return _hasher()(password)
+
+
+def hash_passwords(
+    passwords: Iterable[str],
+    workers: Optional[int] = None,
+    window_size: int = HASH_WINDOW_SIZE
+) -> Iterator[str]:
+    """Потоково хеширует пароли в пуле процессов, сохраняя порядок.
+
+    Хеширование намеренно медленное и упирается в CPU, поэтому пароли
+    отправляются в пул окнами по window_size. При workers=1 пул не
+    создается и хеширование идет в текущем процессе.
+    """
+    hasher = _hasher()
+    workers = workers or settings.PASSWORD_HASH_WORKERS
+    if workers <= 1:
+        yield from map(hasher, passwords)
+        return
+
+    chunksize = max(1, window_size // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Следующее окно уже хешируется, пока вызывающий код сохраняет результаты предыдущего
+        in_flight = None
+        iterator = iter(passwords)
+        while True:
+            window = list(islice(iterator, window_size))
+            submitted = executor.map(hasher, window, chunksize=chunksize) if window else None
+            if in_flight is not None:
+                yield from in_flight
+            if submitted is None:
+                return
+            in_flight = submitted
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Проверяет пароль по хешу"""
+    return check_password_hash(password_hash, password)
+
+
+# Проверка пароля в пуле потоков, не блокирующая цикл событий
+verify_password_async = sync_to_async(verify_password, thread_sensitive=False)
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from typing import Optional, List, Dict, Any, Iterable
+
+from core.models import Ingredients, MealIngredient
+from core.money import sum_line_costs
+
+
+class LocalLRUCache:
+    """Ограниченный по размеру и времени жизни кэш внутри процесса"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_local = LocalLRUCache(settings.MEAL_PRICE_LOCAL_CACHE_SIZE, settings.MEAL_PRICE_LOCAL_CACHE_TTL)
+
+
+def _breakdown_key(meal_id: int) -> str:
+    return f"meal_breakdown:{meal_id}"
+
+
+class MealPriceCache:
+    """Кэш рассчитанных цен блюд и их разбивки по ингредиентам.
+
+    Чтение идет сквозь два уровня: локальный LRU/TTL кэш процесса, затем
+    кэш Django (settings.CACHES), и только при промахе - один запрос к базе.
+    Записи сбрасываются при изменении строк MealIngredient и Ingredients.
+    Локальный уровень других процессов догоняет изменения не позже, чем
+    через MEAL_PRICE_LOCAL_CACHE_TTL секунд.
+    """
+
+    @staticmethod
+    def get_meal_breakdown(meal_id: int) -> List[Dict[str, Any]]:
+        """Возвращает разбивку стоимости блюда по ингредиентам"""
+        key = _breakdown_key(meal_id)
+        breakdown = _local.get(key)
+        if breakdown is None:
+            breakdown = cache.get(key)
+            if breakdown is None:
+                breakdown = MealPriceCache._load_breakdown(meal_id)
+                cache.set(key, breakdown, settings.MEAL_PRICE_CACHE_TIMEOUT)
+            _local.set(key, breakdown)
+        return breakdown
+
+    @staticmethod
+    def get_meal_price(meal_id: int) -> Decimal:
+        """Возвращает стоимость блюда на основе ингредиентов, округленную до копеек"""
+        return sum_line_costs(
+            (item['price_per_unit'], item['quantity']) for item in MealPriceCache.get_meal_breakdown(meal_id)
+        )
+
+    @staticmethod
+    def invalidate_meals(meal_ids: Iterable[int]) -> None:
+        """Сбрасывает кэш указанных блюд сейчас и повторно после фиксации транзакции"""
+        keys = [_breakdown_key(meal_id) for meal_id in set(meal_ids)]
+        if not keys:
+            return
+
+        def invalidate():
+            _local.delete_many(keys)
+            cache.delete_many(keys)
+
+        invalidate()
+        transaction.on_commit(invalidate)
+
+    @staticmethod
+    def invalidate_ingredients(ingredient_ids: Iterable[int]) -> None:
+        """Сбрасывает кэш всех блюд, в которые входят указанные ингредиенты"""
+        MealPriceCache.invalidate_meals(
+            MealIngredient.objects
+            .filter(ingredient_id__in=list(set(ingredient_ids)))
+            .values_list('meal_id', flat=True)
+            .distinct()
+        )
+
+    @staticmethod
+    def clear_local() -> None:
+        """Очищает локальный уровень кэша процесса"""
+        _local.clear()
+
+    @staticmethod
+    def _load_breakdown(meal_id: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                'ingredient_id': row['ingredient_id'],
+                'name': row['ingredient__name'],
+                'unit': row['ingredient__unit'],
+                'quantity': row['quantity'],
+                'price_per_unit': row['ingredient__price_per_unit'],
+                'cost': row['ingredient__price_per_unit'] * row['quantity'],
+            }
+            for row in MealIngredient.objects.filter(
+                meal_id=meal_id, ingredient__deleted_at__isnull=True
+            ).order_by('id').values(
+                'ingredient_id', 'ingredient__name', 'ingredient__unit', 'ingredient__price_per_unit', 'quantity'
+            )
+        ]
+
+
+@receiver(post_save, sender=MealIngredient)
+@receiver(post_delete, sender=MealIngredient)
+def invalidate_meal_ingredient(sender, instance, **kwargs):
+    MealPriceCache.invalidate_meals([instance.meal_id])
+
+
+@receiver(post_save, sender=Ingredients)
+def invalidate_ingredient(sender, instance, created, **kwargs):
+    if not created:
+        MealPriceCache.invalidate_ingredients([instance.id])
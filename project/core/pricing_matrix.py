@@ -0,0 +1,137 @@
+import numpy as np
+from scipy import sparse
+from typing import Optional, List, Dict, Any, Tuple
+
+from core.models import Meals, Ingredients, MealPlans, MealPlanMeal, MealIngredient
+
+
+def _positions(ids: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Переводит ID в индексы строк/столбцов по отсортированному массиву ID.
+
+    Второй массив отмечает найденные ID: для отсутствующих searchsorted
+    возвращает позицию соседнего ID (или len(ids)), и ее нельзя использовать.
+    """
+    positions = np.searchsorted(ids, values)
+    if not len(ids):
+        return positions, np.zeros(len(values), dtype=bool)
+    known = (positions < len(ids)) & (ids[np.minimum(positions, len(ids) - 1)] == values)
+    return positions, known
+
+
+class PricingMatrix:
+    """Матричный расчет цен блюд и планов питания в памяти.
+
+    Блюда×ингредиенты хранятся разреженной матрицей количеств, цены
+    ингредиентов - вектором, поэтому цены всех блюд считаются одним
+    произведением матрицы на вектор, а цены планов - вторым произведением
+    по матрице планы×блюда. Сценарии "что если" не обращаются к базе данных.
+    """
+
+    def __init__(
+        self,
+        meal_ids: np.ndarray,
+        plan_ids: np.ndarray,
+        ingredient_ids: np.ndarray,
+        ingredient_prices: np.ndarray,
+        ingredient_stores: np.ndarray,
+        meal_ingredients: sparse.csr_matrix,
+        plan_meals: sparse.csr_matrix
+    ):
+        self.meal_ids = meal_ids
+        self.plan_ids = plan_ids
+        self.ingredient_ids = ingredient_ids
+        self.ingredient_prices = ingredient_prices
+        self.ingredient_stores = ingredient_stores
+        self.meal_ingredients = meal_ingredients
+        self.plan_meals = plan_meals
+
+    @classmethod
+    def load(cls) -> 'PricingMatrix':
+        """Загружает матрицы из базы данных (по одному запросу на таблицу).
+
+        Связи с блюдами и ингредиентами, которых нет среди загруженных
+        (помечены на отложенное удаление или появились между запросами),
+        пропускаются.
+        """
+        meal_ids = np.fromiter(Meals.objects.order_by('id').values_list('id', flat=True), dtype=np.int64)
+        plan_ids = np.fromiter(MealPlans.objects.order_by('id').values_list('id', flat=True), dtype=np.int64)
+
+        ingredients = list(Ingredients.objects.order_by('id').values_list('id', 'price_per_unit', 'store_name'))
+        ingredient_ids = np.array([row[0] for row in ingredients], dtype=np.int64)
+        ingredient_prices = np.array([row[1] for row in ingredients], dtype=np.float64)
+        ingredient_stores = np.array([row[2] or '' for row in ingredients], dtype=object)
+
+        links = list(MealIngredient.objects.values_list('meal_id', 'ingredient_id', 'quantity'))
+        link_meals = np.array([row[0] for row in links], dtype=np.int64)
+        link_ingredients = np.array([row[1] for row in links], dtype=np.int64)
+        quantities = np.array([row[2] for row in links], dtype=np.float64)
+        rows, known_meals = _positions(meal_ids, link_meals)
+        columns, known_ingredients = _positions(ingredient_ids, link_ingredients)
+        known = known_meals & known_ingredients
+        meal_ingredients = sparse.csr_matrix(
+            (quantities[known], (rows[known], columns[known])),
+            shape=(len(meal_ids), len(ingredient_ids))
+        )
+
+        memberships = np.array(list(MealPlanMeal.objects.values_list('plan_id', 'meal_id')), dtype=np.int64).reshape(-1, 2)
+        rows, known_plans = _positions(plan_ids, memberships[:, 0])
+        columns, known_meals = _positions(meal_ids, memberships[:, 1])
+        known = known_plans & known_meals
+        plan_meals = sparse.csr_matrix(
+            (np.ones(known.sum()), (rows[known], columns[known])),
+            shape=(len(plan_ids), len(meal_ids))
+        )
+
+        return cls(meal_ids, plan_ids, ingredient_ids, ingredient_prices, ingredient_stores, meal_ingredients, plan_meals)
+
+    def meal_prices(self, ingredient_prices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Возвращает цены всех блюд (или матрицу цен для нескольких векторов цен)"""
+        if ingredient_prices is None:
+            ingredient_prices = self.ingredient_prices
+        return self.meal_ingredients @ ingredient_prices
+
+    def plan_prices(self, meal_prices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Возвращает цены всех планов питания как сумму цен их блюд"""
+        if meal_prices is None:
+            meal_prices = self.meal_prices()
+        return self.plan_meals @ meal_prices
+
+    def scenario_prices(
+        self,
+        ingredient_change: float = 0.0,
+        store_changes: Optional[Dict[str, float]] = None,
+        ingredient_changes: Optional[Dict[int, float]] = None
+    ) -> np.ndarray:
+        """Строит вектор цен ингредиентов для сценария.
+
+        Изменения задаются долями (0.08 = +8%, -0.15 = -15%) и перемножаются:
+        общее изменение, затем изменение по магазину, затем по ингредиенту.
+        """
+        factors = np.full(len(self.ingredient_ids), 1.0 + ingredient_change)
+        for store_name, change in (store_changes or {}).items():
+            factors[self.ingredient_stores == store_name] *= 1.0 + change
+        if ingredient_changes:
+            ids = np.fromiter(ingredient_changes.keys(), dtype=np.int64)
+            positions, known = _positions(self.ingredient_ids, ids)
+            changes = np.fromiter(ingredient_changes.values(), dtype=np.float64)
+            factors[positions[known]] *= 1.0 + changes[known]
+        return self.ingredient_prices * factors
+
+    def run_scenario(self, **changes: Any) -> Dict[str, Dict[int, float]]:
+        """Пересчитывает блюда и планы по сценарию без изменения базы данных"""
+        return self.run_scenarios([changes])[0]
+
+    def run_scenarios(self, scenarios: List[Dict[str, Any]]) -> List[Dict[str, Dict[int, float]]]:
+        """Пересчитывает несколько сценариев одним произведением разреженных матриц"""
+        if not scenarios:
+            return []
+        ingredient_prices = np.column_stack([self.scenario_prices(**changes) for changes in scenarios])
+        meal_prices = self.meal_prices(ingredient_prices)
+        plan_prices = self.plan_prices(meal_prices)
+        return [
+            {
+                'meals': dict(zip(self.meal_ids.tolist(), np.round(meal_prices[:, column], 2).tolist())),
+                'plans': dict(zip(self.plan_ids.tolist(), np.round(plan_prices[:, column], 2).tolist())),
+            }
+            for column in range(len(scenarios))
+        ]
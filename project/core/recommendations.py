@@ -0,0 +1,234 @@
+import csv
+import io
+import numpy as np
+from itertools import chain
+from scipy import sparse
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+
+from core.deletion import delete_rows
+from core.models import Favorites, MealNeighbor, MealNeighborBuild
+
+# Сколько блюд обрабатывается одним произведением матриц (ограничивает память)
+SIMILARITY_CHUNK_SIZE = 5000
+# Строк соседей на один INSERT и ID блюд на один DELETE
+NEIGHBOR_BATCH_SIZE = 2000
+# Строк избранного, получаемых из курсора за раз при загрузке матрицы
+FAVORITES_CHUNK_SIZE = 10000
+
+
+def _top_k(rows: np.ndarray, columns: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+    """Индексы k лучших значений каждой строки: по убыванию score, при равенстве - по столбцу"""
+    order = np.lexsort((columns, -scores, rows))
+    sorted_rows = rows[order]
+    # Позиция значения внутри своей строки после сортировки
+    rank = np.arange(len(order)) - np.searchsorted(sorted_rows, sorted_rows)
+    return order[rank < k]
+
+
+def _insert_neighbors(
+    alias: str,
+    meal_ids: np.ndarray,
+    neighbor_ids: np.ndarray,
+    scores: np.ndarray,
+    created_at: datetime
+) -> None:
+    """Записывает строки соседей: COPY в PostgreSQL, пачки INSERT в остальных базах"""
+    rows = zip(meal_ids.tolist(), neighbor_ids.tolist(), scores.tolist())
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(column) for column in ('meal_id', 'neighbor_id', 'score', 'created_at'))
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        stamp = created_at.isoformat()
+        writer.writerows((meal_id, neighbor_id, score, stamp) for meal_id, neighbor_id, score in rows)
+        with connection.cursor() as cursor:
+            with cursor.cursor.copy(f"COPY {quote(MealNeighbor._meta.db_table)} ({columns}) FROM STDIN WITH CSV") as copy:
+                copy.write(buffer.getvalue())
+        return
+    MealNeighbor.objects.using(alias).bulk_create(
+        [
+            MealNeighbor(meal_id=meal_id, neighbor_id=neighbor_id, score=score, created_at=created_at)
+            for meal_id, neighbor_id, score in rows
+        ],
+        batch_size=NEIGHBOR_BATCH_SIZE
+    )
+
+
+class FavoritesMatrix:
+    """Избранное как разреженная матрица пользователи×блюда.
+
+    Сходство блюд i и j - косинус их столбцов: число пользователей,
+    добавивших в избранное оба блюда, деленное на sqrt(n_i * n_j), где
+    n - число пользователей, добавивших блюдо. Строки сходства для группы
+    блюд считаются одним произведением разреженных матриц.
+    """
+
+    def __init__(
+        self,
+        favorite_ids: np.ndarray,
+        favorite_meals: np.ndarray,
+        meal_ids: np.ndarray,
+        user_meals: sparse.csr_matrix
+    ):
+        self.favorite_ids = favorite_ids
+        self.favorite_meals = favorite_meals
+        self.meal_ids = meal_ids
+        self.user_meals = user_meals
+        self.meal_users = user_meals.T.tocsr()
+        counts = np.asarray(user_meals.sum(axis=0)).ravel()
+        # Каждое блюдо матрицы есть хотя бы в одном избранном
+        self.norms = 1.0 / np.sqrt(counts)
+
+    @classmethod
+    def load(cls, chunk_size: int = FAVORITES_CHUNK_SIZE) -> 'FavoritesMatrix':
+        """Загружает избранное одним запросом, потоком из курсора прямо в массив numpy.
+
+        Избранное пользователей и блюд, помеченных на отложенное удаление,
+        не учитывается.
+        """
+        favorites = (
+            Favorites.objects
+            .filter(user__deleted_at__isnull=True, meal__deleted_at__isnull=True)
+            .order_by('id')
+            .values_list('id', 'user_id', 'meal_id')
+        )
+        rows = np.fromiter(
+            chain.from_iterable(favorites.iterator(chunk_size=chunk_size)), dtype=np.int64
+        ).reshape(-1, 3)
+        user_ids = np.unique(rows[:, 1])
+        meal_ids = np.unique(rows[:, 2])
+        favorite_meals = np.searchsorted(meal_ids, rows[:, 2])
+        user_meals = sparse.csr_matrix(
+            (np.ones(len(rows)), (np.searchsorted(user_ids, rows[:, 1]), favorite_meals)),
+            shape=(len(user_ids), len(meal_ids))
+        )
+        return cls(rows[:, 0], favorite_meals, meal_ids, user_meals)
+
+    @property
+    def last_favorite_id(self) -> int:
+        return int(self.favorite_ids[-1]) if len(self.favorite_ids) else 0
+
+    def count_up_to(self, favorite_id: int) -> int:
+        """Число записей избранного с ID не больше favorite_id"""
+        return int(np.searchsorted(self.favorite_ids, favorite_id, side='right'))
+
+    def affected_meals(self, after_id: int) -> np.ndarray:
+        """Столбцы блюд, чьи строки сходства меняет избранное с ID больше after_id.
+
+        Новая запись (пользователь, блюдо m) меняет n_m и совместные
+        счетчики m, то есть сходство m с каждым блюдом, которое встречается
+        вместе с m в чьем-либо избранном. Пересчитываются строки m и этих блюд.
+        """
+        new_meals = np.unique(self.favorite_meals[self.favorite_ids > after_id])
+        if not len(new_meals):
+            return new_meals
+        users = np.unique(self.meal_users[new_meals].indices)
+        return np.unique(self.user_meals[users].indices)
+
+    def neighbors(self, columns: np.ndarray, k: int) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Top-k соседей блюд columns пачками: (ID блюд, ID соседей, сходство)"""
+        for start in range(0, len(columns), SIMILARITY_CHUNK_SIZE):
+            chunk = columns[start:start + SIMILARITY_CHUNK_SIZE]
+            similarity = (
+                sparse.diags(self.norms[chunk]) @ (self.meal_users[chunk] @ self.user_meals) @ sparse.diags(self.norms)
+            ).tocoo()
+            rows, neighbors, scores = similarity.row, similarity.col, similarity.data
+            # Блюдо не считается соседом самого себя
+            other = neighbors != chunk[rows]
+            rows, neighbors, scores = rows[other], neighbors[other], scores[other]
+            keep = _top_k(rows, neighbors, scores, k)
+            yield self.meal_ids[chunk[rows[keep]]], self.meal_ids[neighbors[keep]], scores[keep]
+
+
+class MealRecommender:
+    """Рекомендации блюд по избранному (item-item, косинусное сходство).
+
+    Для каждого блюда в MealNeighbor хранятся k самых похожих блюд, поэтому
+    рекомендации пользователю - один запрос по индексу: соседи блюд из
+    его избранного, сходства суммируются. Таблица строится заново
+    (rebuild(full=True)) или обновляется по новому избранному: каждое
+    построение запоминает в MealNeighborBuild ID последней учтенной записи
+    и их число, и следующее пересчитывает только затронутые блюда. Если
+    записи избранного до этого ID удалены или появились позже (число не
+    совпадает), выполняется полный пересчет.
+    """
+
+    @staticmethod
+    def rebuild(full: bool = False, neighbors: Optional[int] = None) -> MealNeighborBuild:
+        """Обновляет таблицу соседей; возвращает запись о построении"""
+        k = neighbors or settings.RECOMMENDER_NEIGHBORS
+        matrix = FavoritesMatrix.load()
+        previous = MealNeighborBuild.objects.filter(finished_at__isnull=False).order_by('-id').first()
+        incremental = (
+            not full
+            and previous is not None
+            and previous.neighbors == k
+            and matrix.count_up_to(previous.last_favorite_id) == previous.favorites
+        )
+        if incremental:
+            columns = matrix.affected_meals(previous.last_favorite_id)
+        else:
+            columns = np.arange(len(matrix.meal_ids))
+        build = MealNeighborBuild(
+            kind=MealNeighborBuild.KIND_INCREMENTAL if incremental else MealNeighborBuild.KIND_FULL,
+            neighbors=k,
+            last_favorite_id=matrix.last_favorite_id,
+            favorites=len(matrix.favorite_ids),
+            meals=len(columns),
+        )
+
+        alias = router.db_for_write(MealNeighbor)
+        # Читатели видят либо прежнюю таблицу, либо новую целиком
+        with transaction.atomic(using=alias):
+            if incremental:
+                meal_ids = matrix.meal_ids[columns].tolist()
+                for start in range(0, len(meal_ids), NEIGHBOR_BATCH_SIZE):
+                    delete_rows(MealNeighbor.objects.filter(meal_id__in=meal_ids[start:start + NEIGHBOR_BATCH_SIZE]))
+            else:
+                delete_rows(MealNeighbor.objects.all())
+            now = timezone.now()
+            for meal_ids, neighbor_ids, scores in matrix.neighbors(columns, k):
+                _insert_neighbors(alias, meal_ids, neighbor_ids, scores, now)
+                build.rows += len(meal_ids)
+            build.finished_at = timezone.now()
+            build.save(using=alias)
+
+        connection = connections[alias]
+        if not incremental and connection.vendor == 'postgresql':
+            # Без статистики по заново заполненной таблице планировщик
+            # выбирает для рекомендаций полный просмотр вместо индекса
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(MealNeighbor._meta.db_table)}")
+        return build
+
+    @staticmethod
+    def similar_meals(meal_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Блюда, похожие на meal_id, по убыванию сходства"""
+        rows = (
+            MealNeighbor.objects
+            .filter(meal_id=meal_id, neighbor__deleted_at__isnull=True)
+            .order_by('-score', 'neighbor_id')
+            .values_list('neighbor_id', 'neighbor__name', 'neighbor__price', 'score')[:limit]
+        )
+        return [{'id': meal_id, 'name': name, 'price': price, 'score': score} for meal_id, name, price, score in rows]
+
+    @staticmethod
+    def recommend(user_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Блюда для пользователя: соседи его избранного, кроме уже добавленных"""
+        favorites = Favorites.objects.filter(user_id=user_id).values('meal_id')
+        rows = (
+            MealNeighbor.objects
+            .filter(meal_id__in=favorites, neighbor__deleted_at__isnull=True)
+            .exclude(neighbor_id__in=favorites)
+            .values('neighbor_id', 'neighbor__name', 'neighbor__price')
+            .annotate(total=Sum('score'))
+            .order_by('-total', 'neighbor_id')
+            .values_list('neighbor_id', 'neighbor__name', 'neighbor__price', 'total')[:limit]
+        )
+        return [{'id': meal_id, 'name': name, 'price': price, 'score': score} for meal_id, name, price, score in rows]
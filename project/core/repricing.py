@@ -0,0 +1,114 @@
+import os
+import socket
+import time
+import uuid
+from django.db import connection, transaction
+from django.db.models import Min, Max
+from django.utils import timezone
+from typing import Optional, Dict
+
+from core.functions import PriceManager
+from core.models import Meals, MealPlans, RepricingWorkUnit
+
+# Размер рабочей единицы (по диапазону ID)
+REPRICING_UNIT_SIZE = 5000
+
+
+def supports_parallel_workers() -> bool:
+    """Проверяет, умеет ли база выдавать работу через SELECT ... FOR UPDATE SKIP LOCKED"""
+    return connection.features.has_select_for_update_skip_locked
+
+
+def default_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class RepricingQueue:
+    """Очередь пересчета цен, разделенная на рабочие единицы по диапазонам ID.
+
+    Воркеры (процессы или узлы) забирают единицы через
+    SELECT ... FOR UPDATE SKIP LOCKED, пересчитывают диапазон и отмечают
+    его выполненным в той же транзакции. Если воркер падает, транзакция
+    откатывается и единица снова становится доступной, поэтому запуск
+    можно продолжить с места сбоя. Планы питания пересчитываются только
+    после того, как выполнены все единицы по блюдам.
+    """
+
+    UPDATES = {
+        RepricingWorkUnit.KIND_MEALS: (Meals, 'price', PriceManager.meal_price_expression),
+        RepricingWorkUnit.KIND_PLANS: (MealPlans, 'total_price', PriceManager.plan_price_expression),
+    }
+
+    @staticmethod
+    def enqueue_run(unit_size: int = REPRICING_UNIT_SIZE) -> str:
+        """Создает запуск: делит пространство ID блюд и планов на рабочие единицы"""
+        run_id = uuid.uuid4().hex
+        units = []
+        for kind, (model, _, _) in RepricingQueue.UPDATES.items():
+            bounds = model.objects.aggregate(min_id=Min('id'), max_id=Max('id'))
+            if bounds['min_id'] is None:
+                continue
+            for low in range(bounds['min_id'], bounds['max_id'] + 1, unit_size):
+                units.append(RepricingWorkUnit(run_id=run_id, kind=kind, start_id=low, end_id=low + unit_size))
+        RepricingWorkUnit.objects.bulk_create(units)
+        return run_id
+
+    @staticmethod
+    def latest_unfinished_run() -> Optional[str]:
+        """Возвращает последний запуск, в котором остались невыполненные единицы"""
+        unit = (
+            RepricingWorkUnit.objects
+            .filter(status=RepricingWorkUnit.STATUS_PENDING)
+            .order_by('-created_at', '-id')
+            .first()
+        )
+        return unit.run_id if unit else None
+
+    @staticmethod
+    def progress(run_id: str) -> Dict[str, int]:
+        """Возвращает количество выполненных и оставшихся единиц запуска"""
+        units = RepricingWorkUnit.objects.filter(run_id=run_id)
+        return {
+            'done': units.filter(status=RepricingWorkUnit.STATUS_DONE).count(),
+            'pending': units.filter(status=RepricingWorkUnit.STATUS_PENDING).count(),
+        }
+
+    @staticmethod
+    def process_next(run_id: str, kind: str, worker: str) -> Optional[bool]:
+        """Забирает и выполняет одну единицу.
+
+        Возвращает True, если единица выполнена, False, если свободных
+        единиц нет, но часть еще выполняется другими воркерами, и None,
+        если все единицы этого вида выполнены.
+        """
+        model, field, expression = RepricingQueue.UPDATES[kind]
+        pending = RepricingWorkUnit.objects.filter(run_id=run_id, kind=kind, status=RepricingWorkUnit.STATUS_PENDING)
+        with transaction.atomic():
+            unit = pending.select_for_update(skip_locked=True).order_by('id').first()
+            if unit is not None:
+                unit.rows = model.objects.filter(id__gte=unit.start_id, id__lt=unit.end_id).update(
+                    **{field: expression()}
+                )
+                unit.status = RepricingWorkUnit.STATUS_DONE
+                unit.worker = worker
+                unit.finished_at = timezone.now()
+                unit.save(update_fields=['rows', 'status', 'worker', 'finished_at'])
+                return True
+        return False if pending.exists() else None
+
+    @staticmethod
+    def work(run_id: str, worker: Optional[str] = None, poll_interval: float = 0.5) -> int:
+        """Выполняет единицы запуска, пока они не закончатся; возвращает их количество"""
+        worker = worker or default_worker_name()
+        processed = 0
+        for kind in (RepricingWorkUnit.KIND_MEALS, RepricingWorkUnit.KIND_PLANS):
+            while True:
+                result = RepricingQueue.process_next(run_id, kind, worker)
+                if result is None:
+                    break
+                if result:
+                    processed += 1
+                else:
+                    # Оставшиеся единицы заняты другими воркерами - ждем их завершения
+                    time.sleep(poll_interval)
+        return processed
@@ -0,0 +1,214 @@
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.utils import DatabaseError
+from typing import Optional, List, Dict, Tuple, Iterator
+
+# Основная база: все записи и чтения после записи
+PRIMARY = DEFAULT_DB_ALIAS
+
+SELECTION_ROUND_ROBIN = 'round_robin'
+SELECTION_LEAST_LAG = 'least_lag'
+
+# Отставание реплики, которая не ответила на проверку (исключается из выбора)
+UNAVAILABLE_LAG = float('inf')
+
+# Отставание реплики PostgreSQL в секундах; 0, если все полученные изменения уже применены
+# (иначе на простаивающей основной базе отставание росло бы без записей)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class RoutingScope:
+    """Состояние маршрутизации одного запроса: была ли в нем запись"""
+
+    def __init__(self):
+        self.wrote = False
+
+
+# Область текущего запроса или задачи (см. request_scope); вне области чтения идут в основную базу
+_scope: contextvars.ContextVar[Optional[RoutingScope]] = contextvars.ContextVar('db_routing_scope', default=None)
+# База, закрепленная для чтения (use_primary, use_database, analytics_database)
+_pinned: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('db_routing_pinned', default=None)
+
+_round_robin = itertools.count()
+_lag_lock = threading.Lock()
+_lag_checked: Dict[str, Tuple[float, float]] = {}
+
+
+def replica_aliases() -> List[str]:
+    """Реплики для чтения из settings.DATABASE_REPLICAS"""
+    return list(settings.DATABASE_REPLICAS)
+
+
+def _read_only_aliases() -> List[str]:
+    aliases = replica_aliases()
+    if settings.DATABASE_ANALYTICS_REPLICA:
+        aliases.append(settings.DATABASE_ANALYTICS_REPLICA)
+    return aliases
+
+
+def replica_lag(alias: str) -> float:
+    """Измеряет отставание реплики в секундах (UNAVAILABLE_LAG, если она недоступна)"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        connection.close()
+        return UNAVAILABLE_LAG
+
+
+def _cached_lag(alias: str) -> float:
+    """Отставание реплики, перепроверяемое не чаще раза в DATABASE_REPLICA_LAG_CHECK_INTERVAL секунд"""
+    now = time.monotonic()
+    with _lag_lock:
+        checked = _lag_checked.get(alias)
+    if checked is not None and now - checked[0] < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+        return checked[1]
+    lag = replica_lag(alias)
+    with _lag_lock:
+        _lag_checked[alias] = (now, lag)
+    return lag
+
+
+def reset_replica_state() -> None:
+    """Сбрасывает сохраненные отставания реплик"""
+    with _lag_lock:
+        _lag_checked.clear()
+
+
+def select_replica() -> str:
+    """Выбирает реплику для чтения по settings.DATABASE_REPLICA_SELECTION.
+
+    round_robin - по кругу, least_lag - с наименьшим отставанием среди
+    отстающих не более чем на DATABASE_REPLICA_MAX_LAG секунд. Без
+    подходящих реплик чтение идет в основную базу.
+    """
+    replicas = replica_aliases()
+    if not replicas:
+        return PRIMARY
+    if settings.DATABASE_REPLICA_SELECTION == SELECTION_LEAST_LAG:
+        lags = [(_cached_lag(alias), alias) for alias in replicas]
+        lag, alias = min(lags, key=lambda item: item[0])
+        return alias if lag <= settings.DATABASE_REPLICA_MAX_LAG else PRIMARY
+    return replicas[next(_round_robin) % len(replicas)]
+
+
+@contextmanager
+def request_scope() -> Iterator[RoutingScope]:
+    """Область запроса или задачи: после первой записи все чтения в ней идут в основную базу.
+
+    Открывается на каждый запрос ReadAfterWriteMiddleware; команды и фоновые
+    задачи, которым можно читать из реплик, открывают ее сами (with или
+    декоратор @request_scope()). Вне области чтения идут в основную базу,
+    поэтому состояние не переживает задачу и не закрепляет поток.
+    """
+    token = _scope.set(RoutingScope())
+    try:
+        yield _scope.get()
+    finally:
+        _scope.reset(token)
+
+
+@contextmanager
+def use_database(alias: str) -> Iterator[str]:
+    """Закрепляет чтения внутри блока за базой alias"""
+    token = _pinned.set(alias)
+    try:
+        yield alias
+    finally:
+        _pinned.reset(token)
+
+
+def use_primary():
+    """Направляет чтения внутри блока в основную базу"""
+    return use_database(PRIMARY)
+
+
+def analytics_database():
+    """Закрепляет чтения массовой аналитики за одной репликой.
+
+    Используется settings.DATABASE_ANALYTICS_REPLICA, а без нее - реплика,
+    выбранная один раз на весь блок, чтобы задача читала согласованные данные.
+    """
+    return use_database(settings.DATABASE_ANALYTICS_REPLICA or select_replica())
+
+
+class ReplicaRouter:
+    """Маршрутизатор чтения по репликам.
+
+    Записи всегда идут в основную базу. Чтения идут в реплику только внутри
+    области запроса или задачи (request_scope), кроме чтений внутри
+    транзакции основной базы и чтений после записи в той же области, которые
+    остаются в основной базе. Без настроенных реплик маршрутизатор ничего
+    не меняет.
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        pinned = _pinned.get()
+        if pinned is not None:
+            return pinned
+        if not replica_aliases():
+            return None
+        scope = _scope.get()
+        if scope is None or scope.wrote or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Связанные объекты читаются из той же базы, что и исходный
+            return instance._state.db
+        return select_replica()
+
+    def db_for_write(self, model, **hints) -> str:
+        scope = _scope.get()
+        if scope is not None:
+            scope.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # Все базы - копии одной схемы и данных
+        databases = {PRIMARY, *_read_only_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> Optional[bool]:
+        # Реплики получают схему репликацией из основной базы
+        if db in _read_only_aliases():
+            return False
+        return None
+
+
+class ReadAfterWriteMiddleware:
+    """Открывает область маршрутизации на каждый запрос (см. request_scope)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with request_scope():
+            return await self.get_response(request)
@@ -0,0 +1,128 @@
+import re
+from decimal import Decimal
+from django.db import connections, router
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Length, Lower, StrIndex
+from typing import Optional, List, Dict, Any, Sequence
+
+from core.models import Meals, Ingredients
+
+# Поиск по блюдам и подсказки по названиям ингредиентов. Индексы создает
+# миграция 0008_search:
+#   PostgreSQL - столбец core_meals.search_vector (tsvector, конфигурация
+#   SEARCH_CONFIG) с GIN-индексом; триграммный GIN-индекс по
+#   core_ingredients.name (pg_trgm) ускоряет ILIKE '%...%';
+#   SQLite - таблицы FTS5 core_meals_fts (стемминг porter) и
+#   core_ingredients_fts (токенизатор trigram).
+# Фильтры по типу питания и цене добавляются в тот же запрос, что и
+# полнотекстовое условие.
+SEARCH_CONFIG = 'english'
+MEALS_FTS_TABLE = 'core_meals_fts'
+INGREDIENTS_FTS_TABLE = 'core_ingredients_fts'
+# Веса name и description в bm25 (SQLite); в PostgreSQL - веса A и B ts_rank
+MEALS_FTS_WEIGHTS = (10.0, 4.0)
+
+_WORD = re.compile(r'\w+')
+_LIKE_WILDCARDS = re.compile(r'[%_\\]')
+
+
+def _vendor(model) -> str:
+    return connections[router.db_for_read(model)].vendor
+
+
+def search_terms(query: str) -> List[str]:
+    """Слова запроса в нижнем регистре: операторы и кавычки не передаются в базу"""
+    return _WORD.findall(query.lower())
+
+
+def _meal_match(terms: List[str]):
+    """Полнотекстовое условие (все слова запроса) и оценка релевантности блюда"""
+    table = Meals._meta.db_table
+    if _vendor(Meals) == 'postgresql':
+        tsquery = f"plainto_tsquery('{SEARCH_CONFIG}', %s)"
+        text = ' '.join(terms)
+        return (
+            RawSQL(f"{table}.search_vector @@ {tsquery}", (text,), output_field=BooleanField()),
+            RawSQL(f"ts_rank({table}.search_vector, {tsquery})", (text,), output_field=FloatField()),
+        )
+    # Каждое слово - строка FTS5 в кавычках, пробел между ними - AND
+    match = ' '.join(f'"{term}"' for term in terms)
+    weights = ', '.join(str(weight) for weight in MEALS_FTS_WEIGHTS)
+    return (
+        RawSQL(
+            f"{table}.id IN (SELECT rowid FROM {MEALS_FTS_TABLE} WHERE {MEALS_FTS_TABLE} MATCH %s)",
+            (match,), output_field=BooleanField()
+        ),
+        # bm25 тем меньше, чем строка релевантнее
+        RawSQL(
+            f"(SELECT -bm25({MEALS_FTS_TABLE}, {weights}) FROM {MEALS_FTS_TABLE} "
+            f"WHERE {MEALS_FTS_TABLE} MATCH %s AND rowid = {table}.id)",
+            (match,), output_field=FloatField()
+        ),
+    )
+
+
+def _ingredient_match(text: str):
+    """Условие вхождения text в название ингредиента (без учета регистра)"""
+    pattern = f"%{text}%"
+    if _vendor(Ingredients) == 'postgresql':
+        return RawSQL(f"{Ingredients._meta.db_table}.name ILIKE %s", (pattern,), output_field=BooleanField())
+    return RawSQL(
+        f"{Ingredients._meta.db_table}.id IN "
+        f"(SELECT rowid FROM {INGREDIENTS_FTS_TABLE} WHERE {INGREDIENTS_FTS_TABLE}.name LIKE %s)",
+        (pattern,), output_field=BooleanField()
+    )
+
+
+class MealSearch:
+    """Полнотекстовый поиск блюд с ранжированием"""
+
+    @staticmethod
+    def search(
+        query: str,
+        fields: Sequence[str],
+        diet_type_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Блюда, содержащие все слова запроса, по убыванию релевантности.
+
+        Возвращает словари полей fields и оценку rank; фильтры по типу
+        питания и цене применяются в том же запросе.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+        match, rank = _meal_match(terms)
+        queryset = Meals.objects.filter(match)
+        if diet_type_id is not None:
+            queryset = queryset.filter(diet_type_id=diet_type_id)
+        if min_price is not None:
+            queryset = queryset.filter(price__gte=min_price)
+        if max_price is not None:
+            queryset = queryset.filter(price__lte=max_price)
+        return list(queryset.annotate(rank=rank).order_by('-rank', 'id').values(*fields, 'rank')[:limit])
+
+
+class IngredientSearch:
+    """Подсказки по названиям ингредиентов (поиск подстроки)"""
+
+    @staticmethod
+    def autocomplete(query: str, fields: Sequence[str], limit: int = 10) -> List[Dict[str, Any]]:
+        """Ингредиенты, в названии которых есть query: сначала совпадения в
+        начале названия, затем более короткие названия.
+
+        Индекс используется, если в запросе не меньше трех символов подряд.
+        """
+        text = _LIKE_WILDCARDS.sub('', query.strip())
+        if not text:
+            return []
+        return list(
+            Ingredients.objects
+            .filter(_ingredient_match(text))
+            .annotate(position=StrIndex(Lower('name'), Value(text.lower())), name_length=Length('name'))
+            .order_by('position', 'name_length', 'name', 'id')
+            .values(*fields)[:limit]
+        )
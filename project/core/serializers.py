@@ -0,0 +1,125 @@
+from django.conf import settings
+from rest_framework import serializers
+from typing import List, Dict, Any, Iterable
+
+from core.models import DietTypes, MealPlans, Meals, Ingredients
+from core.functions import PLAN_MEAL_FIELDS
+
+# Сериализаторы API чтения (core.views). Поля каждого сериализатора совпадают
+# с полями, которые представление загружает из базы (*_FIELDS), чтобы
+# сериализация не обращалась к отложенным полям отдельными запросами.
+
+DIET_TYPE_FIELDS = ('id', 'name', 'description', 'is_restricted', 'created_at')
+# Список блюд - без тяжелого description (он есть в ответе для одного блюда)
+MEAL_LIST_FIELDS = ('id', 'name', 'price', 'created_at', 'diet_type', 'diet_type__name')
+MEAL_DETAIL_FIELDS = MEAL_LIST_FIELDS + ('description',)
+MEAL_PLAN_FIELDS = ('id', 'user', 'duration', 'total_price', 'created_at')
+INGREDIENT_FIELDS = ('id', 'name', 'price_per_unit', 'unit', 'store_name', 'created_at')
+
+
+class DietTypeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DietTypes
+        fields = DIET_TYPE_FIELDS
+
+
+class DietTypeRefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DietTypes
+        fields = ('id', 'name')
+
+
+class MealListSerializer(serializers.ModelSerializer):
+    diet_type = DietTypeRefSerializer(read_only=True)
+
+    class Meta:
+        model = Meals
+        fields = ('id', 'name', 'price', 'diet_type', 'created_at')
+
+
+class MealDetailSerializer(MealListSerializer):
+    class Meta(MealListSerializer.Meta):
+        fields = MealListSerializer.Meta.fields + ('description',)
+
+
+class PlanMealSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Meals
+        fields = PLAN_MEAL_FIELDS
+
+
+class MealPlanSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(read_only=True)
+    meals = PlanMealSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = MealPlans
+        fields = ('id', 'user_id', 'duration', 'total_price', 'created_at', 'meals')
+
+
+class IngredientSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Ingredients
+        fields = INGREDIENT_FIELDS
+
+
+class LimitQuerySerializer(serializers.Serializer):
+    """Параметр limit ответов без постраничной выдачи (поиск, рекомендации)"""
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.API_MAX_PAGE_SIZE)
+
+
+class MealSearchQuerySerializer(LimitQuerySerializer):
+    """Параметры поиска блюд (core.views.MealSearchView)"""
+    q = serializers.CharField(max_length=200)
+    diet_type = serializers.IntegerField(required=False, min_value=1)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+
+
+class AutocompleteQuerySerializer(LimitQuerySerializer):
+    """Параметры подсказок по названию (core.views.IngredientAutocompleteView)"""
+    q = serializers.CharField(max_length=100)
+
+
+# Быстрый путь списков: строки values() без объектов моделей и сериализаторов,
+# сразу в core.renderers.FastJSONRenderer. Форма ответа та же, что у
+# MealListSerializer и MealPlanSerializer.
+MEAL_LIST_VALUES = ('id', 'name', 'price', 'diet_type_id', 'diet_type__name', 'created_at')
+MEAL_PLAN_VALUES = ('id', 'user_id', 'duration', 'total_price', 'created_at')
+INGREDIENT_AUTOCOMPLETE_VALUES = ('id', 'name', 'unit', 'price_per_unit')
+
+
+def meal_rows(rows: Iterable[Dict[str, Any]], include_description: bool = False) -> List[Dict[str, Any]]:
+    """Строки values(*MEAL_LIST_VALUES[, 'description']) в формате MealListSerializer"""
+    meals = [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'price': row['price'],
+            'diet_type': {'id': row['diet_type_id'], 'name': row['diet_type__name']} if row['diet_type_id'] else None,
+            'created_at': row['created_at'],
+        }
+        for row in rows
+    ]
+    if include_description:
+        for meal, row in zip(meals, rows):
+            meal['description'] = row['description']
+    return meals
+
+
+def meal_plan_rows(
+    rows: Iterable[Dict[str, Any]],
+    plan_meals: Dict[int, List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Строки values(*MEAL_PLAN_VALUES) и блюда планов в формате MealPlanSerializer"""
+    return [
+        {
+            'id': row['id'],
+            'user_id': row['user_id'],
+            'duration': row['duration'],
+            'total_price': row['total_price'],
+            'created_at': row['created_at'],
+            'meals': plan_meals.get(row['id'], []),
+        }
+        for row in rows
+    ]
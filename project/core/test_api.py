@@ -0,0 +1,97 @@
+import json
+from django.contrib.auth.models import User as DjangoUser
+from django.db.models import Prefetch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.factories import DatasetTestCase
+from core.models import Meals, MealPlans, Profile
+from core.pagination import encode_cursor
+from core.serializers import MealListSerializer, MealPlanSerializer
+
+
+class TestReadApi(DatasetTestCase):
+    dataset = {'users': 3, 'meals': 25, 'ingredients': 5, 'plans_per_user': 4, 'meals_per_plan': 3}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = DjangoUser.objects.create(username='staff', is_staff=True)
+        self.client.force_authenticate(self.staff)
+
+    def walk(self, url):
+        """Проходит все страницы списка и возвращает ID строк и число запросов на страницу"""
+        ids, queries = [], []
+        while url:
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [item['id'] for item in response.data['results']]
+            queries.append(len(captured))
+            url = response.data['next']
+        return ids, queries
+
+    def test_meal_pages_follow_cursor(self):
+        ids, queries = self.walk('/api/meals/?page_size=10')
+        self.assertEqual(ids, self.ids['meals'])
+        # Одна выборка на страницу, без COUNT(*)
+        self.assertEqual(queries, [1, 1, 1])
+
+    def test_meal_list_projection(self):
+        response = self.client.get('/api/meals/?page_size=1')
+        meal = Meals.objects.select_related('diet_type').get(id=self.ids['meals'][0])
+        self.assertEqual(response.json()['results'], [{
+            'id': meal.id,
+            'name': meal.name,
+            'price': str(meal.price),
+            'diet_type': {'id': meal.diet_type.id, 'name': meal.diet_type.name},
+            'created_at': response.json()['results'][0]['created_at'],
+        }])
+        described = self.client.get('/api/meals/?page_size=1&include=description')
+        self.assertIn('description', described.json()['results'][0])
+        detail = self.client.get(f'/api/meals/{meal.id}/')
+        self.assertIn('description', detail.data)
+        self.assertEqual(self.client.get('/api/meals/0/').status_code, 404)
+
+    def test_fast_rows_match_serializers(self):
+        # Строки values() + orjson дают тот же JSON, что сериализаторы моделей + JSONRenderer DRF
+        meals = Meals.objects.select_related('diet_type').order_by('id')
+        expected = json.loads(JSONRenderer().render(MealListSerializer(meals, many=True).data))
+        self.assertEqual(self.client.get('/api/meals/?page_size=100').json()['results'], expected)
+
+        plans = MealPlans.objects.prefetch_related(
+            Prefetch('meals', queryset=Meals.objects.order_by('id'))
+        ).order_by('id')
+        expected = json.loads(JSONRenderer().render(MealPlanSerializer(plans, many=True).data))
+        self.assertEqual(self.client.get('/api/meal-plans/?page_size=100').json()['results'], expected)
+
+    def test_created_at_ordering(self):
+        ids, _ = self.walk('/api/ingredients/?page_size=2&ordering=created_at')
+        self.assertEqual(sorted(ids), sorted(self.ids['ingredients']))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_plans_prefetch_meals(self):
+        ids, queries = self.walk('/api/meal-plans/?page_size=5')
+        self.assertEqual(ids, self.ids['meal_plans'])
+        # Планы и их блюда - два запроса на страницу независимо от ее размера
+        self.assertEqual(set(queries), {2})
+        plan = self.client.get(f'/api/meal-plans/{ids[0]}/').data
+        self.assertEqual(len(plan['meals']), 3)
+
+    def test_plans_visible_to_owner_only(self):
+        account = DjangoUser.objects.create(username='account')
+        Profile.objects.filter(user=account).update(site_user_id=self.ids['users'][0])
+        self.client.force_authenticate(DjangoUser.objects.get(id=account.id))
+        response = self.client.get('/api/meal-plans/')
+        self.assertEqual([plan['id'] for plan in response.data['results']], self.ids['meal_plans'][:4])
+        self.assertEqual(self.client.get(f"/api/meal-plans/{self.ids['meal_plans'][4]}/").status_code, 404)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/meals/?cursor=garbage').status_code, 404)
+        cursor = encode_cursor('id', (self.ids['meals'][0],))
+        self.assertEqual(self.client.get(f'/api/meals/?cursor={cursor}&ordering=created_at').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/diet-types/?cursor={cursor}').status_code, 200)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/meals/').status_code, 403)
@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User as DjangoUser
+from django.test import AsyncClient
+from core.factories import DatasetTestCase
+from core.functions import UserManager, MealPlanManager, MealManager, IngredientManager, FavoriteManager
+from core.models import User, Profile
+
+
+class TestAsyncManagers(DatasetTestCase):
+    dataset = {'users': 2, 'meals': 6, 'ingredients': 4, 'plans_per_user': 2, 'meals_per_plan': 3}
+
+    async def test_lookups_match_sync(self):
+        user_id, meal_id = self.ids['users'][0], self.ids['meals'][0]
+        self.assertEqual((await UserManager.aget_user_by_id(user_id)).id, user_id)
+        self.assertEqual((await MealManager.aget_meal_by_id(meal_id)).id, meal_id)
+        ingredient_id = self.ids['ingredients'][1]
+        self.assertEqual((await IngredientManager.aget_ingredient_by_id(ingredient_id)).id, ingredient_id)
+        self.assertIsNone(await UserManager.aget_user_by_id(0))
+        self.assertEqual(
+            [plan.id for plan in await MealPlanManager.aget_user_meal_plans(user_id)], self.ids['meal_plans'][:2]
+        )
+        self.assertEqual(len(await FavoriteManager.aget_user_favorites(user_id)), 2)
+
+    async def test_prices_match_sync(self):
+        plan_id, meal_id = self.ids['meal_plans'][0], self.ids['meals'][0]
+        self.assertEqual(
+            await MealPlanManager.acalculate_plan_price(plan_id),
+            await sync_to_async(MealPlanManager.calculate_plan_price)(plan_id)
+        )
+        self.assertEqual(
+            await MealManager.acalculate_meal_price(meal_id),
+            await sync_to_async(MealManager.calculate_meal_price)(meal_id)
+        )
+        self.assertEqual(await MealManager.aget_meal_price(meal_id), await MealManager.acalculate_meal_price(meal_id))
+
+    async def test_dashboard_matches_sync(self):
+        username = (await User.objects.aget(id=self.ids['users'][1])).username
+        self.assertEqual(
+            await UserManager.aget_user_dashboard(username),
+            await sync_to_async(UserManager.get_user_dashboard)(username)
+        )
+        self.assertIsNone(await UserManager.aget_user_dashboard('missing'))
+
+
+class TestUserOverviewView(DatasetTestCase):
+    dataset = {'users': 2, 'meals': 6, 'ingredients': 4, 'plans_per_user': 2, 'meals_per_plan': 3}
+
+    def setUp(self):
+        account = DjangoUser.objects.create(username='account')
+        Profile.objects.filter(user=account).update(site_user_id=self.ids['users'][0])
+        # Заново из базы: сохранение учетной записи при входе сохраняет и ее профиль
+        self.account = DjangoUser.objects.get(id=account.id)
+        self.client = AsyncClient()
+
+    async def test_owner_sees_overview(self):
+        await self.client.aforce_login(self.account)
+        response = await self.client.get(f"/api/users/{self.ids['users'][0]}/overview/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([plan['id'] for plan in data['plans']], self.ids['meal_plans'][:2])
+        self.assertEqual(len(data['favorites']), 2)
+
+    async def test_other_users_hidden(self):
+        await self.client.aforce_login(self.account)
+        self.assertEqual((await self.client.get(f"/api/users/{self.ids['users'][1]}/overview/")).status_code, 404)
+        self.client = AsyncClient()
+        self.assertEqual((await self.client.get(f"/api/users/{self.ids['users'][0]}/overview/")).status_code, 403)
@@ -0,0 +1,61 @@
+from decimal import Decimal
+from django.test import TestCase
+from core.models import User, MealPlans, Meals, Ingredients, MealPlanMeal, MealIngredient
+from core.basket import BasketOptimizer
+from core.functions import IngredientManager
+
+
+class TestBasketOptimizer(TestCase):
+    def setUp(self):
+        prices = {
+            'Milk': {'A': '1.00', 'B': '2.00', 'C': '1.50'},
+            'Bread': {'A': '3.00', 'B': '1.00', 'C': '1.60'},
+            'Eggs': {'A': '2.00', 'B': '2.50', 'C': '2.10'},
+        }
+        user = User.objects.create(username='basket', password_hash='hash', email='basket@example.com')
+        self.plan = MealPlans.objects.create(user=user, duration=7)
+        meal = Meals.objects.create(name='Breakfast', price=Decimal('0'))
+        MealPlanMeal.objects.create(meal=meal, plan=self.plan)
+        for name, by_store in prices.items():
+            for store_name, price in by_store.items():
+                ingredient = Ingredients.objects.create(
+                    name=name, price_per_unit=Decimal(price), unit='pcs', store_name=store_name
+                )
+                if store_name == 'A':
+                    MealIngredient.objects.create(meal=meal, ingredient=ingredient, quantity=Decimal('2.00'))
+        self.optimizer = BasketOptimizer.load()
+
+    def test_cheapest_offer_per_ingredient(self):
+        basket = self.optimizer.optimize(self.plan.id)
+        self.assertEqual(basket['stores'], ['A', 'B'])
+        self.assertAlmostEqual(basket['total'], 2 * (1.00 + 1.00 + 2.00))
+
+    def test_store_limit(self):
+        with self.assertNumQueries(1):
+            basket = self.optimizer.optimize(self.plan.id, max_stores=1)
+        self.assertEqual(basket['stores'], ['C'])
+        self.assertAlmostEqual(basket['total'], 2 * (1.50 + 1.60 + 2.10))
+
+    def test_infeasible_store_limit(self):
+        Ingredients.objects.create(name='Salt', price_per_unit=Decimal('0.50'), unit='pcs', store_name='D')
+        MealIngredient.objects.create(
+            meal=Meals.objects.get(name='Breakfast'),
+            ingredient=Ingredients.objects.get(name='Salt'),
+            quantity=Decimal('1.00')
+        )
+        optimizer = BasketOptimizer.load()
+        self.assertIsNone(optimizer.optimize(self.plan.id, max_stores=1))
+        self.assertEqual(optimizer.optimize(self.plan.id, max_stores=2)['stores'], ['C', 'D'])
+
+    def test_tombstoned_and_new_ingredients_are_skipped(self):
+        milk = Ingredients.objects.get(name='Milk', store_name='A')
+        IngredientManager.delete_ingredient_deferred([milk.id])
+        basket = BasketOptimizer.load().optimize(self.plan.id)
+        self.assertEqual([item['name'] for item in basket['items']], ['Bread', 'Eggs'])
+        # Ингредиент, появившийся после загрузки индекса, не ломает расчет
+        MealIngredient.objects.create(
+            meal=Meals.objects.get(name='Breakfast'),
+            ingredient=Ingredients.objects.create(name='Salt', price_per_unit=Decimal('0.50'), unit='pcs'),
+            quantity=Decimal('1.00')
+        )
+        self.assertAlmostEqual(self.optimizer.optimize(self.plan.id)['total'], 2 * (1.00 + 2.00))
@@ -0,0 +1,62 @@
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from core.models import User, Meals, Ingredients, Favorites, DietTypes, MealPlans, IngredientPriceHistory
+from core.functions import (
+    UserManager, MealPlanManager, MealManager, IngredientManager, DietTypeManager, FavoriteManager,
+    ON_CONFLICT_IGNORE, ON_CONFLICT_UPDATE, _bulk_create
+)
+
+
+class TestBulkCreate(TestCase):
+    def test_create_user_bulk_returns_ids_in_batches(self):
+        users = ({'username': f'user{i}', 'password': 'secret', 'email': f'user{i}@example.com'} for i in range(5))
+        with self.assertNumQueries(3):
+            ids = UserManager.create_user_bulk(users, batch_size=2)
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(set(User.objects.values_list('id', flat=True)), set(ids))
+        self.assertTrue(UserManager.verify_password(User.objects.get(username='user3'), 'secret'))
+
+    def test_create_user_bulk_upsert(self):
+        UserManager.create_user(username='taken', password='old', email='taken@example.com', age=20)
+        UserManager.create_user_bulk(
+            [{'username': 'taken', 'password': 'new', 'email': 'new@example.com', 'age': 30}],
+            on_conflict=ON_CONFLICT_UPDATE
+        )
+        user = User.objects.get(username='taken')
+        self.assertEqual((user.email, user.age), ('new@example.com', 30))
+        self.assertTrue(UserManager.verify_password(user, 'new'))
+
+    def test_create_favorite_bulk_conflicts(self):
+        user = UserManager.create_user(username='fan', password='secret', email='fan@example.com')
+        meal_ids = MealManager.create_meal_bulk([{'name': f'Meal {i}', 'price': 10} for i in range(3)])
+        FavoriteManager.create_favorite(user.id, meal_ids[0])
+        favorites = [{'user_id': user.id, 'meal_id': meal_id} for meal_id in meal_ids]
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            FavoriteManager.create_favorite_bulk(favorites)
+        FavoriteManager.create_favorite_bulk(favorites, on_conflict=ON_CONFLICT_IGNORE)
+        self.assertEqual(Favorites.objects.filter(user=user).count(), 3)
+
+    def test_unknown_on_conflict_mode(self):
+        with self.assertRaisesMessage(ValueError, 'Unknown on_conflict mode: replace'):
+            FavoriteManager.create_favorite_bulk([], on_conflict='replace')
+
+    def test_upsert_requires_unique_key(self):
+        # У блюд нет уникального ключа, по которому можно было бы обновить существующую строку
+        with self.assertRaisesMessage(ValueError, 'Meals has no unique key to upsert on'):
+            _bulk_create(Meals, [Meals(name='Soup', price=Decimal('5.00'))], 100, on_conflict=ON_CONFLICT_UPDATE)
+        self.assertFalse(Meals.objects.exists())
+
+    def test_other_managers(self):
+        diet_ids = DietTypeManager.create_diet_type_bulk([{'name': 'Vegan', 'is_restricted': True}])
+        self.assertEqual(DietTypes.objects.get(id=diet_ids[0]).name, 'Vegan')
+        user = UserManager.create_user(username='planner', password='secret', email='planner@example.com')
+        plan_ids = MealPlanManager.create_meal_plan_bulk([{'user_id': user.id, 'duration': 7}] * 3)
+        self.assertEqual(MealPlans.objects.filter(id__in=plan_ids).count(), 3)
+        ingredient_ids = IngredientManager.create_ingredient_bulk(
+            [{'name': 'Oats', 'price_per_unit': Decimal('1.20'), 'unit': 'kg'}]
+        )
+        ingredient = Ingredients.objects.get(id=ingredient_ids[0])
+        self.assertEqual((ingredient.dimension, ingredient.base_factor), ('mass', Decimal('1000')))
+        self.assertTrue(IngredientPriceHistory.objects.filter(ingredient=ingredient).exists())
+        self.assertEqual(Meals.objects.count(), 0)
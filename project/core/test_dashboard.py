@@ -0,0 +1,69 @@
+from decimal import Decimal
+from django.test import TestCase
+from core.models import DietTypes, User, MealPlans, Meals, MealPlanMeal, Favorites
+from core.functions import UserManager, MealManager, _dashboard_user, _dashboard_queries, _build_dashboard
+
+
+def create_user_with_plans(username, plan_count, meals_per_plan):
+    """Создает пользователя с plan_count планами по meals_per_plan блюд и избранным"""
+    diet_type = DietTypes.objects.create(name=f'Diet {username}')
+    user = User.objects.create(
+        username=username, password_hash=f'hash-{username}', email=f'{username}@example.com', diet_type=diet_type
+    )
+    for p in range(plan_count):
+        plan = MealPlans.objects.create(user=user, duration=7, total_price=Decimal('10.0'))
+        for m in range(meals_per_plan):
+            meal = Meals.objects.create(name=f'{username} {p}-{m}', price=Decimal(m + 1))
+            MealPlanMeal.objects.create(meal=meal, plan=plan)
+            if m == 0:
+                Favorites.objects.create(user=user, meal=meal)
+    return user
+
+
+class TestUserDashboard(TestCase):
+    def test_dashboard_contents(self):
+        create_user_with_plans('alice', 2, 3)
+        dashboard = UserManager.get_user_dashboard('alice')
+        self.assertEqual(dashboard['user']['username'], 'alice')
+        self.assertEqual(dashboard['user']['diet_type']['name'], 'Diet alice')
+        self.assertEqual(len(dashboard['plans']), 2)
+        self.assertEqual(
+            [meal['price'] for meal in dashboard['plans'][0]['meals']],
+            [Decimal('1.00'), Decimal('2.00'), Decimal('3.00')]
+        )
+        self.assertEqual([meal['name'] for meal in dashboard['favorites']], ['alice 0-0', 'alice 1-0'])
+
+    def test_query_count_is_constant(self):
+        create_user_with_plans('small', 1, 1)
+        create_user_with_plans('large', 10, 20)
+        with self.assertNumQueries(4):
+            small = UserManager.get_user_dashboard('small')
+        with self.assertNumQueries(4):
+            large = UserManager.get_user_dashboard('large')
+        self.assertEqual(sum(len(plan['meals']) for plan in small['plans']), 1)
+        self.assertEqual(sum(len(plan['meals']) for plan in large['plans']), 200)
+        self.assertEqual(len(large['favorites']), 10)
+
+    def test_missing_user_and_empty_plans(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(UserManager.get_user_dashboard('nobody'))
+        User.objects.create(username='empty', password_hash='hash-empty', email='empty@example.com')
+        dashboard = UserManager.get_user_dashboard('empty')
+        self.assertEqual((dashboard['plans'], dashboard['favorites'], dashboard['user']['diet_type']), ([], [], None))
+
+    def test_deferred_deleted_meals_are_hidden(self):
+        create_user_with_plans('bob', 1, 2)
+        meal_id = Meals.objects.get(name='bob 0-0').id
+        MealManager.delete_meal_deferred([meal_id])
+        dashboard = UserManager.get_user_dashboard('bob')
+        self.assertEqual([meal['name'] for meal in dashboard['plans'][0]['meals']], ['bob 0-1'])
+        self.assertEqual(dashboard['favorites'], [])
+
+    def test_plan_created_between_queries(self):
+        user = create_user_with_plans('carol', 1, 1)
+        plans, plan_meals, favorites = _dashboard_queries(user.id)
+        plan_rows = list(plans)
+        late = MealPlans.objects.create(user=user, duration=1)
+        MealPlanMeal.objects.create(meal=Meals.objects.create(name='late', price=Decimal('1')), plan=late)
+        dashboard = _build_dashboard(_dashboard_user('carol').first(), plan_rows, list(plan_meals), list(favorites))
+        self.assertEqual([[meal['name'] for meal in plan['meals']] for plan in dashboard['plans']], [['carol 0-0']])
@@ -0,0 +1,72 @@
+import multiprocessing
+from unittest import mock, skipUnless
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase
+from core.models import (
+    DietTypes, User, MealPlans, Meals, Ingredients, MealIngredient, Favorites, MealPlanMeal, IngredientPriceHistory
+)
+from core.datagen import DataGenerator, STAGES, _run_task
+from core.factories import requires_subprocesses
+from core.functions import UserManager
+
+
+class TestDataGenerator(TestCase):
+    @requires_subprocesses
+    def test_rows_do_not_depend_on_workers(self):
+        plan = DataGenerator.make_plan(scale=0.005, seed=7, chunk_size=20)
+        tasks = [(name, plan, chunk) for name, _, _ in STAGES for chunk in range(3)]
+        inline = [_run_task(task) for task in tasks]
+        self.assertEqual(inline, [_run_task(task) for task in tasks])
+        with multiprocessing.Pool(2) as pool:
+            self.assertEqual(inline, pool.map(_run_task, tasks))
+
+        other_seed = DataGenerator.make_plan(scale=0.005, seed=8, chunk_size=20)
+        self.assertNotEqual(inline[0], _run_task(('ingredients', other_seed, 0)))
+
+    def test_generate_loads_consistent_dataset(self):
+        report = DataGenerator.generate(scale=0.005, seed=7, workers=1, chunk_size=20)
+        rows = report['rows']
+        self.assertEqual((rows['users'], rows['meals'], rows['ingredients']), (50, 25, 8))
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(DietTypes.objects.count(), 7)
+        self.assertEqual(IngredientPriceHistory.objects.count(), 8)
+        self.assertEqual(MealIngredient.objects.count(), rows['meal_ingredients'])
+        self.assertEqual(MealPlanMeal.objects.count(), rows['meal_plan_meals'])
+        self.assertEqual(Favorites.objects.count(), rows['favorites'])
+        self.assertEqual(MealPlans.objects.count(), rows['meal_plans'])
+
+        # Каждое блюдо состоит из 3-8 ингредиентов, цены пересчитаны по ингредиентам
+        counts = Meals.objects.annotate(lines=Count('mealingredient')).values_list('lines', flat=True)
+        self.assertTrue(all(3 <= lines <= 8 for lines in counts))
+        self.assertFalse(MealPlans.objects.filter(meals__isnull=False, total_price__isnull=True).exists())
+
+        user = User.objects.order_by('id').first()
+        self.assertTrue(UserManager.verify_password(user, f'password{user.id}'))
+
+    def test_small_scale_generates_in_process(self):
+        # Одна пачка на этап: пул процессов не запускается даже без workers
+        with (
+            mock.patch('core.datagen.multiprocessing.cpu_count', return_value=4),
+            mock.patch('core.datagen.multiprocessing.Pool') as pool,
+        ):
+            DataGenerator.generate(scale=0.002, seed=1, reprice=False)
+        pool.assert_not_called()
+        self.assertEqual(User.objects.count(), 20)
+
+    def test_generate_appends_after_existing_rows(self):
+        DataGenerator.generate(scale=0.002, seed=1, workers=1, reprice=False)
+        DataGenerator.generate(scale=0.002, seed=1, workers=1, reprice=False)
+        self.assertEqual(User.objects.count(), 40)
+        self.assertEqual(Ingredients.objects.count(), 16)
+        self.assertEqual(DietTypes.objects.count(), 7)
+        # Новые записи создаются и обычным способом - последовательности ID не конфликтуют
+        UserManager.create_user('after', 'secret', 'after@example.com')
+
+    @skipUnless(connection.vendor == 'postgresql', 'ANALYZE is PostgreSQL-only')
+    def test_generate_analyzes_loaded_tables(self):
+        DataGenerator.generate(scale=0.002, seed=1, workers=1, reprice=False)
+        # reltuples = -1, пока таблица ни разу не анализировалась
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [Meals._meta.db_table])
+            self.assertGreater(cursor.fetchone()[0], 0)
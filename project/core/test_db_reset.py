@@ -0,0 +1,55 @@
+import tempfile
+from django.contrib.auth.models import User as DjangoUser
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from core.models import DietTypes, User, Meals, MealPlans, Favorites, MealIngredient, Profile
+from core.db_reset import DatabaseReset
+from core.test_delete import create_heavy_user
+
+
+class TestDatabaseReset(TestCase):
+    def test_reset_clears_tables_and_restarts_ids(self):
+        user, _, _, _ = create_heavy_user('heavy', 5)
+        account = DjangoUser.objects.create(username='account')
+        Profile.objects.filter(user=account).update(site_user=user)
+
+        DatabaseReset.reset()
+        self.assertEqual(
+            [model.objects.count() for model in (User, Meals, MealPlans, Favorites, MealIngredient, DietTypes)],
+            [0] * 6
+        )
+        # Профиль авторизации остается, ссылка на пользователя сайта обнуляется
+        self.assertIsNone(Profile.objects.get(user=account).site_user_id)
+        self.assertEqual(DietTypes.objects.create(name='Fresh').id, 1)
+
+    def test_reset_with_pending_foreign_key_checks(self):
+        # Отложенные проверки внешних ключей вставленных в этой же транзакции строк
+        with transaction.atomic():
+            create_heavy_user('pending', 2)
+            DatabaseReset.reset()
+        self.assertEqual((User.objects.count(), Favorites.objects.count()), (0, 0))
+
+
+class TestDatabaseSnapshots(TransactionTestCase):
+    def setUp(self):
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(DB_SNAPSHOT_DIR=self.snapshot_dir.name)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.snapshot_dir.cleanup()
+
+    def test_snapshot_and_restore(self):
+        create_heavy_user('seeded', 3)
+        DatabaseReset.snapshot('seeded')
+
+        DatabaseReset.reset()
+        create_heavy_user('other', 1)
+        DatabaseReset.restore('seeded')
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['seeded'])
+        self.assertEqual(Meals.objects.count(), 3)
+
+        DatabaseReset.drop_snapshot('seeded')
+        with self.assertRaises(FileNotFoundError):
+            DatabaseReset.restore('seeded')
@@ -0,0 +1,72 @@
+from decimal import Decimal
+from django.contrib.auth.models import User as DjangoUser
+from django.test import TestCase
+from core.models import (
+    DietTypes, User, MealPlans, Meals, Ingredients, Favorites, MealPlanMeal, MealIngredient, IngredientPriceHistory,
+    Profile
+)
+from core.factories import make_meals, make_favorites
+from core.functions import UserManager, MealManager, IngredientManager, DietTypeManager, FavoriteManager, MealPlanManager
+
+
+def create_heavy_user(username, meal_count):
+    """Создает пользователя с планом и избранным на meal_count блюд"""
+    diet_type = DietTypes.objects.create(name=f'Diet {username}')
+    user = User.objects.create(
+        username=username, password_hash=f'hash-{username}', email=f'{username}@example.com', diet_type=diet_type
+    )
+    plan = MealPlans.objects.create(user=user, duration=7)
+    ingredient = Ingredients.objects.create(name=f'Ingredient {username}', price_per_unit=Decimal('1.00'), unit='kg')
+    meals = make_meals(
+        meal_count, prefix=f'{username} meal', ingredients=[ingredient], lines_per_meal=1, diet_types=[diet_type]
+    )
+    MealPlanMeal.objects.bulk_create([MealPlanMeal(meal=meal, plan=plan) for meal in meals])
+    make_favorites([user], meals, per_user=meal_count)
+    return user, plan, ingredient, diet_type
+
+
+class TestDelete(TestCase):
+    def test_delete_user_cascades_without_loading_dependents(self):
+        small, _, _, _ = create_heavy_user('small', 2)
+        heavy, _, _, _ = create_heavy_user('heavy', 30)
+        account = DjangoUser.objects.create(username='account')
+        Profile.objects.filter(user=account).update(site_user=heavy)
+        # Число запросов не зависит от числа зависимых строк: сборщик каскада
+        # QuerySet.delete() проверяет уже пустые связи и обнуляет ссылку профиля
+        with self.assertNumQueries(12):
+            self.assertTrue(UserManager.delete_user(small.id))
+        with self.assertNumQueries(12):
+            self.assertTrue(UserManager.delete_user(heavy.id))
+        self.assertIsNone(Profile.objects.get(user=account).site_user_id)
+        self.assertFalse(UserManager.delete_user(heavy.id))
+        self.assertEqual((User.objects.count(), MealPlans.objects.count(), Favorites.objects.count()), (0, 0, 0))
+        self.assertEqual(MealPlanMeal.objects.count(), 0)
+        self.assertEqual(Meals.objects.count(), 32)
+
+    def test_delete_meal_many(self):
+        _, plan, _, _ = create_heavy_user('cook', 5)
+        meal_ids = list(Meals.objects.values_list('id', flat=True)[:3])
+        self.assertEqual(MealManager.delete_meal_many(meal_ids), 3)
+        self.assertEqual(plan.meals.count(), 2)
+        self.assertEqual(MealIngredient.objects.count(), 2)
+        self.assertEqual(Favorites.objects.count(), 2)
+
+    def test_delete_ingredient_and_diet_type(self):
+        user, _, ingredient, diet_type = create_heavy_user('chef', 3)
+        IngredientPriceHistory.objects.create(ingredient=ingredient, price_per_unit=Decimal('1.00'))
+        self.assertTrue(IngredientManager.delete_ingredient(ingredient.id))
+        self.assertEqual(MealIngredient.objects.count(), 0)
+        self.assertEqual(IngredientPriceHistory.objects.count(), 0)
+        self.assertTrue(DietTypeManager.delete_diet_type(diet_type.id))
+        user.refresh_from_db()
+        self.assertIsNone(user.diet_type_id)
+        self.assertEqual(Meals.objects.filter(diet_type__isnull=False).count(), 0)
+
+    def test_delete_plan_and_favorites_many(self):
+        user, plan, _, _ = create_heavy_user('fan', 4)
+        favorite_ids = list(Favorites.objects.values_list('id', flat=True))
+        # Один DELETE плюс SAVEPOINT/RELEASE транзакции пачки внутри тестовой транзакции
+        with self.assertNumQueries(3):
+            self.assertEqual(FavoriteManager.delete_favorite_many(favorite_ids), 4)
+        self.assertEqual(MealPlanManager.delete_meal_plan_many([plan.id, plan.id + 100]), 1)
+        self.assertEqual(MealPlanMeal.objects.count(), 0)
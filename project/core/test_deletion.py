@@ -0,0 +1,136 @@
+import os
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from core.models import (
+    User, MealPlans, Meals, Ingredients, Favorites, MealPlanMeal, MealIngredient, IngredientPriceHistory, DeletionJob
+)
+from core.deletion import DeferredDeletion
+from core.price_cache import MealPriceCache, _breakdown_key
+from core.functions import UserManager, MealManager, MealPlanManager, IngredientManager, PriceManager
+from core.test_delete import create_heavy_user
+
+
+class TestDeferredDeletion(TestCase):
+    def test_user_is_hidden_immediately(self):
+        user, _, _, _ = create_heavy_user('heavy', 5)
+        jobs = UserManager.delete_user_deferred([user.id])
+        self.assertEqual(len(jobs), 1)
+        self.assertIsNone(UserManager.get_user_by_id(user.id))
+        self.assertFalse(User.objects.filter(id=user.id).exists())
+        self.assertTrue(User.all_objects.filter(id=user.id).exists())
+        # Зависимые строки еще не удалены
+        self.assertEqual(Favorites.objects.count(), 5)
+
+    def test_username_and_email_are_released(self):
+        user, _, _, _ = create_heavy_user('heavy', 2)
+        UserManager.delete_user_deferred([user.id])
+        self.assertEqual(
+            User.all_objects.values_list('username', 'email').get(id=user.id),
+            (f'deleted-{user.id}', f'deleted-{user.id}@deleted.invalid')
+        )
+        # Имя и почту можно занять сразу, до обработки задания
+        again = UserManager.create_user('heavy', 'secret', 'heavy@example.com')
+        self.assertNotEqual(again.id, user.id)
+        DeferredDeletion.run_pending()
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['heavy'])
+
+    def test_user_deleted_in_chunks(self):
+        user, _, _, _ = create_heavy_user('heavy', 5)
+        job = UserManager.delete_user_deferred([user.id])[0]
+        self.assertTrue(DeferredDeletion.process_chunk(job.id, chunk_size=2))
+        job.refresh_from_db()
+        self.assertEqual((job.stage, job.deleted_rows, job.status), ('favorites', 2, DeletionJob.STATUS_PENDING))
+        self.assertEqual(Favorites.objects.count(), 3)
+
+        DeferredDeletion.run_job(job.id, chunk_size=2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DeletionJob.STATUS_DONE)
+        self.assertIsNotNone(job.finished_at)
+        # 5 избранных, 5 связей плана, 1 план и сам пользователь
+        self.assertEqual(job.deleted_rows, 12)
+        self.assertFalse(User.all_objects.filter(id=user.id).exists())
+        self.assertEqual((MealPlans.objects.count(), MealPlanMeal.objects.count()), (0, 0))
+        self.assertEqual(Meals.objects.count(), 5)
+        self.assertIsNone(DeferredDeletion.process_chunk(job.id))
+
+    def test_each_chunk_is_bounded(self):
+        user, _, _, _ = create_heavy_user('heavy', 30)
+        job = UserManager.delete_user_deferred([user.id])[0]
+        # Блокировка задания, выборка ID, DELETE, сохранение прогресса (+ SAVEPOINT)
+        with self.assertNumQueries(6):
+            DeferredDeletion.process_chunk(job.id, chunk_size=10)
+        self.assertEqual(Favorites.objects.count(), 20)
+
+    def test_resume_after_partial_progress(self):
+        _, plan, _, _ = create_heavy_user('cook', 4)
+        meal_ids = list(Meals.objects.values_list('id', flat=True)[:2])
+        MealManager.delete_meal_deferred(meal_ids)
+        self.assertEqual(Meals.objects.count(), 2)
+        self.assertEqual(plan.meals.count(), 2)
+        self.assertEqual(MealPlanMeal.objects.count(), 4)
+
+        first = DeletionJob.objects.order_by('id').first()
+        DeferredDeletion.process_chunk(first.id, chunk_size=1)
+        self.assertEqual(DeferredDeletion.run_pending(chunk_size=1), 2)
+        self.assertEqual(DeferredDeletion.progress(), {'done': 2, 'pending': 0})
+        self.assertEqual(Meals.all_objects.count(), 2)
+        self.assertEqual(MealIngredient.objects.count(), 2)
+        self.assertEqual(Favorites.objects.count(), 2)
+
+    def test_ingredient_and_command(self):
+        _, _, ingredient, _ = create_heavy_user('chef', 3)
+        IngredientPriceHistory.objects.create(ingredient=ingredient, price_per_unit=Decimal('1.00'))
+        IngredientManager.delete_ingredient_deferred([ingredient.id])
+        self.assertFalse(Ingredients.objects.exists())
+        # Уже помеченный ингредиент не планируется повторно
+        self.assertEqual(IngredientManager.delete_ingredient_deferred([ingredient.id]), [])
+
+        call_command('process_deletions', chunk_size=2, stdout=open(os.devnull, 'w'))
+        self.assertFalse(Ingredients.all_objects.exists())
+        self.assertEqual((MealIngredient.objects.count(), IngredientPriceHistory.objects.count()), (0, 0))
+        self.assertEqual(Meals.objects.count(), 3)
+
+    def test_sync_delete_removes_tombstoned_rows(self):
+        user, _, _, _ = create_heavy_user('heavy', 2)
+        UserManager.delete_user_deferred([user.id])
+        self.assertTrue(UserManager.delete_user(user.id))
+        DeferredDeletion.run_pending()
+        self.assertEqual(DeletionJob.objects.get().status, DeletionJob.STATUS_DONE)
+
+    def test_meal_prices_skip_tombstoned_ingredients(self):
+        cache.clear()
+        MealPriceCache.clear_local()
+        meal = Meals.objects.create(name='Soup', price=Decimal('0'))
+        kept, dropped = [
+            Ingredients.objects.create(name=name, price_per_unit=price, unit='kg')
+            for name, price in (('Carrot', Decimal('2.00')), ('Truffle', Decimal('3.00')))
+        ]
+        for ingredient in (kept, dropped):
+            MealIngredient.objects.create(meal=meal, ingredient=ingredient, quantity=Decimal('1.00'))
+        job = IngredientManager.delete_ingredient_deferred([dropped.id])[0]
+        # Связь еще не удалена, но цена уже не учитывает ингредиент
+        self.assertEqual(MealManager.get_meal_price(meal.id), Decimal('2.00'))
+        self.assertEqual(MealManager.calculate_meal_price(meal.id), Decimal('2.00'))
+
+        DeferredDeletion.process_chunk(job.id)
+        self.assertIsNone(cache.get(_breakdown_key(meal.id)))
+        DeferredDeletion.run_job(job.id)
+        self.assertEqual(MealManager.get_meal_price(meal.id), MealManager.calculate_meal_price(meal.id))
+
+    def test_plan_prices_skip_tombstoned_meals(self):
+        user = User.objects.create(username='planner', password_hash='hash', email='planner@example.com')
+        plan = MealPlans.objects.create(user=user, duration=1, total_price=Decimal('0'))
+        kept, dropped = [
+            Meals.objects.create(name=name, price=price) for name, price in (('Soup', Decimal('2.00')), ('Cake', Decimal('3.00')))
+        ]
+        for meal in (kept, dropped):
+            MealPlanMeal.objects.create(plan=plan, meal=meal)
+        MealManager.delete_meal_deferred([dropped.id])
+        # Связь с планом еще не удалена, но блюдо уже не входит в стоимость плана
+        self.assertEqual(MealPlanManager.calculate_plan_price(plan.id), Decimal('2.00'))
+        PriceManager.bulk_update_all_meal_plan_prices()
+        self.assertEqual(MealPlans.objects.get(id=plan.id).total_price, Decimal('2.0'))
+        PriceManager.update_all_meal_plan_prices()
+        self.assertEqual(MealPlans.objects.get(id=plan.id).total_price, Decimal('2.0'))
@@ -0,0 +1,34 @@
+from decimal import Decimal
+from core.models import User, Meals, MealIngredient, MealPlanMeal, Favorites, IngredientPriceHistory
+from core.factories import DatasetTestCase, make_ingredients, make_meals
+from core.functions import UserManager, MealManager, PriceManager
+
+
+class TestFactories(DatasetTestCase):
+    dataset = {
+        'users': 1000, 'meals': 2000, 'ingredients': 200,
+        'lines_per_meal': 5, 'plans_per_user': 2, 'meals_per_plan': 4, 'favorites_per_user': 3,
+    }
+
+    def test_shared_dataset_sizes(self):
+        self.assertEqual(User.objects.count(), 1000)
+        self.assertEqual(Meals.objects.count(), 2000)
+        self.assertEqual(MealIngredient.objects.count(), 10000)
+        self.assertEqual(MealPlanMeal.objects.count(), 8000)
+        self.assertEqual(Favorites.objects.count(), 3000)
+        self.assertEqual(IngredientPriceHistory.objects.count(), 200)
+
+    def test_changes_are_rolled_back_between_tests(self):
+        self.assertEqual(UserManager.delete_user_many(self.ids['users'][:500]), 500)
+        self.assertEqual(User.objects.count(), 500)
+
+    def test_bulk_repricing_on_shared_dataset(self):
+        self.assertEqual(PriceManager.bulk_update_all_meal_prices()['rows'], 2000)
+        # Ингредиенты 0-4 по 1.00, 1.01, ... за единицу, по 1 единице каждого
+        self.assertEqual(MealManager.calculate_meal_price(self.ids['meals'][0]), Decimal('5.10'))
+
+    def test_make_ingredients_sets_unit_dimension(self):
+        ingredient = make_ingredients(1, prefix='Flour', unit='kg')[0]
+        self.assertEqual((ingredient.dimension, ingredient.base_factor), ('mass', Decimal('1000')))
+        meal = make_meals(1, prefix='Bread', ingredients=[ingredient], lines_per_meal=3)[0]
+        self.assertEqual(MealIngredient.objects.filter(meal=meal).count(), 1)
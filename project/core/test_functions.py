@@ -1,24 +1,31 @@
-import os
-import sys
-
-# Добавляем корневую директорию проекта в sys.path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-sys.path.insert(0, project_root)
-
-import django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
-django.setup()
-
 from django.test import TestCase
-from core.models import DietTypes, User, MealPlans, Meals, Ingredients, Favorites, MealPlanMeal, MealIngredient
-from core.functions import (
-    create_user, get_all_users, get_user_by_id, delete_user, verify_user_password,
-    create_meal_plan, get_all_meal_plans, get_meal_plan_by_id, delete_meal_plan,
-    create_favorite, get_all_favorites, get_favorite_by_id, delete_favorite,
-    create_meal, get_all_meals, get_meal_by_id, delete_meal,
-    create_ingredient, get_all_ingredients, get_ingredient_by_id, delete_ingredient,
-    create_diet_type, get_all_diet_types, get_diet_type_by_id, delete_diet_type
-)
+from core.functions import UserManager, MealPlanManager, FavoriteManager, MealManager, IngredientManager, DietTypeManager
+
+create_user = UserManager.create_user
+get_all_users = UserManager.get_all_users
+get_user_by_id = UserManager.get_user_by_id
+delete_user = UserManager.delete_user
+verify_user_password = UserManager.verify_password
+create_meal_plan = MealPlanManager.create_meal_plan
+get_all_meal_plans = MealPlanManager.get_all_meal_plans
+get_meal_plan_by_id = MealPlanManager.get_meal_plan_by_id
+delete_meal_plan = MealPlanManager.delete_meal_plan
+create_favorite = FavoriteManager.create_favorite
+get_all_favorites = FavoriteManager.get_all_favorites
+get_favorite_by_id = FavoriteManager.get_favorite_by_id
+delete_favorite = FavoriteManager.delete_favorite
+create_meal = MealManager.create_meal
+get_all_meals = MealManager.get_all_meals
+get_meal_by_id = MealManager.get_meal_by_id
+delete_meal = MealManager.delete_meal
+create_ingredient = IngredientManager.create_ingredient
+get_all_ingredients = IngredientManager.get_all_ingredients
+get_ingredient_by_id = IngredientManager.get_ingredient_by_id
+delete_ingredient = IngredientManager.delete_ingredient
+create_diet_type = DietTypeManager.create_diet_type
+get_all_diet_types = DietTypeManager.get_all_diet_types
+get_diet_type_by_id = DietTypeManager.get_diet_type_by_id
+delete_diet_type = DietTypeManager.delete_diet_type
 
 class TestUserFunctions(TestCase):
     def setUp(self):
@@ -0,0 +1,29 @@
+from decimal import Decimal, ROUND_HALF_UP
+from unittest import TestCase
+
+from core.money import (
+    to_minor, from_minor, round_decimal, round_half_up, sum_line_costs, QUANTITY_PLACES, LINE_SCALE
+)
+
+
+class TestMoney(TestCase):
+    def test_round_trip(self):
+        self.assertEqual(to_minor(Decimal('12.34')), 1234)
+        self.assertEqual(to_minor(None), 0)
+        self.assertEqual(from_minor(1234), Decimal('12.34'))
+        self.assertEqual(to_minor(Decimal('1.5'), QUANTITY_PLACES), 150)
+
+    def test_round_half_up_matches_decimal_quantize(self):
+        for value in range(-30000, 30000, 25):
+            expected = (Decimal(value) / 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+            self.assertEqual(round_half_up(value, 100), int(expected))
+        self.assertEqual(round_half_up(250, 100), 3)
+        self.assertEqual(round_half_up(-250, 100), -3)
+        self.assertEqual(round_decimal(Decimal('47.25'), 1), Decimal('47.3'))
+        self.assertEqual(to_minor(Decimal('0.525')), 53)
+
+    def test_sum_line_costs_matches_integer_sum(self):
+        lines = [(Decimal('2.99'), Decimal('0.35')), (Decimal('17.45'), Decimal('3.33')), (Decimal('0.01'), Decimal('0.50'))]
+        total = sum(to_minor(price) * to_minor(quantity, QUANTITY_PLACES) for price, quantity in lines)
+        self.assertEqual(str(sum_line_costs(lines)), '59.16')
+        self.assertEqual(sum_line_costs(lines), from_minor(round_half_up(total, LINE_SCALE)))
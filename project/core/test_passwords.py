@@ -0,0 +1,46 @@
+import asyncio
+from django.test import TestCase, override_settings
+from core.models import User
+from core.passwords import hash_password, hash_passwords, verify_password, verify_password_async
+from core.factories import requires_subprocesses
+from core.functions import UserManager
+
+
+@override_settings(PASSWORD_HASH_METHOD='pbkdf2:sha256:1000', PASSWORD_HASH_SALT_LENGTH=8)
+class TestPasswords(TestCase):
+    def test_method_from_settings(self):
+        password_hash = hash_password('secret')
+        self.assertTrue(password_hash.startswith('pbkdf2:sha256:1000$'))
+        self.assertTrue(verify_password(password_hash, 'secret'))
+        self.assertFalse(verify_password(password_hash, 'wrong'))
+
+    @requires_subprocesses
+    def test_pool_preserves_order(self):
+        passwords = [f'password-{i}' for i in range(7)]
+        for workers in (1, 2):
+            hashes = list(hash_passwords(iter(passwords), workers=workers, window_size=3))
+            self.assertEqual(len(hashes), 7)
+            self.assertEqual(len(set(hashes)), 7)
+            for password, password_hash in zip(passwords, hashes):
+                self.assertTrue(verify_password(password_hash, password))
+
+    @requires_subprocesses
+    def test_create_user_bulk_hashes_in_pool(self):
+        users = (
+            {'username': f'user{i}', 'password': f'password-{i}', 'email': f'user{i}@example.com'}
+            for i in range(5)
+        )
+        self.assertEqual(len(UserManager.create_user_bulk(users, batch_size=2, workers=2)), 5)
+        for user in User.objects.order_by('id'):
+            self.assertTrue(UserManager.verify_password(user, f'password-{user.username[4:]}'))
+
+    def test_verify_password_async(self):
+        user = UserManager.create_user('async', 'secret', 'async@example.com')
+
+        async def check():
+            return await asyncio.gather(
+                UserManager.verify_password_async(user, 'secret'),
+                verify_password_async(user.password_hash, 'wrong'),
+            )
+
+        self.assertEqual(asyncio.run(check()), [True, False])
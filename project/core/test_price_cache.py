@@ -0,0 +1,72 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from core.models import Meals, Ingredients, MealIngredient
+from core.functions import MealManager, IngredientManager
+from core.price_cache import LocalLRUCache, MealPriceCache
+
+
+class TestLocalLRUCache(TestCase):
+    def test_evicts_least_recently_used(self):
+        local = LocalLRUCache(maxsize=2, ttl=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+        self.assertEqual(local.get('a'), 1)
+        self.assertIsNone(local.get('b'))
+
+    def test_expires_after_ttl(self):
+        local = LocalLRUCache(maxsize=2, ttl=0)
+        local.set('a', 1)
+        self.assertIsNone(local.get('a'))
+
+
+class TestMealPriceCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        MealPriceCache.clear_local()
+        self.meal = Meals.objects.create(name='Soup', price=Decimal('0'))
+        self.ingredient = Ingredients.objects.create(name='Carrot', price_per_unit=Decimal('2.00'), unit='kg')
+        self.link = MealIngredient.objects.create(meal=self.meal, ingredient=self.ingredient, quantity=Decimal('1.50'))
+
+    def test_hot_lookups_need_no_sql(self):
+        self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal('3.00'))
+        with self.assertNumQueries(0):
+            self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal('3.00'))
+            self.assertEqual(MealManager.get_meal_breakdown(self.meal.id)[0]['name'], 'Carrot')
+
+    def test_shared_tier_serves_after_local_miss(self):
+        MealManager.get_meal_price(self.meal.id)
+        MealPriceCache.clear_local()
+        with self.assertNumQueries(0):
+            self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal('3.00'))
+
+    def test_invalidated_when_quantity_changes(self):
+        MealManager.get_meal_price(self.meal.id)
+        self.link.quantity = Decimal('2.00')
+        self.link.save()
+        self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal('4.00'))
+
+    def test_invalidated_when_ingredient_price_changes(self):
+        MealManager.get_meal_price(self.meal.id)
+        self.ingredient.price_per_unit = Decimal('3.00')
+        self.ingredient.save()
+        self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal('4.50'))
+        IngredientManager.update_ingredient_price(self.ingredient.id, Decimal('1.00'))
+        self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal('1.50'))
+
+    def test_rounded_like_calculated_price(self):
+        MealIngredient.objects.create(
+            meal=self.meal,
+            ingredient=Ingredients.objects.create(name='Salt', price_per_unit=Decimal('2.99'), unit='kg'),
+            quantity=Decimal('0.35')
+        )
+        price = MealManager.get_meal_price(self.meal.id)
+        self.assertEqual(str(price), '4.05')
+        self.assertEqual(str(price), str(MealManager.calculate_meal_price(self.meal.id)))
+
+    def test_invalidated_when_link_deleted(self):
+        MealManager.get_meal_price(self.meal.id)
+        self.link.delete()
+        self.assertEqual(MealManager.get_meal_price(self.meal.id), Decimal(0))
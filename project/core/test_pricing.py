@@ -0,0 +1,241 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.utils import timezone
+from core.models import User, MealPlans, Meals, Ingredients, MealPlanMeal, MealIngredient, IngredientPriceHistory
+from core.functions import MealManager, MealPlanManager, IngredientManager, PriceManager
+from core.money import PLAN_PRICE_PLACES, round_decimal
+from core.pricing_matrix import PricingMatrix
+
+
+def create_catalog(meal_count):
+    """Создает блюда с ингредиентами и один план питания со всеми блюдами"""
+    user = User.objects.create(username='pricing', password_hash='hash', email='pricing@example.com')
+    plan = MealPlans.objects.create(user=user, duration=7)
+    ingredients = [
+        Ingredients.objects.create(name=f'Ingredient {i}', price_per_unit=Decimal('2.50') + i, unit='kg')
+        for i in range(3)
+    ]
+    meals = []
+    for i in range(meal_count):
+        meal = Meals.objects.create(name=f'Meal {i}', price=Decimal('0'))
+        for ingredient in ingredients:
+            MealIngredient.objects.create(meal=meal, ingredient=ingredient, quantity=Decimal('1.50'))
+        MealPlanMeal.objects.create(meal=meal, plan=plan)
+        meals.append(meal)
+    return plan, meals, ingredients
+
+
+class TestBulkRepricing(TestCase):
+    def test_bulk_meal_prices_match_per_row_calculation(self):
+        plan, meals, ingredients = create_catalog(3)
+        empty_meal = Meals.objects.create(name='Empty', price=Decimal('9.99'))
+        report = PriceManager.bulk_update_all_meal_prices(batch_size=2)
+        self.assertEqual(report['rows'], 4)
+        expected = sum(ingredient.price_per_unit * Decimal('1.50') for ingredient in ingredients)
+        for meal in meals:
+            meal.refresh_from_db()
+            self.assertEqual(meal.price, round_decimal(expected))
+            self.assertEqual(meal.price, MealManager.calculate_meal_price(meal.id))
+        empty_meal.refresh_from_db()
+        self.assertEqual(empty_meal.price, Decimal('0'))
+
+    def test_bulk_plan_prices_match_per_row_calculation(self):
+        plan, _, _ = create_catalog(3)
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+        plan.refresh_from_db()
+        self.assertEqual(
+            plan.total_price, round_decimal(MealPlanManager.calculate_plan_price(plan.id), PLAN_PRICE_PLACES)
+        )
+
+    def test_streaming_sweep_matches_bulk(self):
+        plan, meals, _ = create_catalog(3)
+        PriceManager.update_all_meal_prices()
+        PriceManager.update_all_meal_plan_prices()
+        swept = dict(Meals.objects.values_list('id', 'price')), MealPlans.objects.get(id=plan.id).total_price
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+        bulk = dict(Meals.objects.values_list('id', 'price')), MealPlans.objects.get(id=plan.id).total_price
+        self.assertEqual(swept, bulk)
+
+    def test_ties_round_the_same_in_python_and_sql(self):
+        # 1.05 * 0.50 = 0.525 -> 0.53; план 0.53 + 0.92 = 1.45 -> 1.5 (половина от нуля)
+        user = User.objects.create(username='ties', password_hash='hash', email='ties@example.com')
+        plan = MealPlans.objects.create(user=user, duration=1)
+        for price, quantity in (('1.05', '0.50'), ('0.92', '1.00')):
+            meal = Meals.objects.create(name=f'Tie {price}', price=Decimal('0'))
+            ingredient = Ingredients.objects.create(name=f'Tie {price}', price_per_unit=Decimal(price), unit='kg')
+            MealIngredient.objects.create(meal=meal, ingredient=ingredient, quantity=Decimal(quantity))
+            MealPlanMeal.objects.create(meal=meal, plan=plan)
+        PriceManager.update_all_meal_prices()
+        PriceManager.update_all_meal_plan_prices()
+        swept = sorted(Meals.objects.values_list('price', flat=True)), MealPlans.objects.get(id=plan.id).total_price
+        self.assertEqual(swept, ([Decimal('0.53'), Decimal('0.92')], Decimal('1.5')))
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+        bulk = sorted(Meals.objects.values_list('price', flat=True)), MealPlans.objects.get(id=plan.id).total_price
+        self.assertEqual(bulk, swept)
+
+    def test_query_count_does_not_grow_with_catalog(self):
+        create_catalog(2)
+        with self.assertNumQueries(2):
+            PriceManager.bulk_update_all_meal_prices(batch_size=None)
+        User.objects.all().delete()
+        create_catalog(20)
+        with self.assertNumQueries(2):
+            PriceManager.bulk_update_all_meal_prices(batch_size=None)
+
+
+class TestIncrementalPropagation(TestCase):
+    def setUp(self):
+        self.plan, self.meals, self.ingredients = create_catalog(3)
+        self.other_meal = Meals.objects.create(name='Other', price=Decimal('0'))
+        self.other_ingredient = Ingredients.objects.create(name='Other', price_per_unit=Decimal('4.00'), unit='g')
+        MealIngredient.objects.create(meal=self.other_meal, ingredient=self.other_ingredient, quantity=Decimal('2.00'))
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+
+    def test_only_dependent_meals_and_plans_change(self):
+        report = IngredientManager.update_ingredient_price(self.ingredients[0].id, Decimal('3.50'))
+        self.assertEqual(report['meals'], 3)
+        self.assertEqual(report['plans'], 1)
+        for meal in self.meals:
+            meal.refresh_from_db()
+            self.assertEqual(meal.price, Decimal('17.25'))
+        self.other_meal.refresh_from_db()
+        self.assertEqual(self.other_meal.price, Decimal('8.00'))
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.total_price, round_decimal(3 * Decimal('17.25'), PLAN_PRICE_PLACES))
+
+    def test_incremental_matches_full_sweep(self):
+        IngredientManager.update_ingredient_prices({
+            self.ingredients[1].id: Decimal('1.10'),
+            self.other_ingredient.id: Decimal('5.00'),
+        })
+        incremental = dict(Meals.objects.values_list('id', 'price'))
+        incremental_plan = MealPlans.objects.get(id=self.plan.id).total_price
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+        self.assertEqual(dict(Meals.objects.values_list('id', 'price')), incremental)
+        self.assertEqual(MealPlans.objects.get(id=self.plan.id).total_price, incremental_plan)
+
+    def test_unknown_ingredients_are_rejected(self):
+        missing = self.other_ingredient.id + 100
+        with self.assertRaises(ValueError):
+            IngredientManager.update_ingredient_prices({self.ingredients[0].id: Decimal('9.00'), missing: Decimal('1.00')})
+        # Ни цены, ни история не изменились
+        self.assertEqual(Ingredients.objects.get(id=self.ingredients[0].id).price_per_unit, Decimal('2.50'))
+        self.assertFalse(IngredientPriceHistory.objects.filter(ingredient_id=missing).exists())
+
+    def test_repeated_small_changes_do_not_drift(self):
+        # Каждое изменение сдвигает сумму плана меньше, чем на 0.05 (шаг total_price)
+        meal = Meals.objects.create(name='Small', price=Decimal('0'))
+        ingredient = Ingredients.objects.create(name='Small', price_per_unit=Decimal('1.00'), unit='kg')
+        MealIngredient.objects.create(meal=meal, ingredient=ingredient, quantity=Decimal('1.00'))
+        plan = MealPlans.objects.create(user=self.plan.user, duration=1)
+        MealPlanMeal.objects.create(meal=meal, plan=plan)
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+        for price in ('1.04', '1.08'):
+            IngredientManager.update_ingredient_price(ingredient.id, Decimal(price))
+        plan.refresh_from_db()
+        self.assertEqual(plan.total_price, Decimal('1.1'))
+        PriceManager.bulk_update_all_meal_plan_prices()
+        self.assertEqual(MealPlans.objects.get(id=plan.id).total_price, plan.total_price)
+
+
+class TestPricingMatrix(TestCase):
+    def setUp(self):
+        self.plan, self.meals, self.ingredients = create_catalog(2)
+        Ingredients.objects.filter(id=self.ingredients[0].id).update(store_name='Store X')
+        self.matrix = PricingMatrix.load()
+
+    def test_baseline_matches_database_aggregate(self):
+        result = self.matrix.run_scenario()
+        for meal in self.meals:
+            self.assertAlmostEqual(result['meals'][meal.id], 15.75)
+        self.assertAlmostEqual(result['plans'][self.plan.id], 31.5)
+
+    def test_scenarios_do_not_touch_database(self):
+        with self.assertNumQueries(0):
+            results = self.matrix.run_scenarios([
+                {'ingredient_change': 0.08},
+                {'store_changes': {'Store X': -0.15}},
+                {'ingredient_changes': {self.ingredients[2].id: 1.0}},
+            ])
+        self.assertAlmostEqual(results[0]['meals'][self.meals[0].id], 17.01)
+        self.assertAlmostEqual(results[1]['meals'][self.meals[0].id], round(15.75 - 2.5 * 1.5 * 0.15, 2))
+        self.assertAlmostEqual(results[2]['plans'][self.plan.id], 2 * (15.75 + 4.5 * 1.5))
+
+
+    def test_tombstoned_meals_and_ingredients_are_skipped(self):
+        # Связи остаются до обработки заданий удаления; ингредиент - с наибольшим ID
+        MealManager.delete_meal_deferred([self.meals[0].id])
+        IngredientManager.delete_ingredient_deferred([self.ingredients[2].id])
+        result = PricingMatrix.load().run_scenario()
+        self.assertEqual(list(result['meals']), [self.meals[1].id])
+        self.assertAlmostEqual(result['meals'][self.meals[1].id], 15.75 - 4.5 * 1.5)
+        self.assertAlmostEqual(result['plans'][self.plan.id], 15.75 - 4.5 * 1.5)
+
+
+class TestPriceHistory(TestCase):
+    def setUp(self):
+        self.day1 = timezone.now() - timedelta(days=10)
+        self.day2 = timezone.now() - timedelta(days=5)
+        self.ingredient = IngredientManager.create_ingredient(
+            name='Flour', price_per_unit=Decimal('2.00'), unit='kg', valid_from=self.day1
+        )
+        self.meal = Meals.objects.create(name='Bread', price=Decimal('0'))
+        MealIngredient.objects.create(meal=self.meal, ingredient=self.ingredient, quantity=Decimal('3.00'))
+        user = User.objects.create(username='history', password_hash='hash', email='history@example.com')
+        self.plan = MealPlans.objects.create(user=user, duration=7)
+        MealPlanMeal.objects.create(meal=self.meal, plan=self.plan)
+        IngredientManager.update_ingredient_price(self.ingredient.id, Decimal('3.00'), valid_from=self.day2)
+
+    def test_price_changes_are_appended(self):
+        self.assertEqual(
+            list(self.ingredient.price_history.order_by('valid_from').values_list('price_per_unit', flat=True)),
+            [Decimal('2.00'), Decimal('3.00')]
+        )
+
+    def test_meal_and_plan_price_as_of(self):
+        before = self.day1 + timedelta(days=1)
+        with self.assertNumQueries(1):
+            self.assertEqual(MealManager.calculate_meal_price_as_of(self.meal.id, before), Decimal('6.00'))
+        with self.assertNumQueries(1):
+            self.assertEqual(MealPlanManager.calculate_plan_price_as_of(self.plan.id, timezone.now()), Decimal('9.00'))
+        self.assertEqual(MealManager.calculate_meal_price_as_of(self.meal.id, self.day1 - timedelta(days=1)), Decimal(0))
+
+    def test_as_of_now_matches_stored_totals(self):
+        # 1.05 * 0.50 = 0.525 -> 0.53 на блюдо; без округления блюд план стоил бы 1.05
+        tie = IngredientManager.create_ingredient(
+            name='Tie', price_per_unit=Decimal('1.05'), unit='kg', valid_from=self.day1
+        )
+        for name in ('Tie A', 'Tie B'):
+            meal = Meals.objects.create(name=name, price=Decimal('0'))
+            MealIngredient.objects.create(meal=meal, ingredient=tie, quantity=Decimal('0.50'))
+            MealPlanMeal.objects.create(meal=meal, plan=self.plan)
+        PriceManager.bulk_update_all_meal_prices()
+        PriceManager.bulk_update_all_meal_plan_prices()
+        self.plan.refresh_from_db()
+        now = timezone.now()
+        self.assertEqual(MealPlanManager.calculate_plan_price_as_of(self.plan.id, now), Decimal('10.06'))
+        self.assertEqual(
+            round_decimal(PriceManager.meal_plan_prices_as_of(now)[self.plan.id], PLAN_PRICE_PLACES),
+            self.plan.total_price
+        )
+        self.assertEqual(PriceManager.meal_prices_as_of(now), dict(Meals.objects.values_list('id', 'price')))
+
+    def test_bulk_reprice_as_of(self):
+        PriceManager.bulk_update_all_meal_prices(as_of=self.day1 + timedelta(days=1))
+        PriceManager.bulk_update_all_meal_plan_prices()
+        self.assertEqual(Meals.objects.get(id=self.meal.id).price, Decimal('6.00'))
+        self.assertEqual(MealPlans.objects.get(id=self.plan.id).total_price, Decimal('6.0'))
+        PriceManager.bulk_update_all_meal_prices()
+        self.assertEqual(Meals.objects.get(id=self.meal.id).price, Decimal('9.00'))
+
+    def test_bulk_prices_as_of(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(PriceManager.meal_prices_as_of(self.day1), {self.meal.id: Decimal('6.00')})
+        self.assertEqual(PriceManager.meal_plan_prices_as_of(self.day2), {self.plan.id: Decimal('9.00')})
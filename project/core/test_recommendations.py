@@ -0,0 +1,139 @@
+import numpy as np
+from decimal import Decimal
+from django.contrib.auth.models import User as DjangoUser
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from core.functions import MealManager, UserManager
+from core.models import User, Meals, Favorites, MealNeighbor, MealNeighborBuild, Profile
+from core.recommendations import FavoritesMatrix, MealRecommender
+
+
+def dense_neighbors(k):
+    """Соседи по косинусу, посчитанные напрямую по плотной матрице избранного"""
+    pairs = list(
+        Favorites.objects
+        .filter(user__deleted_at__isnull=True, meal__deleted_at__isnull=True)
+        .values_list('user_id', 'meal_id')
+    )
+    users = sorted({user_id for user_id, _ in pairs})
+    meals = sorted({meal_id for _, meal_id in pairs})
+    matrix = np.zeros((len(users), len(meals)))
+    for user_id, meal_id in pairs:
+        matrix[users.index(user_id), meals.index(meal_id)] = 1
+    norms = np.linalg.norm(matrix, axis=0)
+    similarity = matrix.T @ matrix / np.outer(norms, norms)
+    expected = {}
+    for row, meal_id in enumerate(meals):
+        others = sorted((-similarity[row, column], meals[column]) for column in range(len(meals))
+                        if column != row and similarity[row, column] > 0)
+        expected.update({(meal_id, other): -score for score, other in others[:k]})
+    return expected
+
+
+class TestRecommendations(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create(username=f'user{index}', password_hash=f'hash{index}', email=f'user{index}@example.com').id
+            for index in range(8)
+        ]
+        cls.meals = [Meals.objects.create(name=f'Meal {index}', price=Decimal('10.00')).id for index in range(8)]
+        favorites = {0: [0, 1], 1: [0, 1, 2], 2: [1, 2], 3: [3], 6: [5, 6], 7: [5, 6, 7]}
+        Favorites.objects.bulk_create([
+            Favorites(user_id=cls.users[user], meal_id=cls.meals[meal])
+            for user, meals in favorites.items() for meal in meals
+        ])
+
+    def table(self):
+        return dict(((meal_id, neighbor_id), score) for meal_id, neighbor_id, score
+                    in MealNeighbor.objects.values_list('meal_id', 'neighbor_id', 'score'))
+
+    def assertMatchesDense(self, k):
+        table, expected = self.table(), dense_neighbors(k)
+        self.assertEqual(set(table), set(expected))
+        for key, score in expected.items():
+            self.assertAlmostEqual(table[key], score)
+
+    def favorite(self, user, meal):
+        return Favorites.objects.create(user_id=self.users[user], meal_id=self.meals[meal])
+
+    def test_full_build_matches_dense(self):
+        build = MealRecommender.rebuild(neighbors=10)
+        self.assertEqual((build.kind, build.meals, build.rows), (MealNeighborBuild.KIND_FULL, 7, len(self.table())))
+        self.assertMatchesDense(10)
+        self.assertAlmostEqual(self.table()[(self.meals[0], self.meals[1])], 2 / np.sqrt(6))
+
+    def test_top_k(self):
+        MealRecommender.rebuild(neighbors=1)
+        self.assertEqual(
+            [neighbor for (meal, neighbor) in self.table() if meal == self.meals[1]], [self.meals[0]]
+        )
+        # Другое число соседей - полный пересчет
+        self.assertEqual(MealRecommender.rebuild(neighbors=2).kind, MealNeighborBuild.KIND_FULL)
+
+    def test_incremental_build_updates_affected_meals(self):
+        MealRecommender.rebuild(neighbors=10)
+        self.favorite(3, 4)
+        self.favorite(4, 3)
+        self.favorite(4, 4)
+        build = MealRecommender.rebuild(neighbors=10)
+        # Затронуты только блюда 3 и 4; остальные строки не пересчитываются
+        self.assertEqual((build.kind, build.meals), (MealNeighborBuild.KIND_INCREMENTAL, 2))
+        self.assertMatchesDense(10)
+        self.assertEqual(MealRecommender.rebuild(neighbors=10).meals, 0)
+
+    def test_deleted_favorite_forces_full_build(self):
+        MealRecommender.rebuild(neighbors=10)
+        Favorites.objects.filter(user_id=self.users[1], meal_id=self.meals[2]).delete()
+        self.favorite(2, 0)
+        self.assertEqual(MealRecommender.rebuild(neighbors=10).kind, MealNeighborBuild.KIND_FULL)
+        self.assertMatchesDense(10)
+
+    def test_tombstoned_users_do_not_shape_neighbors(self):
+        MealRecommender.rebuild(neighbors=10)
+        UserManager.delete_user_deferred([self.users[1]])
+        self.assertEqual(MealRecommender.rebuild(neighbors=10).kind, MealNeighborBuild.KIND_FULL)
+        self.assertMatchesDense(10)
+        # Блюда 0 и 2 вместе были только в избранном пользователя 1
+        self.assertNotIn((self.meals[0], self.meals[2]), self.table())
+
+    def test_load_streams_in_chunks(self):
+        streamed, whole = FavoritesMatrix.load(chunk_size=2), FavoritesMatrix.load()
+        np.testing.assert_array_equal(streamed.favorite_ids, whole.favorite_ids)
+        self.assertEqual((streamed.user_meals != whole.user_meals).nnz, 0)
+
+    def test_recommend_sums_neighbors_of_favorites(self):
+        MealRecommender.rebuild(neighbors=10)
+        with CaptureQueriesContext(connection) as captured:
+            recommended = UserManager.get_recommended_meals(self.users[0])
+        self.assertEqual(len(captured), 1)
+        # Избранное пользователя (блюда 0 и 1) не рекомендуется
+        self.assertEqual([meal['id'] for meal in recommended], [self.meals[2]])
+        self.assertAlmostEqual(recommended[0]['score'], 1 / 2 + 2 / np.sqrt(6))
+        self.assertEqual(
+            [meal['id'] for meal in MealManager.get_similar_meals(self.meals[5])], [self.meals[6], self.meals[7]]
+        )
+
+    def test_deleted_meals_leave_table(self):
+        MealRecommender.rebuild(neighbors=10)
+        MealManager.delete_meal_deferred([self.meals[1]])
+        self.assertNotIn(self.meals[1], [meal['id'] for meal in MealManager.get_similar_meals(self.meals[0])])
+        MealManager.delete_meal(self.meals[1])
+        self.assertFalse(MealNeighbor.objects.filter(meal_id=self.meals[1]).exists())
+        self.assertFalse(MealNeighbor.objects.filter(neighbor_id=self.meals[1]).exists())
+
+    def test_api(self):
+        MealRecommender.rebuild(neighbors=10)
+        account = DjangoUser.objects.create(username='account')
+        Profile.objects.filter(user=account).update(site_user_id=self.users[0])
+        client = APIClient()
+        # Заново из базы: сохранение учетной записи при входе сохраняет и ее профиль
+        client.force_authenticate(DjangoUser.objects.get(id=account.id))
+        response = client.get(f'/api/users/{self.users[0]}/recommendations/')
+        self.assertEqual([meal['id'] for meal in response.json()['results']], [self.meals[2]])
+        self.assertEqual(client.get(f'/api/users/{self.users[1]}/recommendations/').status_code, 404)
+        response = client.get(f'/api/meals/{self.meals[0]}/similar/?limit=1')
+        self.assertEqual(response.json()['results'][0]['id'], self.meals[1])
+        self.assertEqual(client.get(f'/api/meals/{self.meals[0]}/similar/?limit=0').status_code, 400)
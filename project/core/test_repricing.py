@@ -0,0 +1,47 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import skipIf
+from django.core.management import call_command
+from django.test import TestCase
+from core.models import User, MealPlans, Meals, Ingredients, MealPlanMeal, MealIngredient, RepricingWorkUnit
+from core.repricing import RepricingQueue, supports_parallel_workers
+
+
+class TestRepricingQueue(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='queue', password_hash='hash', email='queue@example.com')
+        ingredient = Ingredients.objects.create(name='Rice', price_per_unit=Decimal('2.00'), unit='kg')
+        self.plans = []
+        for i in range(3):
+            plan = MealPlans.objects.create(user=user, duration=7)
+            meal = Meals.objects.create(name=f'Meal {i}', price=Decimal('0'))
+            MealIngredient.objects.create(meal=meal, ingredient=ingredient, quantity=Decimal(i + 1))
+            MealPlanMeal.objects.create(meal=meal, plan=plan)
+            self.plans.append(plan)
+
+    def assertRepriced(self):
+        for i, plan in enumerate(self.plans):
+            plan.refresh_from_db()
+            self.assertEqual(plan.total_price, Decimal(2 * (i + 1)))
+
+    def test_run_splits_into_units_and_reprices(self):
+        run_id = RepricingQueue.enqueue_run(unit_size=2)
+        self.assertEqual(RepricingWorkUnit.objects.filter(run_id=run_id).count(), 4)
+        self.assertEqual(RepricingQueue.work(run_id, 'test'), 4)
+        self.assertEqual(RepricingQueue.progress(run_id), {'done': 4, 'pending': 0})
+        self.assertRepriced()
+
+    def test_resume_processes_only_pending_units(self):
+        run_id = RepricingQueue.enqueue_run(unit_size=1)
+        self.assertTrue(RepricingQueue.process_next(run_id, RepricingWorkUnit.KIND_MEALS, 'crashed'))
+        self.assertEqual(RepricingQueue.latest_unfinished_run(), run_id)
+        self.assertEqual(RepricingQueue.work(run_id, 'test'), 5)
+        self.assertIsNone(RepricingQueue.latest_unfinished_run())
+        self.assertRepriced()
+
+    @skipIf(supports_parallel_workers(), 'parallel workers do not see TestCase transactions')
+    def test_command_falls_back_to_single_worker_on_sqlite(self):
+        out = StringIO()
+        call_command('reprice', workers=4, unit_size=2, stdout=out)
+        self.assertIn('processed 4 units', out.getvalue())
+        self.assertRepriced()
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from django.db import connections, router, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from core.models import Meals, Ingredients, MealIngredient
+from core import routers
+from core.functions import PriceManager
+from core.routers import ReadAfterWriteMiddleware, request_scope, use_primary, analytics_database
+
+
+def count_queries(alias, func):
+    """Выполняет func и возвращает число запросов к базе alias"""
+    with CaptureQueriesContext(connections[alias]) as queries:
+        func()
+    return len(queries)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class TestReplicaRouting(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        Meals.objects.create(name='Soup', price=1)
+
+    def test_reads_go_to_replica(self):
+        with request_scope():
+            self.assertEqual(count_queries('replica', lambda: self.assertEqual(Meals.objects.count(), 1)), 1)
+            self.assertEqual(count_queries('default', lambda: Meals.objects.count()), 0)
+
+    def test_read_after_write_sticks_to_primary(self):
+        with request_scope():
+            Meals.objects.create(name='Salad', price=2)
+            self.assertEqual(count_queries('replica', lambda: Meals.objects.count()), 0)
+            self.assertEqual(count_queries('default', lambda: Meals.objects.count()), 1)
+        # Следующий запрос снова читает из реплики
+        with request_scope():
+            self.assertEqual(count_queries('replica', lambda: Meals.objects.count()), 1)
+
+    def test_reads_inside_transaction_go_to_primary(self):
+        with request_scope(), transaction.atomic():
+            self.assertEqual(router.db_for_read(Meals), 'default')
+
+    def test_pinned_reads(self):
+        with request_scope():
+            Meals.objects.create(name='Salad', price=2)
+            with override_settings(DATABASE_ANALYTICS_REPLICA='replica'), analytics_database():
+                self.assertEqual(router.db_for_read(Meals), 'replica')
+        with request_scope(), use_primary():
+            self.assertEqual(router.db_for_read(Meals), 'default')
+
+    def test_writes_go_to_primary(self):
+        self.assertEqual(router.db_for_write(Meals), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'core'))
+
+    def test_reads_outside_scope_go_to_primary(self):
+        # Поток без записей (команда, фоновая задача) тоже читает из основной базы
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(executor.submit(router.db_for_read, Meals).result(), 'default')
+        self.assertEqual(router.db_for_read(Meals), 'default')
+        Meals.objects.create(name='Salad', price=2)
+        # Запись вне области не оставляет состояния: задача в области снова читает из реплики
+        with request_scope():
+            self.assertEqual(router.db_for_read(Meals), 'replica')
+
+    def test_job_scope_as_decorator(self):
+        @request_scope()
+        def job():
+            before = router.db_for_read(Meals)
+            Meals.objects.create(name='Salad', price=2)
+            return before, router.db_for_read(Meals)
+
+        self.assertEqual(job(), ('replica', 'default'))
+        self.assertEqual(job(), ('replica', 'default'))
+        self.assertEqual(router.db_for_read(Meals), 'default')
+
+    def test_repricing_reads_primary(self):
+        ingredient = Ingredients.objects.create(name='Salt', price_per_unit=3, unit='kg')
+        MealIngredient.objects.create(meal=Meals.objects.get(), ingredient=ingredient, quantity=1)
+        with request_scope():
+            self.assertEqual(count_queries('replica', PriceManager.update_all_meal_prices), 0)
+            self.assertEqual(count_queries('replica', PriceManager.bulk_update_all_meal_prices), 0)
+            propagate = lambda: PriceManager.propagate_ingredient_prices([ingredient.id])
+            self.assertEqual(count_queries('replica', propagate), 0)
+
+    def test_middleware_opens_scope_per_request(self):
+        def view(request):
+            before = router.db_for_read(Meals)
+            Meals.objects.create(name='Salad', price=2)
+            return before, router.db_for_read(Meals)
+
+        middleware = ReadAfterWriteMiddleware(view)
+        self.assertEqual(middleware(None), ('replica', 'default'))
+        self.assertEqual(middleware(None), ('replica', 'default'))
+
+
+class TestReplicaSelection(SimpleTestCase):
+    def setUp(self):
+        routers.reset_replica_state()
+
+    @override_settings(DATABASE_REPLICAS=['replica_1', 'replica_2'], DATABASE_REPLICA_SELECTION='round_robin')
+    def test_round_robin(self):
+        chosen = [routers.select_replica() for _ in range(4)]
+        self.assertEqual(sorted(chosen), ['replica_1', 'replica_1', 'replica_2', 'replica_2'])
+        self.assertNotEqual(chosen[0], chosen[1])
+
+    @override_settings(
+        DATABASE_REPLICAS=['replica_1', 'replica_2'], DATABASE_REPLICA_SELECTION='least_lag',
+        DATABASE_REPLICA_MAX_LAG=5, DATABASE_REPLICA_LAG_CHECK_INTERVAL=60
+    )
+    def test_least_lag(self):
+        lags = {'replica_1': 3.0, 'replica_2': 0.5}
+        with mock.patch.object(routers, 'replica_lag', side_effect=lags.get) as replica_lag:
+            self.assertEqual(routers.select_replica(), 'replica_2')
+            self.assertEqual(routers.select_replica(), 'replica_2')
+            # Отставание перепроверяется не чаще интервала
+            self.assertEqual(replica_lag.call_count, 2)
+
+        routers.reset_replica_state()
+        lags = {'replica_1': 30.0, 'replica_2': routers.UNAVAILABLE_LAG}
+        with mock.patch.object(routers, 'replica_lag', side_effect=lags.get):
+            self.assertEqual(routers.select_replica(), 'default')
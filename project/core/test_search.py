@@ -0,0 +1,81 @@
+from decimal import Decimal
+from django.contrib.auth.models import User as DjangoUser
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.functions import MealManager, IngredientManager
+from core.models import DietTypes, Meals, Ingredients
+from core.search import search_terms
+
+
+class TestSearch(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vegan = DietTypes.objects.create(name='Vegan')
+        cls.keto = DietTypes.objects.create(name='Keto')
+        meals = Meals.objects.bulk_create([
+            Meals(name='Tomato salad', description='Fresh tomatoes with basil', price=Decimal('8.00'), diet_type=cls.vegan),
+            Meals(name='Grilled chicken', description='Served with a tomato salad', price=Decimal('15.00'),
+                  diet_type=cls.keto),
+            Meals(name='Greek salad', description='Feta and olives', price=Decimal('12.00'), diet_type=cls.vegan),
+            Meals(name='Beef stew', description='Slow cooked', price=Decimal('20.00'), diet_type=cls.keto),
+        ])
+        cls.tomato_salad, cls.chicken, cls.greek_salad, cls.stew = [meal.id for meal in meals]
+        ingredients = Ingredients.objects.bulk_create([
+            Ingredients(name=name, price_per_unit=Decimal('1.00'), unit='kg')
+            for name in ('Cherry tomato', 'Tomato', 'Sun-dried tomatoes', 'Potato')
+        ])
+        cls.cherry, cls.tomato, cls.dried, cls.potato = [ingredient.id for ingredient in ingredients]
+
+    def search(self, query, **filters):
+        return [row['id'] for row in MealManager.search_meals(query, ('id',), **filters)]
+
+    def test_all_words_ranked_by_field(self):
+        # Совпадение в названии (вес A) выше совпадения в описании (вес B); формы слов приводятся к основе
+        self.assertEqual(self.search('tomato salads'), [self.tomato_salad, self.chicken])
+        found = self.search('salad')
+        self.assertEqual((set(found[:2]), found[2]), ({self.tomato_salad, self.greek_salad}, self.chicken))
+        self.assertEqual(self.search('tomato feta'), [])
+        self.assertEqual(self.search('"); DROP --'), [])
+
+    def test_filters_in_one_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            found = self.search('salad', diet_type_id=self.vegan.id, min_price=Decimal('10'), max_price=Decimal('12'))
+        self.assertEqual(found, [self.greek_salad])
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(self.search('salad', max_price=Decimal('9.99')), [self.tomato_salad])
+
+    def test_index_follows_changes(self):
+        Meals.objects.filter(id=self.stew).update(name='Beef salad')
+        self.assertIn(self.stew, self.search('salad'))
+        Meals.objects.filter(id=self.greek_salad).update(deleted_at=timezone.now())
+        Meals.all_objects.filter(id=self.tomato_salad).delete()
+        self.assertEqual(self.search('salad'), [self.stew, self.chicken])
+
+    def test_autocomplete_prefix_first(self):
+        found = IngredientManager.autocomplete_ingredients('TOMat', ('id',))
+        self.assertEqual([row['id'] for row in found], [self.tomato, self.cherry, self.dried])
+        found = IngredientManager.autocomplete_ingredients('to', ('id',))
+        self.assertEqual([row['id'] for row in found], [self.tomato, self.potato, self.cherry, self.dried])
+        self.assertEqual(IngredientManager.autocomplete_ingredients('%_', ('id',)), [])
+
+    def test_search_terms(self):
+        self.assertEqual(search_terms('Tomato, "salad" -OR- '), ['tomato', 'salad', 'or'])
+
+    def test_api(self):
+        client = APIClient()
+        client.force_authenticate(DjangoUser.objects.create(username='reader'))
+        response = client.get(f'/api/meals/search/?q=salad&diet_type={self.vegan.id}&include=description')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        by_id = {meal['id']: meal for meal in results}
+        self.assertEqual(set(by_id), {self.tomato_salad, self.greek_salad})
+        self.assertEqual(by_id[self.tomato_salad]['description'], 'Fresh tomatoes with basil')
+        self.assertGreater(by_id[self.tomato_salad]['rank'], 0)
+        self.assertEqual(client.get('/api/meals/search/?q=').status_code, 400)
+        self.assertEqual(client.get('/api/meals/search/?q=salad&min_price=cheap').status_code, 400)
+        response = client.get('/api/ingredients/autocomplete/?q=tomato&limit=1')
+        self.assertEqual(response.json()['results'], [{'id': self.tomato, 'name': 'Tomato', 'unit': 'kg',
+                                                       'price_per_unit': '1.00'}])
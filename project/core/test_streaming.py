@@ -0,0 +1,44 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from core.models import DietTypes
+from core.functions import DietTypeManager, MealManager
+
+
+class TestStreamingAndKeysetPages(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        # created_at совпадает у пар строк, чтобы проверить стабильность порядка по (created_at, id)
+        DietTypes.objects.bulk_create([
+            DietTypes(name=f'Diet {i}', created_at=now - timedelta(minutes=i // 2)) for i in range(7)
+        ])
+
+    def test_iter_all_streams_in_id_order(self):
+        self.assertEqual(
+            [diet_type.name for diet_type in DietTypeManager.iter_all_diet_types(chunk_size=2)],
+            [f'Diet {i}' for i in range(7)]
+        )
+
+    def test_pages_by_id_cover_table_once(self):
+        names, cursor = [], None
+        while True:
+            page, cursor = DietTypeManager.get_diet_types_page(after=cursor, limit=3)
+            names.extend(diet_type.name for diet_type in page)
+            if cursor is None:
+                break
+        self.assertEqual(names, [f'Diet {i}' for i in range(7)])
+
+    def test_pages_by_created_at_are_stable(self):
+        expected = list(DietTypes.objects.order_by('created_at', 'id').values_list('id', flat=True))
+        ids, cursor = [], None
+        while True:
+            with self.assertNumQueries(1):
+                page, cursor = DietTypeManager.get_diet_types_page(after=cursor, limit=2, order_by='created_at')
+            ids.extend(diet_type.id for diet_type in page)
+            if cursor is None:
+                break
+        self.assertEqual(ids, expected)
+
+    def test_unknown_ordering(self):
+        with self.assertRaises(ValueError):
+            MealManager.get_meals_page(order_by='name')
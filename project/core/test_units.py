@@ -0,0 +1,55 @@
+from decimal import Decimal
+from django.test import TestCase
+from core.models import User, MealPlans, Meals, Ingredients, MealPlanMeal, MealIngredient
+from core.functions import MealPlanManager, IngredientManager
+from core.basket import BasketOptimizer
+from core.units import normalize_unit, DIMENSION_MASS, DIMENSION_VOLUME, DIMENSION_UNKNOWN
+
+
+class TestUnitNormalization(TestCase):
+    def test_normalize_unit(self):
+        self.assertEqual(normalize_unit('kg'), (DIMENSION_MASS, Decimal('1000')))
+        self.assertEqual(normalize_unit(' L '), (DIMENSION_VOLUME, Decimal('1000')))
+        self.assertEqual(normalize_unit('кг'), (DIMENSION_MASS, Decimal('1000')))
+        self.assertEqual(normalize_unit('bunch'), (DIMENSION_UNKNOWN, Decimal('1')))
+
+    def test_ingredient_stores_dimension_and_factor(self):
+        ingredient = IngredientManager.create_ingredient(name='Sugar', price_per_unit=1.5, unit='lb')
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.dimension, DIMENSION_MASS)
+        self.assertEqual(ingredient.base_factor, Decimal('453.59237'))
+
+
+class TestBaseUnitAggregation(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='units', password_hash='hash', email='units@example.com')
+        self.plan = MealPlans.objects.create(user=user, duration=7)
+        flour_kg = Ingredients.objects.create(name='Flour', price_per_unit=Decimal('3.00'), unit='kg', store_name='A')
+        flour_lb = Ingredients.objects.create(name='Flour', price_per_unit=Decimal('1.20'), unit='lb', store_name='B')
+        milk = Ingredients.objects.create(name='Milk', price_per_unit=Decimal('1.00'), unit='l', store_name='A')
+        bread = Meals.objects.create(name='Bread', price=Decimal('0'))
+        cake = Meals.objects.create(name='Cake', price=Decimal('0'))
+        MealIngredient.objects.create(meal=bread, ingredient=flour_kg, quantity=Decimal('0.50'))
+        MealIngredient.objects.create(meal=cake, ingredient=flour_lb, quantity=Decimal('0.50'))
+        MealIngredient.objects.create(meal=cake, ingredient=milk, quantity=Decimal('0.20'))
+        MealPlanMeal.objects.create(meal=bread, plan=self.plan)
+        MealPlanMeal.objects.create(meal=cake, plan=self.plan)
+
+    def test_shopping_list_in_base_units(self):
+        with self.assertNumQueries(1):
+            shopping_list = MealPlanManager.get_shopping_list(self.plan.id)
+        self.assertEqual([(item['name'], item['base_unit']) for item in shopping_list], [('Flour', 'g'), ('Milk', 'ml')])
+        self.assertAlmostEqual(float(shopping_list[0]['base_quantity']), 500 + 0.5 * 453.59237)
+        self.assertAlmostEqual(float(shopping_list[1]['base_quantity']), 200)
+
+    def test_store_unit_prices(self):
+        prices = IngredientManager.get_store_unit_prices('Flour')
+        self.assertEqual([row['store_name'] for row in prices], ['B', 'A'])
+        self.assertAlmostEqual(float(prices[1]['price_per_base_unit']), 0.003)
+        self.assertAlmostEqual(float(prices[0]['price_per_base_unit']), 1.20 / 453.59237)
+
+    def test_basket_compares_offers_across_units(self):
+        basket = BasketOptimizer.load().optimize(self.plan.id)
+        flour = next(item for item in basket['items'] if item['name'] == 'Flour')
+        self.assertEqual(flour['store_name'], 'B')
+        self.assertAlmostEqual(flour['cost'], round((500 + 0.5 * 453.59237) * 1.20 / 453.59237, 2))
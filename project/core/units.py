@@ -0,0 +1,37 @@
+from decimal import Decimal
+from typing import Tuple
+
+# Коды размерностей и базовые единицы, в которых ведется агрегация
+DIMENSION_MASS = 'mass'
+DIMENSION_VOLUME = 'volume'
+DIMENSION_COUNT = 'count'
+DIMENSION_UNKNOWN = 'unknown'
+
+BASE_UNITS = {
+    DIMENSION_MASS: 'g',
+    DIMENSION_VOLUME: 'ml',
+    DIMENSION_COUNT: 'pcs',
+    DIMENSION_UNKNOWN: '',
+}
+
+# Единица -> (размерность, множитель перевода в базовую единицу)
+UNIT_CONVERSIONS = {
+    'g': (DIMENSION_MASS, Decimal('1')),
+    'kg': (DIMENSION_MASS, Decimal('1000')),
+    'mg': (DIMENSION_MASS, Decimal('0.001')),
+    'oz': (DIMENSION_MASS, Decimal('28.349523125')),
+    'lb': (DIMENSION_MASS, Decimal('453.59237')),
+    'г': (DIMENSION_MASS, Decimal('1')),
+    'кг': (DIMENSION_MASS, Decimal('1000')),
+    'ml': (DIMENSION_VOLUME, Decimal('1')),
+    'l': (DIMENSION_VOLUME, Decimal('1000')),
+    'мл': (DIMENSION_VOLUME, Decimal('1')),
+    'л': (DIMENSION_VOLUME, Decimal('1000')),
+    'pcs': (DIMENSION_COUNT, Decimal('1')),
+    'шт': (DIMENSION_COUNT, Decimal('1')),
+}
+
+
+def normalize_unit(unit: str) -> Tuple[str, Decimal]:
+    """Возвращает размерность и множитель перевода единицы в базовую"""
+    return UNIT_CONVERSIONS.get((unit or '').strip().lower().rstrip('.'), (DIMENSION_UNKNOWN, Decimal('1')))
@@ -0,0 +1,20 @@
+from django.urls import path
+
+from core import views
+
+# API чтения: списки с постраничной выдачей по курсору, отдельные записи, поиск и рекомендации
+urlpatterns = [
+    path('meals/', views.MealListView.as_view(), name='meal-list'),
+    path('meals/search/', views.MealSearchView.as_view(), name='meal-search'),
+    path('meals/<int:pk>/', views.MealDetailView.as_view(), name='meal-detail'),
+    path('meals/<int:pk>/similar/', views.SimilarMealsView.as_view(), name='meal-similar'),
+    path('meal-plans/', views.MealPlanListView.as_view(), name='meal-plan-list'),
+    path('meal-plans/<int:pk>/', views.MealPlanDetailView.as_view(), name='meal-plan-detail'),
+    path('ingredients/', views.IngredientListView.as_view(), name='ingredient-list'),
+    path('ingredients/autocomplete/', views.IngredientAutocompleteView.as_view(), name='ingredient-autocomplete'),
+    path('ingredients/<int:pk>/', views.IngredientDetailView.as_view(), name='ingredient-detail'),
+    path('diet-types/', views.DietTypeListView.as_view(), name='diet-type-list'),
+    path('diet-types/<int:pk>/', views.DietTypeDetailView.as_view(), name='diet-type-detail'),
+    path('users/<int:pk>/overview/', views.user_overview, name='user-overview'),
+    path('users/<int:pk>/recommendations/', views.UserRecommendationsView.as_view(), name='user-recommendations'),
+]
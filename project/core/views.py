@@ -1,3 +1,236 @@
-from django.shortcuts import render
+import asyncio
+import functools
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from typing import Optional, List, Sequence, Any, Type
 
-# Create your views here.
+from core.functions import UserManager, MealManager, MealPlanManager, IngredientManager, DietTypeManager, FavoriteManager
+from core.models import Profile
+from core.pagination import KeysetPagination
+from core.serializers import (
+    DIET_TYPE_FIELDS, MEAL_DETAIL_FIELDS, MEAL_PLAN_FIELDS, INGREDIENT_FIELDS, MEAL_LIST_VALUES, MEAL_PLAN_VALUES,
+    INGREDIENT_AUTOCOMPLETE_VALUES, DietTypeSerializer, MealDetailSerializer, MealPlanSerializer, IngredientSerializer,
+    LimitQuerySerializer, MealSearchQuerySerializer, AutocompleteQuerySerializer, meal_rows, meal_plan_rows
+)
+
+
+class KeysetListView(APIView):
+    """Список через get_*_page менеджера с постраничной выдачей по ключу.
+
+    Загружаются только поля get_fields(), поэтому страница - один запрос
+    (плюс запросы подгрузки связанных строк, если они заданы).
+    """
+    pagination_class = KeysetPagination
+    serializer_class: Type = None
+    page_function = None
+    fields: Sequence[str] = ()
+
+    def get_fields(self) -> Sequence[str]:
+        return self.fields
+
+    def get_page_kwargs(self) -> dict:
+        """Дополнительные аргументы page_function"""
+        return {}
+
+    def serialize(self, items: List[Any]) -> Any:
+        return self.serializer_class(items, many=True).data
+
+    def get(self, request):
+        paginator = self.pagination_class()
+        page_function = functools.partial(self.page_function, fields=self.get_fields(), **self.get_page_kwargs())
+        items = paginator.paginate_queryset(page_function, request, self)
+        return paginator.get_paginated_response(self.serialize(items))
+
+
+class DetailView(APIView):
+    """Одна запись через get_*_by_id менеджера"""
+    serializer_class: Type = None
+    get_function = None
+    fields: Sequence[str] = ()
+
+    def get_object(self, pk: int) -> Optional[Any]:
+        return self.get_function(pk, fields=self.fields)
+
+    def get(self, request, pk: int):
+        obj = self.get_object(pk)
+        if obj is None:
+            raise Http404
+        return Response(self.serializer_class(obj).data)
+
+
+def _plan_owner_id(request) -> Optional[int]:
+    """Пользователь сайта, чьи планы видит запрос; None - все планы (персонал)"""
+    if request.user.is_staff:
+        return None
+    profile = getattr(request.user, 'profile', None)
+    # Без привязанного пользователя сайта планов нет (ID 0 не выдается)
+    return profile.site_user_id if profile is not None and profile.site_user_id else 0
+
+
+def _include_description(request) -> bool:
+    return 'description' in request.query_params.get('include', '').split(',')
+
+
+class MealListView(KeysetListView):
+    """Список блюд строками values() (description - только с ?include=description)"""
+    page_function = staticmethod(MealManager.get_meals_page)
+    fields = MEAL_LIST_VALUES
+
+    def get_fields(self) -> Sequence[str]:
+        return self.fields + ('description',) if _include_description(self.request) else self.fields
+
+    def get_page_kwargs(self) -> dict:
+        return {'as_values': True}
+
+    def serialize(self, items: List[Any]) -> Any:
+        return meal_rows(items, _include_description(self.request))
+
+
+class MealSearchView(APIView):
+    """Поиск блюд: ?q=слова[&diet_type=ID][&min_price=...][&max_price=...][&limit=N].
+
+    Блюда, содержащие все слова запроса в названии или описании, по
+    убыванию релевантности (поле rank).
+    """
+
+    def get(self, request):
+        params = MealSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        include_description = _include_description(request)
+        rows = MealManager.search_meals(
+            query['q'],
+            MEAL_LIST_VALUES + ('description',) if include_description else MEAL_LIST_VALUES,
+            diet_type_id=query.get('diet_type'),
+            min_price=query.get('min_price'),
+            max_price=query.get('max_price'),
+            limit=query.get('limit', settings.API_PAGE_SIZE)
+        )
+        results = meal_rows(rows, include_description)
+        for result, row in zip(results, rows):
+            result['rank'] = row['rank']
+        return Response({'results': results})
+
+
+class MealDetailView(DetailView):
+    serializer_class = MealDetailSerializer
+    get_function = staticmethod(MealManager.get_meal_by_id)
+    fields = MEAL_DETAIL_FIELDS
+
+
+def _limit(request) -> int:
+    params = LimitQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return params.validated_data.get('limit', settings.API_PAGE_SIZE)
+
+
+class SimilarMealsView(APIView):
+    """Похожие блюда (по совместному избранному): ?limit=N"""
+
+    def get(self, request, pk: int):
+        return Response({'results': MealManager.get_similar_meals(pk, _limit(request))})
+
+
+class UserRecommendationsView(APIView):
+    """Рекомендованные пользователю блюда: ?limit=N (персоналу и владельцу)"""
+
+    def get(self, request, pk: int):
+        owner_id = _plan_owner_id(request)
+        if owner_id is not None and owner_id != pk:
+            raise Http404
+        return Response({'results': UserManager.get_recommended_meals(pk, _limit(request))})
+
+
+class MealPlanListView(KeysetListView):
+    """Список планов строками values(); блюда всех планов страницы - одним запросом"""
+    page_function = staticmethod(MealPlanManager.get_meal_plans_page)
+    fields = MEAL_PLAN_VALUES
+
+    def get_page_kwargs(self) -> dict:
+        return {'user_id': _plan_owner_id(self.request), 'as_values': True}
+
+    def serialize(self, items: List[Any]) -> Any:
+        return meal_plan_rows(items, MealPlanManager.get_plan_meals(item['id'] for item in items))
+
+
+class MealPlanDetailView(DetailView):
+    serializer_class = MealPlanSerializer
+    get_function = staticmethod(MealPlanManager.get_meal_plan_by_id)
+    fields = MEAL_PLAN_FIELDS
+
+    def get_object(self, pk: int) -> Optional[Any]:
+        plan = self.get_function(pk, fields=self.fields, with_meals=True)
+        owner_id = _plan_owner_id(self.request)
+        if plan is None or (owner_id is not None and plan.user_id != owner_id):
+            return None
+        return plan
+
+
+class IngredientListView(KeysetListView):
+    serializer_class = IngredientSerializer
+    page_function = staticmethod(IngredientManager.get_ingredients_page)
+    fields = INGREDIENT_FIELDS
+
+
+class IngredientAutocompleteView(APIView):
+    """Подсказки ингредиентов по части названия: ?q=...[&limit=N]"""
+
+    def get(self, request):
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        results = IngredientManager.autocomplete_ingredients(
+            query['q'], INGREDIENT_AUTOCOMPLETE_VALUES, limit=query.get('limit', settings.API_PAGE_SIZE)
+        )
+        return Response({'results': results})
+
+
+class IngredientDetailView(DetailView):
+    serializer_class = IngredientSerializer
+    get_function = staticmethod(IngredientManager.get_ingredient_by_id)
+    fields = INGREDIENT_FIELDS
+
+
+class DietTypeListView(KeysetListView):
+    serializer_class = DietTypeSerializer
+    page_function = staticmethod(DietTypeManager.get_diet_types_page)
+    fields = DIET_TYPE_FIELDS
+
+
+class DietTypeDetailView(DetailView):
+    serializer_class = DietTypeSerializer
+    get_function = staticmethod(DietTypeManager.get_diet_type_by_id)
+    fields = DIET_TYPE_FIELDS
+
+
+async def user_overview(request, pk: int):
+    """Пользователь, его планы и избранное (асинхронное представление для ASGI).
+
+    Три независимые выборки выполняются одновременно через asyncio.gather.
+    Доступно персоналу и владельцу учетной записи сайта.
+    """
+    account = await request.auser()
+    if not account.is_authenticated:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=403)
+    if not account.is_staff and not await Profile.objects.filter(user_id=account.id, site_user_id=pk).aexists():
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+
+    user, plans, favorites = await asyncio.gather(
+        UserManager.aget_user_by_id(pk),
+        MealPlanManager.aget_user_meal_plans(pk),
+        FavoriteManager.aget_user_favorites(pk),
+    )
+    if user is None:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    return JsonResponse({
+        'id': user.id,
+        'username': user.username,
+        'diet_type_id': user.diet_type_id,
+        'plans': [
+            {'id': plan.id, 'duration': plan.duration, 'total_price': plan.total_price, 'created_at': plan.created_at}
+            for plan in plans
+        ],
+        'favorites': [{'meal_id': favorite.meal_id, 'created_at': favorite.created_at} for favorite in favorites],
+    })
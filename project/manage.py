@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+    # Тесты по умолчанию идут на облегченном профиле (SQLite в памяти)
+    default_settings = 'project.settings_test' if sys.argv[1:2] == ['test'] else 'project.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Под ASGI ORM каждого запроса работает в новом потоке, и постоянные соединения
+# копились бы по одному на запрос: переиспользование - через пул (DB_POOL=True)
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -1,3 +1,4 @@
+import copy
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
 # Промежуточные слои
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.routers.ReadAfterWriteMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,10 +72,83 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '5432'),
         'OPTIONS': {
             'client_encoding': 'UTF8',
-        }
+        },
+        # Постоянные соединения: переиспользуются между запросами в течение
+        # DB_CONN_MAX_AGE секунд и проверяются перед повторным использованием
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+# Пул соединений psycopg 3 (DB_POOL=True): общий для потоков процесса,
+# заменяет постоянные соединения, поэтому CONN_MAX_AGE обнуляется.
+# При CONN_HEALTH_CHECKS соединение проверяется при выдаче из пула
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+if DB_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '600')),
+    }
+
+# Реплики только для чтения: DB_REPLICA_HOSTS="host1:5432,host2" создает псевдонимы
+# replica_1, replica_2, ... с остальными настройками основной базы. Отдельная реплика
+# для массовой аналитики (core.routers.analytics_database) - DB_ANALYTICS_HOST
+DATABASE_REPLICAS = []
+for number, address in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    host, _, port = address.strip().partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **copy.deepcopy(DATABASES['default']),
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ANALYTICS_REPLICA = None
+if os.getenv('DB_ANALYTICS_HOST'):
+    host, _, port = os.getenv('DB_ANALYTICS_HOST').partition(':')
+    DATABASES['analytics'] = {
+        **copy.deepcopy(DATABASES['default']),
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ANALYTICS_REPLICA = 'analytics'
+
+# Выбор реплики: round_robin или least_lag (с наименьшим отставанием, не больше
+# DB_REPLICA_MAX_LAG секунд; отставание перепроверяется раз в DB_REPLICA_LAG_CHECK_INTERVAL)
+DATABASE_REPLICA_SELECTION = os.getenv('DB_REPLICA_SELECTION', 'round_robin')
+DATABASE_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '1'))
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Кэш (по умолчанию локальный в памяти процесса, для продакшена - Redis/Memcached)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Кэш цен блюд: время жизни в общем кэше и параметры локального LRU уровня
+MEAL_PRICE_CACHE_TIMEOUT = int(os.getenv('MEAL_PRICE_CACHE_TIMEOUT', '3600'))
+MEAL_PRICE_LOCAL_CACHE_SIZE = int(os.getenv('MEAL_PRICE_LOCAL_CACHE_SIZE', '10000'))
+MEAL_PRICE_LOCAL_CACHE_TTL = float(os.getenv('MEAL_PRICE_LOCAL_CACHE_TTL', '5'))
+
+# Каталог снимков базы SQLite для core.db_reset (в PostgreSQL снимки - отдельные базы)
+DB_SNAPSHOT_DIR = os.getenv('DB_SNAPSHOT_DIR', str(BASE_DIR / 'snapshots'))
+
+# Хеширование паролей пользователей сайта (werkzeug): метод и длина соли по окружению
+# (например, дешевый 'pbkdf2:sha256:1000' в тестах и 'scrypt' в продакшене)
+# и число процессов для массового создания пользователей
+PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+PASSWORD_HASH_SALT_LENGTH = int(os.getenv('PASSWORD_HASH_SALT_LENGTH', '16'))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+
 # Парольная политика
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -110,10 +185,23 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # JSON через orjson (core.renderers); браузерный API - для отладки
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# API чтения (core.views): размер страницы по умолчанию и максимальный (?page_size=)
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '50'))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '500'))
+
+# Рекомендации по избранному (core.recommendations): сколько похожих блюд
+# хранится для каждого блюда
+RECOMMENDER_NEIGHBORS = int(os.getenv('RECOMMENDER_NEIGHBORS', '20'))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = DEBUG
 CORS_ALLOWED_ORIGINS = [
@@ -0,0 +1,37 @@
+# Облегченный профиль настроек для тестов: база SQLite в памяти, дешевое
+# хеширование паролей и параллельный запуск (manage.py test выбирает его сам)
+from project.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+    # Реплика для тестов маршрутизации (core.routers); подключается к той же базе
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Хеширование паролей намеренно медленное - в тестах оно не проверяется на стойкость
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1'
+PASSWORD_HASH_WORKERS = 1
+
+SECURE_SSL_REDIRECT = False
+SESSION_COOKIE_SECURE = False
+CSRF_COOKIE_SECURE = False
+
+# Каталог static может отсутствовать в рабочей копии
+STATICFILES_DIRS = []
+SILENCED_SYSTEM_CHECKS = ['staticfiles.W004']
+
+TEST_RUNNER = 'project.test_runner.ParallelDiscoverRunner'
@@ -0,0 +1,61 @@
+from django.test.runner import DiscoverRunner, ParallelTestSuite, get_max_test_processes
+from django.test.utils import iter_test_cases
+
+
+def _requires_subprocesses(test):
+    """Тест помечен core.factories.requires_subprocesses"""
+    method = getattr(test, getattr(test, '_testMethodName', ''), None)
+    return getattr(method, 'requires_subprocesses', False)
+
+
+class SerialTailParallelTestSuite(ParallelTestSuite):
+    """Параллельный набор тестов с последовательным хвостом.
+
+    Тесты, запускающие процессы, выполняются в основном процессе после
+    воркеров: воркеры - демоны и не могут создавать дочерние процессы.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.serial_suite = None
+
+    def __iter__(self):
+        if self.serial_suite is None:
+            return super().__iter__()
+        return iter([*self.subsuites, self.serial_suite])
+
+    def run(self, result):
+        result = super().run(result)
+        if self.serial_suite is not None and not result.shouldStop:
+            self.serial_suite.run(result)
+        return result
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """Запускает тесты в нескольких процессах по умолчанию.
+
+    Без --parallel используется число процессов по количеству ядер
+    (или DJANGO_TEST_PROCESSES); --parallel 1 - последовательный запуск.
+    Каждый процесс получает собственную копию тестовой базы. Тесты,
+    помеченные requires_subprocesses, выполняются последовательно в основном
+    процессе после параллельной части.
+    """
+
+    parallel_test_suite = SerialTailParallelTestSuite
+
+    def __init__(self, parallel=0, **kwargs):
+        super().__init__(parallel=parallel or get_max_test_processes(), **kwargs)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        if not isinstance(suite, SerialTailParallelTestSuite):
+            return suite
+        serial = [test for test in iter_test_cases(suite.subsuites) if _requires_subprocesses(test)]
+        if serial:
+            subsuites = (
+                self.test_suite(test for test in subsuite if not _requires_subprocesses(test))
+                for subsuite in suite.subsuites
+            )
+            suite.subsuites = [subsuite for subsuite in subsuites if subsuite.countTestCases()]
+            suite.serial_suite = self.test_suite(serial)
+        return suite